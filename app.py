@@ -1,20 +1,17 @@
-import asyncio
 import logging
 import sys
 from pathlib import Path
 
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
 
-from src.core.llm_client import LLMClient
-from src.agent.router import FraudRouter
-from src.data.database import FraudDatabase
-from src.data.vectorstore import VectorStore
-from src.models.agent import AgentDeps, AgentResponse
+from src.agent.service import FraudService
+from src.core.config import SERVICE_WARM_UP
+from src.core.event_loop import get_background_loop
+from src.core.tracing import new_request_id
+from src.models.agent import AgentResponse
+from src.models.events import ChunksRetrieved, Done, SQLRowsReady, SynthesisToken, Token, ToolStarted
 from src.models.source_type import SourceType
-from src.scoring.quality import QualityScorer
-from src.scoring.validation import AnswerValidator
 from src.ui.chat import ChatRenderer
 from src.ui.sidebar import render_sidebar
 from src.ui.theme import apply_theme
@@ -39,24 +36,29 @@ st.set_page_config(
 
 apply_theme()
 
+TOOL_STATUS = {
+    "sql": "🔧 Querying the transaction database...",
+    "rag": "📚 Searching the research documents...",
+}
 
-@st.cache_resource
-def get_openai_client() -> OpenAI:
-    return OpenAI()
-
-@st.cache_resource
-def get_db() -> FraudDatabase:
-    return FraudDatabase.connect()
 
 @st.cache_resource
-def get_vector_store() -> VectorStore:
-    return VectorStore.load()
+def get_service() -> FraudService:
+    service = FraudService.create()
+    if SERVICE_WARM_UP:
+        service.warm_up()
+    return service
 
 
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-selected_question = render_sidebar()
+service = get_service()
+loop = get_background_loop()
+selected_question = render_sidebar(
+    latency_stats=service.latency.snapshot(),
+    routing_stats=service.intent.stats() if service.intent else None,
+)
 
 st.markdown("# 🔍 Fraud Analysis Chatbot")
 st.markdown(
@@ -78,89 +80,73 @@ if question:
 
     with st.chat_message("assistant"):
         try:
-            client = get_openai_client()
-            db = get_db()
-            vs = get_vector_store()
-            llm = LLMClient(client)
-
-            deps = AgentDeps(
-                con=db.connection,
-                openai_client=client,
-                faiss_index=vs.index,
-                chunks=vs.chunks,
-            )
-
-            router = FraudRouter(llm, db, vs)
-            scorer = QualityScorer(llm)
-            validator = AnswerValidator()
-
             enable_synthesis = st.session_state.get("enable_synthesis", True)
             enable_streaming = st.session_state.get("enable_streaming", True)
+            request_id = new_request_id()
 
             response: AgentResponse | None = None
 
             if enable_streaming:
+                status_placeholder = st.empty()
                 response_placeholder = st.empty()
-                stream_state = {"text": "", "response": None}
+                sql_slot = st.empty()
+                sources_slot = st.empty()
+                answer_text = ""
+                synthesis_text = ""
 
-                async def _stream():
-                    async for item in router.run_stream(
-                        question, deps,
+                with st.spinner("🤔 Analyzing your question..."):
+                    for event in loop.iterate(service.run_stream(
+                        question,
                         message_history=st.session_state.messages,
                         enable_synthesis=enable_synthesis,
-                    ):
-                        if isinstance(item, str):
-                            stream_state["text"] += item
-                            response_placeholder.markdown(stream_state["text"] + "▌")
-                        elif isinstance(item, AgentResponse):
-                            stream_state["response"] = item
-
-                with st.spinner("🤔 Analyzing your question..."):
-                    asyncio.run(_stream())
-
-                response = stream_state["response"]
-
-                if response and response.answer != stream_state["text"]:
+                        request_id=request_id,
+                    )):
+                        if isinstance(event, ToolStarted):
+                            status_placeholder.caption(TOOL_STATUS.get(event.tool, "Working..."))
+                        elif isinstance(event, SQLRowsReady):
+                            with sql_slot.container():
+                                renderer.render_sql_details(event.sql, event.rows, event.columns)
+                        elif isinstance(event, ChunksRetrieved):
+                            with sources_slot.container():
+                                renderer.render_rag_sources(event.sources, event.retrieved_chunks)
+                        elif isinstance(event, Token):
+                            answer_text += event.text
+                            if not synthesis_text:
+                                response_placeholder.markdown(answer_text + "▌")
+                        elif isinstance(event, SynthesisToken):
+                            # The synthesized answer replaces the draft streamed so far.
+                            synthesis_text += event.text
+                            response_placeholder.markdown(synthesis_text + "▌")
+                        elif isinstance(event, Done):
+                            response = event.response
+
+                status_placeholder.empty()
+                if response:
+                    # The final response is authoritative: redraw (or clear) every slot from it.
                     response_placeholder.markdown(response.answer)
-                else:
-                    response_placeholder.markdown(stream_state["text"])
+                    with sql_slot.container():
+                        renderer.render_sql_details(response.sql_query, response.sql_results, response.sql_columns)
+                    with sources_slot.container():
+                        renderer.render_rag_sources(response.sources, response.retrieved_chunks)
             else:
                 with st.spinner("🤔 Analyzing your question..."):
-                    response = asyncio.run(router.run(
-                        question, deps,
+                    response = loop.run(service.run(
+                        question,
                         message_history=st.session_state.messages,
                         enable_synthesis=enable_synthesis,
+                        request_id=request_id,
                     ))
                 st.markdown(response.answer)
-
-            if response:
                 renderer.render_sql_details(response.sql_query, response.sql_results, response.sql_columns)
                 renderer.render_rag_sources(response.sources, response.retrieved_chunks)
 
-                context = ""
-                if response.sql_results:
-                    context = str(response.sql_results[:20])
-                if response.retrieved_chunks:
-                    context += "\n".join(response.retrieved_chunks)
-
-                quality = scorer.score(
-                    question=question,
-                    answer=response.answer,
-                    context=context or response.answer,
-                    source_type=response.source_type,
-                    similarity_scores=response.similarity_scores,
-                    sql_success=response.sql_results is not None and len(response.sql_results) > 0,
-                    sql_row_count=len(response.sql_results) if response.sql_results else 0,
-                )
-
-                val_passed, val_reason = validator.validate(
-                    answer=response.answer,
-                    source_type=response.source_type,
-                    sql_results=response.sql_results,
-                    retrieved_chunks=response.retrieved_chunks,
-                )
-                quality.validation_passed = val_passed
-                quality.validation_reason = val_reason
+            if response:
+                if response.cached:
+                    st.caption("⚡ Answered from cache")
+                if response.partial:
+                    st.caption("⏱️ Partial answer: the time budget ran out before every step finished")
+
+                quality = loop.run(service.score(question, response, request_id=request_id))
 
                 renderer.render_quality_badge(quality)
 
@@ -175,6 +161,7 @@ if question:
                         "retrieved_chunks": response.retrieved_chunks,
                         "quality_score": quality.model_dump(),
                         "source_type": response.source_type.value,
+                        "request_id": request_id,
                     },
                 })
 
@@ -0,0 +1,126 @@
+"""Answer a file of questions concurrently and write JSONL results for offline evaluation.
+
+Questions come from a text file (one per line; blank lines and lines
+starting with # are skipped) or a JSONL file with a "question" field. Each
+output line holds the input index, question, seconds, AgentResponse and
+QualityScore, written as soon as the question finishes:
+
+    python scripts/batch_eval.py questions.txt -o results.jsonl --concurrency 8
+
+The whole-answer cache is bypassed by default so prompt changes are
+measured; pass --use-answer-cache to allow cached answers.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger("batch_eval")
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "data" / "processed" / "batch_results.jsonl"
+
+
+def load_questions(path: Path) -> list[str]:
+    """Questions from a plain-text or JSONL file, in file order."""
+    questions = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if path.suffix == ".jsonl":
+            questions.append(json.loads(line)["question"])
+        else:
+            questions.append(line)
+    return questions
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    from src.agent.service import FraudService
+    from src.core.config import SERVICE_WARM_UP
+
+    questions = load_questions(args.questions)
+    if args.limit:
+        questions = questions[:args.limit]
+    logger.info("Answering %d questions with concurrency %d", len(questions), args.concurrency)
+
+    service = FraudService.create(answer_cache=args.use_answer_cache)
+    if SERVICE_WARM_UP:
+        service.warm_up()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    seconds: list[float] = []
+    overall: list[float] = []
+    errors = partial = 0
+    start = time.monotonic()
+    with args.output.open("w", encoding="utf-8") as out:
+        async for result in service.run_batch(
+            questions,
+            concurrency=args.concurrency,
+            enable_synthesis=not args.no_synthesis,
+            score=not args.no_score,
+        ):
+            out.write(result.model_dump_json() + "\n")
+            out.flush()
+            seconds.append(result.seconds)
+            errors += result.response.error is not None
+            partial += result.response.partial
+            if result.quality is not None:
+                overall.append(result.quality.overall)
+            logger.info(
+                "[%d/%d] #%d %.2fs %s", len(seconds), len(questions),
+                result.index, result.seconds, result.question[:70],
+            )
+    wall = time.monotonic() - start
+
+    if not seconds:
+        logger.warning("No questions answered")
+        return
+    logger.info(
+        "Done: %d questions in %.1fs wall (%.2f q/s); per question mean %.2fs, p50 %.2fs, p95 %.2fs; "
+        "%d errors, %d partial%s",
+        len(seconds), wall, len(seconds) / wall if wall else 0.0,
+        statistics.mean(seconds), _percentile(seconds, 0.5), _percentile(seconds, 0.95),
+        errors, partial,
+        f", mean quality {statistics.mean(overall):.3f}" if overall else "",
+    )
+    logger.info("Results written to %s", args.output)
+
+
+def main() -> None:
+    from src.core.config import BATCH_CONCURRENCY
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("questions", type=Path, help="Text file (one question per line) or JSONL file")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--limit", type=int, default=0, help="Only answer the first N questions")
+    parser.add_argument("--no-synthesis", action="store_true", help="Skip SQL + RAG answer synthesis")
+    parser.add_argument("--no-score", action="store_true", help="Skip quality scoring")
+    parser.add_argument(
+        "--use-answer-cache", action="store_true", help="Serve repeated questions from the answer cache",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare query latency with and without rollup routing on the ingested database.
+
+Runs the SQL few-shot examples plus a few typical aggregates both ways,
+checks that the results agree and prints the median time of each path:
+
+    python scripts/benchmark_rollups.py --repeats 10
+"""
+
+import argparse
+import logging
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+EXTRA_QUERIES = [
+    "SELECT ROUND(100.0 * COUNT(*) FILTER (WHERE is_fraud = 1) / COUNT(*), 4) AS fraud_rate_pct FROM transactions",
+    "SELECT transaction_hour, COUNT(*) FILTER (WHERE is_fraud = 1) AS fraud_count,\n"
+    "       ROUND(100.0 * COUNT(*) FILTER (WHERE is_fraud = 1) / COUNT(*), 4) AS fraud_rate_pct\n"
+    "FROM transactions GROUP BY transaction_hour ORDER BY transaction_hour",
+    "SELECT state, COUNT(*) FILTER (WHERE is_fraud = 1) AS fraud_count\n"
+    "FROM transactions GROUP BY state ORDER BY fraud_count DESC LIMIT 10",
+    "SELECT gender, ROUND(AVG(amt) FILTER (WHERE is_fraud = 1), 2) AS avg_fraud_amt\n"
+    "FROM transactions GROUP BY gender",
+    "SELECT transaction_month, category, COUNT(*) FILTER (WHERE is_fraud = 1) AS fraud_count\n"
+    "FROM transactions WHERE transaction_month >= '2020-01' GROUP BY ALL ORDER BY 1, 3 DESC",
+]
+
+
+def _time(db, sql: str, repeats: int) -> tuple[float, list]:
+    samples, rows = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = db.execute_query(sql)
+        samples.append(time.perf_counter() - start)
+        if not result.success:
+            raise RuntimeError(result.error)
+        rows = result.rows
+    return statistics.median(samples) * 1000, rows
+
+
+def _same(a: list, b: list) -> bool:
+    return len(a) == len(b) and all(
+        math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6) if isinstance(x, float) and isinstance(y, float) else x == y
+        for row_a, row_b in zip(a, b) for x, y in zip(row_a, row_b)
+    )
+
+
+def main() -> None:
+    from src.agent.prompts import SQL_FEW_SHOT_EXAMPLES
+    from src.data.database import FraudDatabase
+    from src.data.rollups import RollupRouter
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    base = FraudDatabase.connect(rollup_routing=False)
+    routed = FraudDatabase(base.connection, rollup_routing=True)
+    router = RollupRouter(base.connection)
+
+    queries = [example["sql"] for example in SQL_FEW_SHOT_EXAMPLES] + EXTRA_QUERIES
+    total_base = total_routed = 0.0
+    print(f"{'query':<60} {'rollup':<36} {'scan ms':>9} {'rollup ms':>10} {'speedup':>8}")
+    for sql in queries:
+        rewritten = router.rewrite(sql)
+        table = rewritten.rsplit("FROM ", 1)[-1].split()[0] if rewritten else "-"
+        scan_ms, scan_rows = _time(base, sql, args.repeats)
+        routed_ms, routed_rows = _time(routed, sql, args.repeats)
+        total_base += scan_ms
+        total_routed += routed_ms
+        label = " ".join(sql.split())[:58]
+        mismatch = "" if _same(scan_rows, routed_rows) else "  RESULTS DIFFER"
+        print(
+            f"{label:<60} {table:<36} {scan_ms:>9.2f} {routed_ms:>10.2f} "
+            f"{scan_ms / routed_ms if routed_ms else 0.0:>7.1f}x{mismatch}"
+        )
+    print(f"\nTotal median time: {total_base:.1f} ms scanning, {total_routed:.1f} ms with rollup routing")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""Local OpenAI-compatible stand-in server for offline load testing.
+
+Serves the chat-completions (plain, streaming and tool-calling) and
+embeddings endpoints used by the app with configurable latency and
+deterministic scripted outputs. Point the app at it with:
+
+    python scripts/fake_openai_server.py --profile realistic --port 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake streamlit run app.py
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.prompts import SQL_FEW_SHOT_EXAMPLES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%H:%M:%S",
+)
+logger = logging.getLogger("fake_openai")
+
+EMBEDDING_DIM = 1536
+
+# Latency profiles: time to first token (lognormal median/sigma, seconds),
+# generation speed (tokens/second) and embedding latency (median seconds).
+PROFILES: dict[str, dict[str, float]] = {
+    "instant": {"ttft": 0.0, "sigma": 0.0, "tokens_per_sec": 0.0, "embed": 0.0},
+    "fast": {"ttft": 0.05, "sigma": 0.2, "tokens_per_sec": 500.0, "embed": 0.02},
+    "realistic": {"ttft": 0.45, "sigma": 0.35, "tokens_per_sec": 80.0, "embed": 0.12},
+    "slow": {"ttft": 1.5, "sigma": 0.5, "tokens_per_sec": 30.0, "embed": 0.4},
+}
+
+_DATA_WORDS = re.compile(
+    r"\b(how many|count|rate|monthly|trend|average|total|top|merchant|categor|amount|"
+    r"transactions?|dataset|per (?:month|day|hour)|by (?:state|gender|hour))\b",
+    re.IGNORECASE,
+)
+_DOC_WORDS = re.compile(
+    r"\b(method|technique|prevention|detect|report|eba|ecb|eea|sca|psd2|cross-border|"
+    r"bhatla|according|concept|type[s]? of|regulat)\b",
+    re.IGNORECASE,
+)
+
+DEFAULT_SQL = "SELECT COUNT(*) AS total_transactions FROM transactions"
+DEFAULT_FAITHFULNESS = {"score": 0.9, "reason": "Claims are supported by the provided evidence."}
+DEFAULT_ANSWER = (
+    "Based on the available information, here is a concise answer.\n\n"
+    "- **Key point**: the requested figures are summarised from the tool output.\n"
+    "- **Context**: see the cited sources for details (Understanding Credit Card Frauds, p. 2)."
+)
+
+
+class FakeBackend:
+    """Deterministic response scripting plus latency simulation."""
+
+    def __init__(self, profile: dict[str, float], scripts: list[dict[str, str]], seed: int) -> None:
+        self._profile = profile
+        self._scripts = [(re.compile(s["match"], re.IGNORECASE | re.DOTALL), s["response"]) for s in scripts]
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._sql_by_question = {ex["question"].lower(): ex["sql"] for ex in SQL_FEW_SHOT_EXAMPLES}
+        self.requests = 0
+
+    # -- latency -----------------------------------------------------------
+
+    def _lognormal(self, median: float) -> float:
+        if median <= 0:
+            return 0.0
+        with self._rng_lock:
+            return median * math.exp(self._rng.gauss(0.0, self._profile["sigma"]))
+
+    def first_token_delay(self) -> float:
+        return self._lognormal(self._profile["ttft"])
+
+    def token_delay(self) -> float:
+        rate = self._profile["tokens_per_sec"]
+        return 1.0 / rate if rate > 0 else 0.0
+
+    def embed_delay(self) -> float:
+        return self._lognormal(self._profile["embed"])
+
+    # -- scripted content --------------------------------------------------
+
+    def _scripted(self, text: str) -> str | None:
+        for pattern, response in self._scripts:
+            if pattern.search(text):
+                return response
+        return None
+
+    def _sql_for(self, question: str) -> str:
+        q = question.strip().strip('"').lower()
+        if q in self._sql_by_question:
+            return self._sql_by_question[q]
+        for known, sql in self._sql_by_question.items():
+            if known[:30] in q:
+                return sql
+        return DEFAULT_SQL
+
+    @staticmethod
+    def _text(message: dict[str, Any]) -> str:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+        return content
+
+    def chat(self, body: dict[str, Any]) -> dict[str, Any]:
+        """Return {'content': str} or {'tool_calls': [...]} for a chat request."""
+        messages = body.get("messages", [])
+        all_text = "\n".join(self._text(m) for m in messages)
+        last = messages[-1] if messages else {}
+        last_text = self._text(last)
+
+        scripted = self._scripted(last_text)
+        if scripted is not None:
+            return {"content": scripted}
+
+        tools = body.get("tools") or []
+        if tools and last.get("role") == "user":
+            return {"tool_calls": self._route(last_text, tools)}
+        if tools and last.get("role") == "tool":
+            outputs = [self._text(m) for m in messages if m.get("role") == "tool"]
+            return {"content": self._summarise(outputs)}
+
+        if "You are a SQL expert" in all_text:
+            user = [self._text(m) for m in messages if m.get("role") == "user"]
+            return {"content": self._sql_for(user[-1] if user else "")}
+        if "strict evaluation judge" in all_text:
+            return {"content": json.dumps(DEFAULT_FAITHFULNESS)}
+        return {"content": DEFAULT_ANSWER}
+
+    @staticmethod
+    def _route(question: str, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        names = [t.get("function", {}).get("name", "") for t in tools]
+        sql_tool = next((n for n in names if "database" in n), names[0])
+        doc_tool = next((n for n in names if "document" in n), names[-1])
+        wants_data = bool(_DATA_WORDS.search(question))
+        wants_docs = bool(_DOC_WORDS.search(question))
+        chosen = [sql_tool] if wants_data and not wants_docs else [doc_tool] if wants_docs and not wants_data else [sql_tool, doc_tool]
+        return [
+            {
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps({"question": question})},
+            }
+            for name in chosen
+        ]
+
+    @staticmethod
+    def _summarise(outputs: list[str]) -> str:
+        first = outputs[0].strip().splitlines()[:12] if outputs else []
+        return "## Answer\n\n" + "\n".join(first) if first else DEFAULT_ANSWER
+
+    @staticmethod
+    def embedding(text: str) -> list[float]:
+        """Deterministic unit vector derived from the text hash."""
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        vec = [rng.gauss(0.0, 1.0) for _ in range(EMBEDDING_DIM)]
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class Handler(BaseHTTPRequestHandler):
+    backend: FakeBackend
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        logger.debug(fmt, *args)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length", "0"))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload: dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json({"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]})
+        else:
+            self._send_json({"error": {"message": "not found"}}, status=404)
+
+    def do_POST(self) -> None:
+        body = self._read_json()
+        self.backend.requests += 1
+        if self.path.endswith("/chat/completions"):
+            self._chat(body)
+        elif self.path.endswith("/embeddings"):
+            self._embeddings(body)
+        else:
+            self._send_json({"error": {"message": f"unsupported path {self.path}"}}, status=404)
+
+    def _embeddings(self, body: dict[str, Any]) -> None:
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        time.sleep(self.backend.embed_delay())
+        self._send_json({
+            "object": "list",
+            "model": body.get("model", "text-embedding-3-small"),
+            "data": [
+                {"object": "embedding", "index": i, "embedding": FakeBackend.embedding(text)}
+                for i, text in enumerate(inputs)
+            ],
+            "usage": {"prompt_tokens": sum(map(_approx_tokens, inputs)), "total_tokens": sum(map(_approx_tokens, inputs))},
+        })
+
+    def _chat(self, body: dict[str, Any]) -> None:
+        result = self.backend.chat(body)
+        model = body.get("model", "gpt-4o-mini")
+        prompt_tokens = sum(_approx_tokens(json.dumps(m)) for m in body.get("messages", []))
+        completion = result.get("content") or json.dumps(result.get("tool_calls"))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": _approx_tokens(completion),
+            "total_tokens": prompt_tokens + _approx_tokens(completion),
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        time.sleep(self.backend.first_token_delay())
+
+        if body.get("stream"):
+            self._stream(completion_id, model, result, usage, body)
+            return
+
+        time.sleep(self.backend.token_delay() * usage["completion_tokens"])
+        message: dict[str, Any] = {"role": "assistant", "content": result.get("content")}
+        finish = "stop"
+        if "tool_calls" in result:
+            message["tool_calls"] = result["tool_calls"]
+            finish = "tool_calls"
+        self._send_json({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+            "usage": usage,
+        })
+
+    def _stream(
+        self,
+        completion_id: str,
+        model: str,
+        result: dict[str, Any],
+        usage: dict[str, int],
+        body: dict[str, Any],
+    ) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta: dict[str, Any], finish: str | None = None, **extra: Any) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}] if delta is not None else [],
+                **extra,
+            }
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        chunk({"role": "assistant", "content": ""})
+        if "tool_calls" in result:
+            for i, call in enumerate(result["tool_calls"]):
+                chunk({"tool_calls": [{"index": i, **call}]})
+            finish = "tool_calls"
+        else:
+            for piece in _pieces(result["content"]):
+                time.sleep(self.backend.token_delay())
+                chunk({"content": piece})
+            finish = "stop"
+        chunk({}, finish)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunk(None, usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def _pieces(text: str) -> Iterator[str]:
+    """Split text into roughly token-sized pieces, keeping whitespace."""
+    yield from re.findall(r"\S+\s*|\s+", text)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    parser.add_argument("--ttft", type=float, help="Override median time to first token (s)")
+    parser.add_argument("--tokens-per-sec", type=float, help="Override generation speed")
+    parser.add_argument("--embed-latency", type=float, help="Override median embedding latency (s)")
+    parser.add_argument(
+        "--script", type=Path,
+        help='JSON list of {"match": regex, "response": text} applied to the last message',
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    profile = dict(PROFILES[args.profile])
+    if args.ttft is not None:
+        profile["ttft"] = args.ttft
+    if args.tokens_per_sec is not None:
+        profile["tokens_per_sec"] = args.tokens_per_sec
+    if args.embed_latency is not None:
+        profile["embed"] = args.embed_latency
+    scripts = json.loads(args.script.read_text()) if args.script else []
+
+    Handler.backend = FakeBackend(profile, scripts, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    logger.info(
+        "Fake OpenAI server on http://%s:%d/v1 (profile=%s)", args.host, args.port, args.profile,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.info("Served %d requests", Handler.backend.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Summarize the trace log: p50/p95 latency per pipeline stage, or one request's span tree.
+
+    python scripts/trace_summary.py
+    python scripts/trace_summary.py --request 3f2a9c1b7d4e
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+
+def print_summary(records: list[dict]) -> None:
+    from src.core.tracing import summarize
+
+    stages = summarize(records)
+    requests = len({r["request_id"] for r in records})
+    print(f"{len(records)} spans from {requests} requests\n")
+    print(f"{'stage':<24} {'count':>7} {'p50 ms':>10} {'p95 ms':>10}")
+    for name, stats in sorted(stages.items(), key=lambda item: -item[1]["p95_ms"]):
+        print(f"{name:<24} {stats['count']:>7} {stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f}")
+
+
+def print_request(records: list[dict], request_id: str) -> None:
+    spans = sorted((r for r in records if r["request_id"] == request_id), key=lambda r: r["start"])
+    if not spans:
+        print(f"No spans recorded for request {request_id}")
+        return
+    children = defaultdict(list)
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        children[s["parent_id"] if s["parent_id"] in ids else None].append(s)
+
+    def walk(parent_id: str | None, depth: int) -> None:
+        for s in children[parent_id]:
+            attrs = " ".join(f"{k}={v}" for k, v in s["attrs"].items())
+            print(f"{'  ' * depth}{s['name']:<{32 - 2 * depth}} {s['duration_ms']:>10.1f} ms  {attrs}")
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+
+
+def main() -> None:
+    from src.core.tracing import DEFAULT_TRACE_PATH, load_records
+    from src.core.config import TRACE_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, nargs="?", default=Path(TRACE_PATH or DEFAULT_TRACE_PATH))
+    parser.add_argument("--request", help="Print the span tree of one request id")
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        sys.exit(f"No trace log at {args.path}; answer some questions with TRACING_ENABLED=1 first.")
+    records = list(load_records(args.path))
+    if args.request:
+        print_request(records, args.request)
+    else:
+        print_summary(records)
+
+
+if __name__ == "__main__":
+    main()
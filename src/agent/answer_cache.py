@@ -0,0 +1,234 @@
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+import faiss
+import numpy as np
+
+from src.core.config import ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_SIMILARITY, EMBEDDING_DIM
+from src.data.generation import data_generation
+from src.models.agent import AgentResponse
+from src.models.scoring import QualityScore
+from src.models.source_type import SourceType
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+ANSWER_CACHE_PATH = DATA_DIR / "processed" / "answer_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    embedding BLOB,
+    response TEXT NOT NULL,
+    generation TEXT NOT NULL,
+    created REAL NOT NULL
+)
+"""
+
+_NUMBERS = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?.!").strip()
+
+
+def cache_variant(enable_synthesis: bool) -> str:
+    """Answers with and without synthesis are cached separately."""
+    return "synthesis" if enable_synthesis else "plain"
+
+
+class AnswerCache:
+    """Semantic cache of complete AgentResponses for first-turn questions.
+
+    Exact hits match the normalized question text; semantic hits match the
+    question embedding against past questions in a FAISS inner-product index
+    at ``threshold`` or above, and must mention the same numbers (so "2019"
+    never answers "2020"). Everything is dropped when the processed data
+    generation (DuckDB file or FAISS index) changes.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = ANSWER_CACHE_PATH,
+        threshold: float = ANSWER_CACHE_SIMILARITY,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        generation_fn: Callable[[], str] = data_generation,
+    ) -> None:
+        self._path = Path(path)
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._generation_fn = generation_fn
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute(_SCHEMA)
+        self._con.commit()
+        self._generation = ""
+        self._questions: dict[str, str] = {}
+        self._index = faiss.IndexFlatIP(EMBEDDING_DIM)
+        self._index_keys: list[str] = []
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        with self._lock:
+            self._sync_generation()
+
+    @staticmethod
+    def _key(question: str, variant: str) -> str:
+        return f"{variant}\0{normalize_question(question)}"
+
+    def _sync_generation(self) -> None:
+        """Reload for the current data generation, purging stale entries."""
+        generation = self._generation_fn()
+        if generation == self._generation:
+            return
+        purged = self._con.execute(
+            "DELETE FROM answers WHERE generation != ?", (generation,),
+        ).rowcount
+        self._con.commit()
+        if purged:
+            logger.info("Answer cache: dropped %d entries from an older data generation", purged)
+        self._generation = generation
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        rows = self._con.execute("SELECT key, question, embedding FROM answers").fetchall()
+        self._questions = {key: question for key, question, _ in rows}
+        self._index.reset()
+        self._index_keys = []
+        vectors = [np.frombuffer(blob, dtype=np.float32) for _, _, blob in rows if blob is not None]
+        if vectors:
+            self._index.add(np.vstack(vectors))
+            self._index_keys = [key for key, _, blob in rows if blob is not None]
+
+    def get(self, question: str, variant: str) -> AgentResponse | None:
+        """Exact (normalized text) lookup; needs no embedding."""
+        key = self._key(question, variant)
+        with self._lock:
+            self._sync_generation()
+            if key not in self._questions:
+                return None
+            self.exact_hits += 1
+            return self._load(key)
+
+    def get_similar(
+        self,
+        question: str,
+        embedding: list[float],
+        variant: str,
+    ) -> AgentResponse | None:
+        """Semantic lookup against past questions; counts a miss when nothing qualifies."""
+        query = self._normalize_vector(embedding)
+        numbers = set(_NUMBERS.findall(question))
+        with self._lock:
+            self._sync_generation()
+            if self._index.ntotal:
+                k = min(5, self._index.ntotal)
+                scores, ids = self._index.search(query.reshape(1, -1), k)
+                for score, idx in zip(scores[0], ids[0]):
+                    if idx < 0 or score < self._threshold:
+                        break
+                    key = self._index_keys[idx]
+                    if not key.startswith(f"{variant}\0"):
+                        continue
+                    if set(_NUMBERS.findall(self._questions[key])) != numbers:
+                        continue
+                    logger.info(
+                        "Answer cache hit (%.3f): %r ~ %r", score, question[:80], self._questions[key][:80],
+                    )
+                    self.semantic_hits += 1
+                    return self._load(key)
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        question: str,
+        embedding: list[float] | None,
+        response: AgentResponse,
+        variant: str,
+    ) -> str | None:
+        """Store a successful response and return its entry id; errors and partial answers are never cached."""
+        if response.error or response.partial or response.source_type == SourceType.ERROR:
+            return None
+        key = self._key(question, variant)
+        entry = f"{key}\0{uuid.uuid4().hex}"
+        blob = self._normalize_vector(embedding).tobytes() if embedding is not None else None
+        payload = response.model_copy(update={"cached": False, "cache_entry": entry}).model_dump_json()
+        with self._lock:
+            self._sync_generation()
+            self._con.execute(
+                "INSERT OR REPLACE INTO answers (key, question, embedding, response, generation, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, question, blob, payload, self._generation, time.time()),
+            )
+            overflow = len(self._questions) + (key not in self._questions) - self._max_entries
+            if overflow > 0:
+                self._con.execute(
+                    "DELETE FROM answers WHERE key IN "
+                    "(SELECT key FROM answers WHERE key != ? ORDER BY created LIMIT ?)",
+                    (key, overflow),
+                )
+            self._con.commit()
+            if overflow > 0 or key in self._questions:
+                self._rebuild()
+            else:
+                self._questions[key] = question
+                if blob is not None:
+                    self._index.add(np.frombuffer(blob, dtype=np.float32).reshape(1, -1))
+                    self._index_keys.append(key)
+        return entry
+
+    def attach_quality(self, entry: str, quality: QualityScore) -> None:
+        """Store the quality score computed for a cached answer so hits can reuse it.
+
+        ``entry`` is the id returned by ``put`` (or carried on a hit); a replaced or
+        evicted entry is left alone so a score never lands on a different answer.
+        """
+        key = entry.rpartition("\0")[0]
+        with self._lock:
+            row = self._con.execute("SELECT response FROM answers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            response = AgentResponse.model_validate_json(row[0])
+            if response.cache_entry != entry:
+                return
+            response.quality = quality
+            self._con.execute(
+                "UPDATE answers SET response = ? WHERE key = ?", (response.model_dump_json(), key),
+            )
+            self._con.commit()
+
+    def _load(self, key: str) -> AgentResponse | None:
+        row = self._con.execute("SELECT response FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return AgentResponse.model_validate_json(row[0]).model_copy(update={"cached": True})
+
+    @staticmethod
+    def _normalize_vector(embedding: list[float]) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._questions),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "generation": self._generation,
+            }
@@ -0,0 +1,210 @@
+import json
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from src.agent.prompts import SQL_FEW_SHOT_EXAMPLES
+from src.agent.rag_tool import SOURCE_KEYWORDS
+from src.core.config import INTENT_CONFIDENCE_THRESHOLD, INTENT_LOG_PATH
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+ROUTING_LOG_PATH = DATA_DIR / "processed" / "routing_decisions.jsonl"
+
+ROUTES = ("sql", "rag")
+
+# Lexical hints used to predict questions that need both tools: an explicit
+# reference to the transaction dataset plus a document/report reference.
+DATA_HINTS = re.compile(
+    r"\b(dataset|database|our data|transaction data|in the data|merchants?|"
+    r"merchant categor(?:y|ies)|2019|2020)\b",
+    re.IGNORECASE,
+)
+DOC_HINTS = re.compile(
+    r"\b(methods?|techniques?|prevent(?:ion)?|detection|reports?|regulat\w*|research|paper|"
+    r"according to|"
+    + "|".join(re.escape(k) for keywords in SOURCE_KEYWORDS.values() for k in keywords)
+    + r")\b",
+    re.IGNORECASE,
+)
+
+# Years outside the 2019-2020 dataset (and report half-years) usually mean SQL
+# will come back UNANSWERABLE.
+_OUT_OF_RANGE_PERIOD = re.compile(r"\b(?:20(?:0\d|1[0-8]|2[1-9])|h[12] 20\d\d)\b", re.IGNORECASE)
+
+SQL_SEED_QUESTIONS = [
+    "What is the fraud rate by state?",
+    "How many fraudulent transactions were there in 2020?",
+    "Which hour of the day has the most fraud?",
+    "What is the fraud rate by gender?",
+    "Average transaction amount by merchant category",
+    "Which states have the highest number of fraud cases?",
+    "Show the total fraud amount per month",
+    "How many transactions are in the dataset?",
+]
+RAG_SEED_QUESTIONS = [
+    "What are the main types of credit card fraud?",
+    "What fraud detection techniques does the paper describe?",
+    "How do fraudsters commit card skimming?",
+    "What prevention methods are recommended against card fraud?",
+    "What did the EBA/ECB report find about payment fraud?",
+    "How does strong customer authentication affect fraud?",
+    "What is identity theft in the context of credit cards?",
+    "What share of fraud was cross-border according to the report?",
+]
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how i in is it me of on or show "
+    "tell that the their there this to was were what which who why with".split()
+)
+_TOKEN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)?")
+
+
+def _features(text: str) -> list[str]:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def looks_borderline(question: str) -> bool:
+    """Whether the documents may end up answering the question instead of SQL."""
+    return bool(DOC_HINTS.search(question) or _OUT_OF_RANGE_PERIOD.search(question))
+
+
+class IntentPrediction:
+    """Route chosen by the local classifier and its confidence."""
+
+    def __init__(self, route: str | None, confidence: float, evidence: int) -> None:
+        self.route = route
+        self.confidence = confidence
+        self.evidence = evidence
+
+    def __repr__(self) -> str:
+        return f"IntentPrediction(route={self.route!r}, confidence={self.confidence:.3f})"
+
+
+class IntentClassifier:
+    """Lexical naive Bayes router for the confident SQL-only and RAG-only cases.
+
+    Seeded from the SQL few-shot questions, SOURCE_KEYWORDS and built-in
+    seed questions, and updated from routing decisions the agent made.
+    Questions hinting at both sources are reported as ``"both"``; anything
+    below the confidence threshold is deferred to the agent (route None).
+    """
+
+    def __init__(
+        self,
+        log_path: Path | str | None = None,
+        threshold: float = INTENT_CONFIDENCE_THRESHOLD,
+        min_evidence: int = 2,
+    ) -> None:
+        self._log_path = Path(log_path or INTENT_LOG_PATH or ROUTING_LOG_PATH)
+        self._threshold = threshold
+        self._min_evidence = min_evidence
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter[str]] = {r: Counter() for r in ROUTES}
+        self._docs: Counter[str] = Counter()
+        self._vocab: set[str] = set()
+        self.predictions = 0
+        self.routed_local: Counter[str] = Counter()
+        self.deferred = 0
+        self.saved_seconds = 0.0
+        self._seed()
+
+    def _seed(self) -> None:
+        for ex in SQL_FEW_SHOT_EXAMPLES:
+            self._learn(ex["question"], "sql")
+        for q in SQL_SEED_QUESTIONS:
+            self._learn(q, "sql")
+        for keywords in SOURCE_KEYWORDS.values():
+            for k in keywords:
+                self._learn(k, "rag")
+        for q in RAG_SEED_QUESTIONS:
+            self._learn(q, "rag")
+        if self._log_path.exists():
+            logged = 0
+            with self._log_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if entry.get("route") in ROUTES:
+                        self._learn(entry["question"], entry["route"])
+                        logged += 1
+            logger.info("Intent classifier loaded %d logged routing decisions", logged)
+
+    def _learn(self, text: str, route: str) -> None:
+        features = _features(text)
+        self._counts[route].update(features)
+        self._docs[route] += 1
+        self._vocab.update(features)
+
+    def predict(self, question: str) -> IntentPrediction:
+        """Classify a question as 'sql', 'rag', 'both', or None (defer to agent)."""
+        with self._lock:
+            self.predictions += 1
+            if DATA_HINTS.search(question) and DOC_HINTS.search(question):
+                return IntentPrediction("both", 1.0, 0)
+
+            features = _features(question)
+            evidence = sum(1 for f in features if f in self._vocab)
+            if evidence < self._min_evidence:
+                self.deferred += 1
+                return IntentPrediction(None, 0.0, evidence)
+
+            vocab = len(self._vocab)
+            total_docs = sum(self._docs.values())
+            scores = {}
+            for route in ROUTES:
+                counts = self._counts[route]
+                denom = sum(counts.values()) + vocab
+                score = math.log((self._docs[route] + 1) / (total_docs + len(ROUTES)))
+                for f in features:
+                    if f in self._vocab:
+                        score += math.log((counts[f] + 1) / denom)
+                scores[route] = score
+            top = max(scores.values())
+            norm = sum(math.exp(s - top) for s in scores.values())
+            route = max(scores, key=scores.get)
+            confidence = 1.0 / norm
+
+            if confidence < self._threshold:
+                self.deferred += 1
+                return IntentPrediction(None, confidence, evidence)
+            return IntentPrediction(route, confidence, evidence)
+
+    def record_local(self, route: str, saved_seconds: float) -> None:
+        """Count a question answered without the router turn."""
+        with self._lock:
+            self.routed_local[route] += 1
+            self.saved_seconds += saved_seconds
+
+    def log_decision(self, question: str, route: str) -> None:
+        """Learn from, and persist, a routing decision the agent made."""
+        if route not in ROUTES:
+            return
+        with self._lock:
+            self._learn(question, route)
+            try:
+                self._log_path.parent.mkdir(parents=True, exist_ok=True)
+                with self._log_path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps({"question": question, "route": route}, ensure_ascii=False) + "\n")
+            except OSError as exc:
+                logger.warning("Could not log routing decision: %s", exc)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            local = sum(self.routed_local.values())
+            return {
+                "questions": self.predictions,
+                "routed_local": local,
+                "local_pct": round(100.0 * local / self.predictions, 1) if self.predictions else 0.0,
+                "by_route": dict(self.routed_local),
+                "deferred": self.deferred,
+                "latency_saved_s": round(self.saved_seconds, 2),
+            }
@@ -0,0 +1,153 @@
+import logging
+
+from src.core.config import MODEL
+from src.core.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+# Items shorter than this are dropped rather than truncated to a stub.
+_MIN_TRUNCATED_ITEM_TOKENS = 40
+
+
+class _Section:
+    """One named prompt section and its packing result."""
+
+    def __init__(
+        self,
+        name: str,
+        items: list[str],
+        priority: int,
+        required: bool,
+        truncate: bool,
+        header: str = "",
+        separator: str = "\n",
+    ) -> None:
+        self.name = name
+        self.items = items
+        self.priority = priority
+        self.required = required
+        self.truncate = truncate
+        self.header = header
+        self.separator = separator
+        self.kept: list[str] = []
+        self.original_tokens = 0
+        self.tokens = 0
+        self.trimmed = False
+
+
+class PromptBuilder:
+    """Assemble prompt sections under a token budget.
+
+    Required sections are always kept in full. Optional sections are filled
+    in priority order (lower first): a section that does not fit keeps as
+    many leading items as fit, optionally truncating the last one.
+    """
+
+    def __init__(self, budget: int, model: str = MODEL, name: str = "prompt") -> None:
+        self._budget = budget
+        self._model = model
+        self._name = name
+        self._sections: list[_Section] = []
+        self._packed = False
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        *,
+        priority: int = 0,
+        required: bool = False,
+        truncate: bool = True,
+    ) -> "PromptBuilder":
+        """Add a single-text section; it is truncated by lines when over budget."""
+        items = text.split("\n") if truncate and not required else [text]
+        return self._add(_Section(name, items, priority, required, truncate, separator="\n"))
+
+    def add_items(
+        self,
+        name: str,
+        items: list[str],
+        *,
+        priority: int = 0,
+        header: str = "",
+        separator: str = "\n",
+        truncate: bool = False,
+    ) -> "PromptBuilder":
+        """Add a list section packed item by item (items keep their order)."""
+        return self._add(_Section(name, list(items), priority, False, truncate, header, separator))
+
+    def _add(self, section: _Section) -> "PromptBuilder":
+        self._sections.append(section)
+        self._packed = False
+        return self
+
+    def _count(self, text: str) -> int:
+        return count_tokens(text, self._model) if text else 0
+
+    def _pack(self) -> None:
+        if self._packed:
+            return
+        remaining = self._budget
+        for s in self._sections:
+            s.original_tokens = self._count(s.header) + sum(self._count(i) + 1 for i in s.items)
+        for s in self._sections:
+            if s.required:
+                s.kept, s.tokens = list(s.items), s.original_tokens
+                remaining -= s.tokens
+        for s in sorted((s for s in self._sections if not s.required), key=lambda s: s.priority):
+            s.kept, s.tokens, s.trimmed = [], 0, False
+            header_tokens = self._count(s.header)
+            if remaining <= header_tokens:
+                s.trimmed = bool(s.items)
+                continue
+            used = header_tokens
+            for item in s.items:
+                cost = self._count(item) + 1
+                if used + cost <= remaining:
+                    s.kept.append(item)
+                    used += cost
+                    continue
+                room = remaining - used - 1
+                if s.truncate and room >= _MIN_TRUNCATED_ITEM_TOKENS:
+                    s.kept.append(truncate_to_tokens(item, room, self._model))
+                    used = remaining
+                s.trimmed = True
+                break
+            if s.kept:
+                s.tokens = used
+                remaining -= used
+        self._packed = True
+        if any(s.trimmed for s in self._sections):
+            logger.info("%s trimmed to budget %d: %s", self._name, self._budget, self.report())
+
+    def section(self, name: str) -> str:
+        """Packed text of one section ('' if dropped)."""
+        self._pack()
+        for s in self._sections:
+            if s.name == name:
+                if not s.kept:
+                    return ""
+                body = s.separator.join(s.kept)
+                return f"{s.header}{s.separator}{body}" if s.header else body
+        raise KeyError(name)
+
+    def build(self, joiner: str = "\n") -> str:
+        """Packed sections joined in insertion order."""
+        return joiner.join(t for t in (self.section(s.name) for s in self._sections) if t)
+
+    def report(self) -> dict[str, dict[str, int]]:
+        """Per-section token cost after packing, with the untrimmed cost."""
+        self._pack()
+        return {
+            s.name: {
+                "tokens": s.tokens,
+                "original_tokens": s.original_tokens,
+                "items": len(s.kept),
+                "total_items": len(s.items),
+            }
+            for s in self._sections
+        }
+
+    def total_tokens(self) -> int:
+        self._pack()
+        return sum(s.tokens for s in self._sections)
@@ -29,6 +29,8 @@ findings --> use search_fraud_documents.
 - If the question spans both data analysis and document knowledge --> use BOTH \
 tools and synthesize. When in doubt between using one tool or both, prefer using \
 BOTH rather than asking the user for clarification.
+- When using BOTH tools, call them together in the same response (parallel tool \
+calls) rather than one after the other.
 - If the question is out of scope (not related to credit card fraud data or \
 research) --> politely decline. Example response: "I'm sorry, I can only help \
 with questions about credit card fraud data and research. Could you rephrase \
@@ -195,6 +197,11 @@ Please fix the query. Return ONLY the corrected raw SQL. \
 No markdown fences, no trailing semicolons, no explanations.
 """
 
+SQL_TIMEOUT_HINT = """\
+The query was cancelled because it ran too long. Rewrite it to scan `transactions` \
+once: no self-joins or cross joins, no correlated subqueries, filter with WHERE before \
+aggregating, and return aggregates rather than raw rows."""
+
 # ---------------------------------------------------------------------------
 # RAG Generation Prompt
 # ---------------------------------------------------------------------------
@@ -280,13 +287,41 @@ Respond with ONLY valid JSON (no markdown, no code fences):
 # Helper: format few-shot examples for the SQL prompt
 # ---------------------------------------------------------------------------
 
+SQL_FEW_SHOT_HEADER = "\n**Few-shot examples**:"
+
+
+def format_sql_few_shot_examples() -> list[str]:
+    """Format each few-shot example as its own prompt block."""
+    return [
+        f"\nQ: \"{ex['question']}\"\nSQL:\n```sql\n{ex['sql']}\n```"
+        for ex in SQL_FEW_SHOT_EXAMPLES
+    ]
+
+
 def format_sql_few_shot() -> str:
     """Format few-shot examples into a string for the SQL system prompt."""
-    lines: list[str] = ["\n**Few-shot examples**:"]
-    for ex in SQL_FEW_SHOT_EXAMPLES:
-        lines.append(f"\nQ: \"{ex['question']}\"")
-        lines.append(f"SQL:\n```sql\n{ex['sql']}\n```")
-    return "\n".join(lines)
+    return "\n".join([SQL_FEW_SHOT_HEADER, *format_sql_few_shot_examples()])
+
+
+# ---------------------------------------------------------------------------
+# SQL Answer Prompt (local fast path)
+# ---------------------------------------------------------------------------
+
+SQL_ANSWER_PROMPT = """\
+You are a fraud analysis assistant. Answer the user's question using only the \
+SQL results below, which come from a simulated credit card transaction dataset \
+(2019-01-01 to 2020-12-31).
+
+**User question**: {question}
+
+**SQL Database Results**:
+{sql_context}
+
+**Rules**:
+- Start with a direct 1-2 sentence answer, then summarise the key numbers.
+- Cite specific values from the results; do not fabricate data.
+- Use markdown formatting (bullet points, bold for emphasis) and stay under 250 words.
+"""
 
 
 # ---------------------------------------------------------------------------
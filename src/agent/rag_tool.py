@@ -1,9 +1,13 @@
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from src.agent.prompts import RAG_GENERATION_PROMPT
-from src.core.config import DEDUP_SIMILARITY_THRESHOLD
-from src.core.llm_client import LLMClient
+from src.agent.prompt_builder import PromptBuilder
+from src.core.config import DEDUP_SIMILARITY_THRESHOLD, OPENAI_TIMEOUT, RAG_CONTEXT_TOKEN_BUDGET
+from src.core import tracing
+from src.core.deadline import Deadline
+from src.core.llm_client import AsyncLLMClient, LLMClient
 from src.data.vectorstore import VectorStore
 from src.models.tools import RAGToolResult
 from src.models.chunks import SearchResult
@@ -27,8 +31,14 @@ SOURCE_KEYWORDS: dict[str, list[str]] = {
 class RAGTool:
     """RAG pipeline: retrieve relevant chunks and generate cited answers."""
 
-    def __init__(self, llm_client: LLMClient, vector_store: VectorStore) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        vector_store: VectorStore,
+        async_llm_client: AsyncLLMClient | None = None,
+    ) -> None:
         self._llm = llm_client
+        self._allm = async_llm_client
         self._store = vector_store
 
     def run(
@@ -43,45 +53,126 @@ class RAGTool:
             if source_filter:
                 logger.info("Detected source filter: %s", source_filter)
 
-            results = self._store.search(
-                query=question, client=client,
-                top_k=top_k, source_filter=source_filter,
-            )
+            with tracing.span("rag.embed"):
+                embedding = self._llm.embed([question])[0]
+            with tracing.span("rag.search", top_k=top_k):
+                results = self._store.search_by_vector(
+                    embedding, top_k=top_k, source_filter=source_filter,
+                )
 
+            results = self._traced_dedup(results)
             if not results:
-                return RAGToolResult(
-                    success=True,
-                    answer="I couldn't find relevant information in the available documents to answer this question.",
-                )
+                return self._no_results()
 
-            results = self._deduplicate(results)
+            context = self._format_context(results)
+            with tracing.span("rag.answer"):
+                answer = self._generate_answer(question, context)
+            return self._build_result(answer, results)
 
-            avg_score = sum(r.score for r in results) / len(results)
-            if avg_score < 0.3:
-                logger.warning("Low average similarity score: %.3f", avg_score)
+        except Exception as exc:
+            logger.error("RAG tool error: %s", exc, exc_info=True)
+            return RAGToolResult(success=False, error=str(exc))
 
-            context = self._format_context(results)
-            answer = self._generate_answer(question, context)
-
-            return RAGToolResult(
-                success=True,
-                answer=answer,
-                retrieved_chunks=[r.text for r in results],
-                sources=[
-                    {
-                        "source": SOURCE_DISPLAY_NAMES.get(r.metadata.source, r.metadata.source),
-                        "page": r.metadata.page,
-                        "score": round(r.score, 4),
-                    }
-                    for r in results
-                ],
-                similarity_scores=[r.score for r in results],
-            )
+    async def arun(
+        self,
+        question: str,
+        client: Any,
+        top_k: int = 5,
+        retrieved: list[SearchResult] | None = None,
+        on_delta: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> RAGToolResult:
+        """Async RAG pipeline using the async LLM client when available.
+
+        ``retrieved`` skips retrieval with results from an earlier ``aretrieve``;
+        ``on_delta`` receives the answer text as it streams; running past the
+        ``deadline`` returns a failed result.
+        """
+        try:
+            if retrieved is None:
+                retrieved = await self.aretrieve(question, client, top_k, deadline)
+            if not retrieved:
+                return self._no_results()
+
+            context = self._format_context(retrieved)
+            with tracing.span("rag.answer"):
+                answer = await self._agenerate_answer(question, context, on_delta, deadline)
+            return self._build_result(answer, retrieved)
 
         except Exception as exc:
             logger.error("RAG tool error: %s", exc, exc_info=True)
             return RAGToolResult(success=False, error=str(exc))
 
+    async def aretrieve(
+        self,
+        question: str,
+        client: Any,
+        top_k: int = 5,
+        deadline: Deadline | None = None,
+    ) -> list[SearchResult]:
+        """Embed the question and return deduplicated FAISS matches."""
+        source_filter = self._detect_source_filter(question)
+        if source_filter:
+            logger.info("Detected source filter: %s", source_filter)
+
+        if self._allm is not None:
+            with tracing.span("rag.embed"):
+                embedding = (await self._allm.embed([question], deadline=deadline))[0]
+            with tracing.span("rag.search", top_k=top_k):
+                results = self._store.search_by_vector(
+                    embedding, top_k=top_k, source_filter=source_filter,
+                )
+        else:
+            search = asyncio.to_thread(
+                self._store.search,
+                query=question, client=client,
+                top_k=top_k, source_filter=source_filter,
+            )
+            with tracing.span("rag.search", top_k=top_k, includes_embedding=True):
+                results = await (deadline.wait_for(search, "retrieval") if deadline is not None else search)
+        return self._traced_dedup(results)
+
+    @classmethod
+    def _traced_dedup(cls, results: list[SearchResult]) -> list[SearchResult]:
+        with tracing.span("rag.dedup", candidates=len(results)) as span:
+            unique = cls._deduplicate(results)
+            span.set(kept=len(unique))
+        return unique
+
+    @staticmethod
+    def _no_results() -> RAGToolResult:
+        return RAGToolResult(
+            success=True,
+            answer="I couldn't find relevant information in the available documents to answer this question.",
+        )
+
+    @staticmethod
+    def _build_result(answer: str, results: list[SearchResult]) -> RAGToolResult:
+        """Package the generated answer and its supporting chunks."""
+        avg_score = sum(r.score for r in results) / len(results)
+        if avg_score < 0.3:
+            logger.warning("Low average similarity score: %.3f", avg_score)
+
+        return RAGToolResult(
+            success=True,
+            answer=answer,
+            retrieved_chunks=[r.text for r in results],
+            sources=RAGTool.source_entries(results),
+            similarity_scores=[r.score for r in results],
+        )
+
+    @staticmethod
+    def source_entries(results: list[SearchResult]) -> list[dict[str, Any]]:
+        """Display name, page and score for each retrieved chunk."""
+        return [
+            {
+                "source": SOURCE_DISPLAY_NAMES.get(r.metadata.source, r.metadata.source),
+                "page": r.metadata.page,
+                "score": round(r.score, 4),
+            }
+            for r in results
+        ]
+
     @staticmethod
     def _detect_source_filter(question: str) -> str | None:
         """Detect which PDF source to filter by based on question keywords."""
@@ -112,7 +203,7 @@ class RAGTool:
 
     @staticmethod
     def _format_context(results: list[SearchResult]) -> str:
-        """Format search results as numbered context for the LLM prompt."""
+        """Format search results as numbered context, packed to the token budget."""
         if not results:
             return "No relevant context found."
 
@@ -123,7 +214,10 @@ class RAGTool:
                 f"[{i}] [Source: {source_name}, Page {r.metadata.page}] "
                 f"(relevance: {r.score:.3f})\n{r.text}"
             )
-        return "\n\n".join(parts)
+        # Results arrive ranked, so packing in order keeps the most relevant chunks.
+        builder = PromptBuilder(RAG_CONTEXT_TOKEN_BUDGET, name="RAG context")
+        builder.add_items("chunks", parts, separator="\n\n", truncate=True)
+        return builder.build() or "No relevant context found."
 
     def _generate_answer(self, question: str, context: str) -> str:
         """Call LLM to generate an answer from the retrieved context."""
@@ -132,4 +226,34 @@ class RAGTool:
             [{"role": "user", "content": prompt}],
             temperature=0.1,
             max_tokens=1000,
+            operation="rag_answer",
+        )
+
+    async def _agenerate_answer(
+        self,
+        question: str,
+        context: str,
+        on_delta: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> str:
+        """Async variant of _generate_answer, optionally streaming deltas to ``on_delta``."""
+        prompt = RAG_GENERATION_PROMPT.format(context=context, question=question)
+        messages = [{"role": "user", "content": prompt}]
+        if self._allm is not None and on_delta is not None:
+            parts = []
+            async for delta in self._allm.chat_stream(
+                messages, temperature=0.1, max_tokens=1000, operation="rag_answer", deadline=deadline,
+            ):
+                parts.append(delta)
+                on_delta(delta)
+            return "".join(parts).strip()
+        if self._allm is not None:
+            return await self._allm.chat(
+                messages, temperature=0.1, max_tokens=1000, operation="rag_answer", deadline=deadline,
+            )
+        if deadline is not None:
+            deadline.check("rag_answer")
+        return await asyncio.to_thread(
+            self._llm.chat, messages, temperature=0.1, max_tokens=1000, operation="rag_answer",
+            timeout=deadline.timeout(OPENAI_TIMEOUT) if deadline is not None else None,
         )
@@ -1,23 +1,62 @@
+import asyncio
+import hashlib
+import json
 import logging
-from typing import AsyncIterator
+import time
+from typing import AsyncIterator, Awaitable, Callable
 
 from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+try:
+    from pydantic_ai.models.openai import OpenAIChatModel
+except ImportError:  # pydantic-ai < 0.7 names the Chat Completions model OpenAIModel
+    from pydantic_ai.models.openai import OpenAIModel as OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai import Agent, RunContext
 
+from src.agent.answer_cache import AnswerCache, cache_variant
+from src.agent.intent import DATA_HINTS, DOC_HINTS, IntentClassifier, looks_borderline
+from src.agent.prompt_builder import PromptBuilder
 from src.agent.prompts import ROUTER_SYSTEM_PROMPT
 from src.agent.sql_tool import SQLTool
 from src.agent.rag_tool import RAGTool
 from src.agent.synthesis import ResultSynthesizer
-from src.core.config import MIN_QUESTION_LENGTH, MAX_QUESTION_LENGTH
-from src.core.llm_client import LLMClient
+from src.core import tracing
+from src.core.config import (
+    MIN_QUESTION_LENGTH, MAX_QUESTION_LENGTH, ROUTER_SQL_OUTPUT_TOKEN_BUDGET,
+    PARALLEL_TOOLS_ENABLED, PARALLEL_TOOLS_TIMEOUT_SECONDS, SPECULATIVE_RAG_ENABLED,
+    QUESTION_DEADLINE_SECONDS, DEADLINE_GRACE_SECONDS, BATCH_CONCURRENCY,
+)
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.llm_client import AsyncLLMClient, LLMClient
+from src.core.resilience import LatencyRecorder
+from src.core.singleflight import SingleFlight
+from src.core.tokens import count_tokens
 from src.data.database import FraudDatabase
 from src.data.vectorstore import VectorStore
-from src.models.agent import AgentDeps, AgentResponse
+from src.models.agent import AgentDeps, AgentResponse, BatchResult
+from src.models.events import (
+    ChunksRetrieved, Done, SQLGenerated, SQLRowsReady, StreamEvent, SynthesisToken, Token, ToolStarted,
+)
+from src.models.scoring import QualityScore
 from src.models.source_type import SourceType
 from src.models.tools import SQLToolResult, RAGToolResult
 
 logger = logging.getLogger(__name__)
 
+ROUTER_MODEL = "gpt-4o-mini"
+
+PARTIAL_SQL_ANSWER = (
+    "I ran out of time before I could write up the answer. "
+    "Here are the query results I found."
+)
+
+
+class _HeldEvents(list):
+    """Stand-in event queue that keeps events until the caller forwards or drops them."""
+
+    def put_nowait(self, event: StreamEvent) -> None:
+        self.append(event)
+
 
 class FraudRouter:
     """PydanticAI-based router that dispatches questions to SQL or RAG tools.
@@ -31,20 +70,35 @@ class FraudRouter:
         llm_client: LLMClient,
         database: FraudDatabase,
         vector_store: VectorStore,
+        async_llm_client: AsyncLLMClient | None = None,
+        single_flight: SingleFlight | None = None,
+        latency: LatencyRecorder | None = None,
+        parallel_tools: bool = PARALLEL_TOOLS_ENABLED,
+        intent: IntentClassifier | None = None,
+        answer_cache: AnswerCache | None = None,
     ) -> None:
         self._llm = llm_client
-        self._sql_tool = SQLTool(llm_client, database)
-        self._rag_tool = RAGTool(llm_client, vector_store)
-        self._synthesizer = ResultSynthesizer(llm_client)
+        self._answers = answer_cache
+        self._parallel_tools = parallel_tools
+        self._intent = intent
+        self._allm = async_llm_client
+        self._flight = single_flight
+        self._latency = latency
+        self._sql_tool = SQLTool(llm_client, database, async_llm_client)
+        self._rag_tool = RAGTool(llm_client, vector_store, async_llm_client)
+        self._synthesizer = ResultSynthesizer(llm_client, async_llm_client)
         self._agent = self._create_agent()
 
+    def warm_up(self) -> None:
+        """Prepare the SQL tool's prompt inputs ahead of the first question."""
+        self._sql_tool.warm_up()
+
     def _create_agent(self) -> Agent[AgentDeps, str]:
         """Build the PydanticAI agent with registered tools."""
-        sql_tool = self._sql_tool
-        rag_tool = self._rag_tool
+        router = self
 
         a = Agent(
-            model="openai:gpt-4o-mini",
+            model=f"openai:{ROUTER_MODEL}",
             system_prompt=ROUTER_SYSTEM_PROMPT,
             deps_type=AgentDeps,
             retries=2,
@@ -58,23 +112,10 @@ class FraudRouter:
             amounts, rates from the fraud dataset (2019-2020, ~1.85M transactions).
             """
             logger.info("SQL Tool called with: %s", question)
-            result = sql_tool.run(question)
+            result = await router._arun_sql(question, ctx.deps)
             ctx.deps.tool_outputs["sql"] = result
 
-            if not result.success:
-                return f"SQL query failed: {result.error}"
-            if not result.rows:
-                return "Query executed successfully but returned no results."
-
-            lines = [f"SQL Query: {result.sql_query}", ""]
-            lines.append(f"Results ({result.row_count} rows):")
-            lines.append(" | ".join(result.columns))
-            lines.append("-" * 60)
-            for row in result.rows[:50]:
-                lines.append(" | ".join(str(row.get(c, "")) for c in result.columns))
-            if result.row_count > 50:
-                lines.append(f"... and {result.row_count - 50} more rows")
-            return "\n".join(lines)
+            return FraudRouter._format_sql_output(result)
 
         @a.tool
         async def search_fraud_documents(ctx: RunContext[AgentDeps], question: str) -> str:
@@ -84,10 +125,7 @@ class FraudRouter:
             regulatory findings, EBA/ECB report data, cross-border statistics.
             """
             logger.info("RAG Tool called with: %s", question)
-            result = rag_tool.run(
-                question=question,
-                client=ctx.deps.openai_client,
-            )
+            result = await router._arun_rag(question, ctx.deps)
             ctx.deps.tool_outputs["rag"] = result
 
             if not result.success:
@@ -96,6 +134,22 @@ class FraudRouter:
 
         return a
 
+    async def _admit_router_turn(self, question: str) -> None:
+        """Reserve limiter capacity for the agent's tool-call and answer requests."""
+        if self._allm is not None:
+            prompt_tokens = count_tokens(ROUTER_SYSTEM_PROMPT + question, ROUTER_MODEL)
+            await self._allm.admit(2 * prompt_tokens, requests=2)
+
+    def _record_latency(self, operation: str, elapsed: float) -> None:
+        if self._latency is not None:
+            self._latency.record(operation, elapsed)
+
+    def _agent_model(self) -> OpenAIChatModel | None:
+        """Router model bound to the shared async connection pool, if configured."""
+        if self._allm is None:
+            return None
+        return OpenAIChatModel(ROUTER_MODEL, provider=OpenAIProvider(openai_client=self._allm.client))
+
     def _sql_is_unanswerable(self, sql: SQLToolResult | None) -> bool:
         """Check if SQL returned an UNANSWERABLE result."""
         if not sql or not sql.success:
@@ -106,20 +160,285 @@ class FraudRouter:
             return any("UNANSWERABLE" in v for v in values)
         return False
 
-    def _fallback_to_rag(self, question: str, deps: AgentDeps) -> RAGToolResult | None:
+    async def _fallback_to_rag(self, question: str, deps: AgentDeps) -> RAGToolResult | None:
         """Invoke the RAG tool as a fallback when SQL can't answer."""
         logger.info("SQL returned UNANSWERABLE; falling back to RAG for: %s", question)
         try:
-            rag_result = self._rag_tool.run(
-                question=question,
-                client=deps.openai_client,
-            )
+            rag_result = await self._arun_rag(question, deps)
             deps.tool_outputs["rag"] = rag_result
             return rag_result
         except Exception as e:
             logger.error("RAG fallback failed: %s", e, exc_info=True)
             return None
 
+    def _start_prefetch(self, question: str, deps: AgentDeps) -> None:
+        """Speculatively embed and search for borderline questions while SQL runs."""
+        if SPECULATIVE_RAG_ENABLED and looks_borderline(question):
+            deps.rag_prefetch[question.strip()] = asyncio.ensure_future(
+                self._rag_tool.aretrieve(question, deps.openai_client, deadline=deps.deadline),
+            )
+
+    @staticmethod
+    def _emit(deps: AgentDeps, event: StreamEvent) -> None:
+        """Publish a progress event when a stream is consuming them."""
+        if deps.events is not None:
+            deps.events.put_nowait(event)
+
+    @staticmethod
+    def _deltas(
+        deps: AgentDeps,
+        event_type: type[Token] | type[SynthesisToken],
+    ) -> Callable[[str], None] | None:
+        """Callback publishing text deltas as ``event_type``, or None when not streaming."""
+        if deps.events is None:
+            return None
+        return lambda text: FraudRouter._emit(deps, event_type(text=text))
+
+    async def _arun_sql(self, question: str, deps: AgentDeps) -> SQLToolResult:
+        """Run the SQL tool, publishing the query and its rows as soon as they exist."""
+        reused, deps.fast_path_sql = deps.fast_path_sql, None
+        if reused is not None:
+            # Already generated, run and published by the fast path.
+            logger.info("Reusing the fast path's SQL result for: %s", question[:80])
+            return reused
+        self._emit(deps, ToolStarted(tool="sql", question=question))
+        result = await self._sql_tool.arun(
+            question,
+            on_sql=lambda sql: self._emit(deps, SQLGenerated(sql=sql)),
+            deadline=deps.deadline,
+        )
+        if result.success and not self._sql_is_unanswerable(result):
+            self._emit(deps, SQLRowsReady(
+                sql=result.sql_query, columns=result.columns, rows=result.rows, row_count=result.row_count,
+            ))
+        return result
+
+    async def _arun_rag(
+        self,
+        question: str,
+        deps: AgentDeps,
+        on_delta: Callable[[str], None] | None = None,
+    ) -> RAGToolResult:
+        """Run the RAG tool, reusing speculative retrieval for the same question.
+
+        Retrieved chunks are published before the answer is generated.
+        """
+        self._emit(deps, ToolStarted(tool="rag", question=question))
+        retrieved = None
+        task = deps.rag_prefetch.pop(question.strip(), None)
+        if task is not None:
+            try:
+                retrieved = await task
+                logger.info("Using speculative retrieval for: %s", question[:80])
+            except Exception as exc:
+                logger.warning("Speculative retrieval failed: %s", exc)
+        if retrieved is None:
+            try:
+                retrieved = await self._rag_tool.aretrieve(
+                    question, deps.openai_client, deadline=deps.deadline,
+                )
+            except Exception as exc:
+                logger.error("RAG tool error: %s", exc, exc_info=True)
+                return RAGToolResult(success=False, error=str(exc))
+        if retrieved:
+            self._emit(deps, ChunksRetrieved(
+                retrieved_chunks=[r.text for r in retrieved],
+                sources=RAGTool.source_entries(retrieved),
+                similarity_scores=[r.score for r in retrieved],
+            ))
+        return await self._rag_tool.arun(
+            question=question, client=deps.openai_client, retrieved=retrieved,
+            on_delta=on_delta, deadline=deps.deadline,
+        )
+
+    @staticmethod
+    def _discard_prefetch(deps: AgentDeps) -> None:
+        """Cancel speculative retrieval nobody consumed (SQL answered the question)."""
+        for task in deps.rag_prefetch.values():
+            if task.done() and not task.cancelled():
+                task.exception()  # mark a failed prefetch as retrieved
+            task.cancel()
+        deps.rag_prefetch.clear()
+
+    def _predict_route(
+        self,
+        question: str,
+        message_history: list[dict[str, str]] | None,
+    ) -> str | None:
+        """Locally predicted route ('sql', 'rag', 'both'), or None to let the agent decide.
+
+        Only first-turn questions are predicted: the tools never see the
+        conversation, so follow-ups always go through the agent.
+        """
+        if not self._is_first_turn(message_history):
+            return None
+        if self._intent is None:
+            both = DATA_HINTS.search(question) and DOC_HINTS.search(question)
+            return "both" if both else None
+        prediction = self._intent.predict(question)
+        logger.info("Local intent for %r: %s", question[:80], prediction)
+        return prediction.route
+
+    async def _try_fast_path(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AgentResponse | None:
+        """Answer without the router agent turn when the route is predictable."""
+        route = self._predict_route(question, message_history)
+        start = time.monotonic()
+        if route == "both" and enable_synthesis and self._parallel_tools:
+            attempt = self._try_parallel(question, deps)
+        elif route == "sql":
+            attempt = self._try_local_sql(question, deps, enable_synthesis)
+        elif route == "rag":
+            attempt = self._try_local_rag(question, deps)
+        else:
+            return None
+        with tracing.span("fast_path", route=route) as fast:
+            response = await attempt
+            fast.set(answered=response is not None)
+        if response is not None and self._intent is not None:
+            router_turn = self._latency.mean("router_turn") if self._latency is not None else None
+            saved = max(0.0, router_turn - (time.monotonic() - start)) if router_turn else 0.0
+            self._intent.record_local(route, saved)
+        return response
+
+    async def _try_local_sql(
+        self,
+        question: str,
+        deps: AgentDeps,
+        enable_synthesis: bool,
+    ) -> AgentResponse | None:
+        """SQL-only fast path: run the SQL tool and write the answer in one chat call.
+
+        Tool events are held until the query succeeds, so a failed attempt leaves
+        nothing in the stream when the agent takes over. If only the write-up
+        fails, the agent reuses the result rather than generating the SQL again.
+        """
+        queue = deps.events
+        if queue is not None:
+            deps.events = _HeldEvents()
+        try:
+            sql = await self._arun_sql(question, deps)
+        finally:
+            held, deps.events = deps.events, queue
+        if not sql.success:
+            logger.info("Local SQL route failed; deferring to the agent")
+            return None
+        for event in held or []:
+            queue.put_nowait(event)
+        deps.tool_outputs["sql"] = sql
+        answer = ""
+        if not self._sql_is_unanswerable(sql):
+            answer = await self._synthesizer.aanswer_sql(
+                question, sql, self._deltas(deps, Token), deps.deadline,
+            )
+            if not answer:
+                deps.tool_outputs = {}
+                deps.fast_path_sql = sql
+                return None
+        return await self._complete(question, answer, deps, enable_synthesis)
+
+    async def _try_local_rag(self, question: str, deps: AgentDeps) -> AgentResponse | None:
+        """RAG-only fast path: the RAG tool already writes a cited answer."""
+        rag = await self._arun_rag(question, deps, self._deltas(deps, Token))
+        if not rag.success or not rag.answer:
+            logger.info("Local RAG route failed; deferring to the agent")
+            return None
+        deps.tool_outputs["rag"] = rag
+        return self._build_response(rag.answer, None, rag)
+
+    async def _complete(
+        self,
+        question: str,
+        answer: str,
+        deps: AgentDeps,
+        enable_synthesis: bool,
+    ) -> AgentResponse:
+        """Apply the UNANSWERABLE fallback and synthesis to collected tool outputs."""
+        sql = deps.tool_outputs.get("sql")
+        rag = deps.tool_outputs.get("rag")
+
+        # Fallback: if SQL returned UNANSWERABLE and RAG wasn't called,
+        # automatically invoke RAG since the answer may exist in documents
+        if self._sql_is_unanswerable(sql) and rag is None:
+            rag = await self._fallback_to_rag(question, deps)
+            if rag and rag.success and rag.answer:
+                answer = rag.answer
+
+        source_type = self._infer_source_type(sql, rag)
+
+        if enable_synthesis and source_type == SourceType.BOTH and sql and rag:
+            synthesized = await self._synthesizer.asynthesize(
+                question, sql, rag, self._deltas(deps, SynthesisToken), deps.deadline,
+            )
+            if synthesized:
+                answer = synthesized
+
+        return self._build_response(answer, sql, rag)
+
+    def _log_agent_route(self, question: str, deps: AgentDeps) -> None:
+        """Feed single-tool agent decisions back to the local classifier."""
+        if self._intent is None:
+            return
+        used = [name for name in ("sql", "rag") if name in deps.tool_outputs]
+        if len(used) == 1:
+            self._intent.log_decision(question, used[0])
+
+    async def _run_tools_parallel(
+        self,
+        question: str,
+        deps: AgentDeps,
+    ) -> tuple[SQLToolResult | None, RAGToolResult | None]:
+        """Run SQL and RAG concurrently under one deadline; unfinished tools are cancelled."""
+        start = time.monotonic()
+        timeout = PARALLEL_TOOLS_TIMEOUT_SECONDS
+        if deps.deadline is not None:
+            timeout = deps.deadline.timeout(timeout)
+        with tracing.span("parallel_tools") as parallel:
+            tasks = {
+                "sql": asyncio.ensure_future(self._arun_sql(question, deps)),
+                "rag": asyncio.ensure_future(self._arun_rag(question, deps)),
+            }
+            try:
+                done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+            finally:
+                for task in tasks.values():
+                    if not task.done():
+                        task.cancel()
+            parallel.set(timed_out=bool(pending))
+        if pending:
+            logger.warning("Parallel tools hit the %.1fs deadline", timeout)
+
+        for name, task in tasks.items():
+            if task in done and task.exception() is None:
+                deps.tool_outputs[name] = task.result()
+            elif task in done:
+                logger.error("Parallel %s tool failed: %s", name, task.exception())
+        self._record_latency("parallel_tools", time.monotonic() - start)
+        return deps.tool_outputs.get("sql"), deps.tool_outputs.get("rag")
+
+    async def _try_parallel(self, question: str, deps: AgentDeps) -> AgentResponse | None:
+        """Answer a predicted both-source question without the agent turn.
+
+        Returns None (after clearing partial outputs) when either tool fails,
+        SQL cannot answer, or synthesis produces nothing, so the caller can
+        fall back to the agent.
+        """
+        sql, rag = await self._run_tools_parallel(question, deps)
+        if sql and sql.success and not self._sql_is_unanswerable(sql) and rag and rag.success:
+            synthesized = await self._synthesizer.asynthesize(
+                question, sql, rag, self._deltas(deps, SynthesisToken), deps.deadline,
+            )
+            if synthesized:
+                return self._build_response(synthesized, sql, rag)
+        logger.info("Parallel tool path incomplete; falling back to the agent")
+        deps.tool_outputs = {}
+        return None
+
     async def run(
         self,
         question: str,
@@ -127,40 +446,222 @@ class FraudRouter:
         message_history: list[dict[str, str]] | None = None,
         enable_synthesis: bool = True,
     ) -> AgentResponse:
-        """Run the agent synchronously and return a structured response."""
+        """Run the agent synchronously and return a structured response.
+
+        Concurrent runs of the same question and history share one agent run
+        when a SingleFlight is configured; first-turn questions are served from
+        the AnswerCache when one is configured.
+        """
         error = self._validate_input(question)
         if error:
             return AgentResponse(answer=error, source_type=SourceType.ERROR, error=error)
 
+        self._start_deadline(deps)
+        self._start_request(deps)
+        with tracing.request(deps.request_id), tracing.span("question", streamed=False) as root:
+            response = await self._respond(question, deps, message_history, enable_synthesis)
+            root.set(source_type=response.source_type.value, partial=response.partial)
+        return response
+
+    async def _respond(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AgentResponse:
+        use_cache = self._answers is not None and self._is_first_turn(message_history)
+        embedding = None
+        if use_cache:
+            cached, embedding = await self._lookup_answer(question, enable_synthesis, deps.deadline)
+            if cached is not None:
+                return cached
+
+        try:
+            if self._flight is None:
+                response = await self._run(question, deps, message_history, enable_synthesis)
+            else:
+                # A leader that runs out of time raises instead of sharing its partial
+                # answer; followers then answer under their own deadlines.
+                key = self._flight_key(question, message_history, enable_synthesis)
+                response = await self._flight.ado(
+                    key, lambda: self._run(question, deps, message_history, enable_synthesis),
+                )
+                response = response.model_copy(deep=True)
+        except DeadlineExceeded as e:
+            logger.warning("Question ran out of time: %s", e)
+            response = self._partial_response(e, deps)
+
+        if use_cache:
+            await self._store_answer(question, embedding, response, enable_synthesis)
+        return response
+
+    async def run_batch(
+        self,
+        questions: list[str],
+        deps: AgentDeps,
+        concurrency: int = BATCH_CONCURRENCY,
+        enable_synthesis: bool = True,
+        score: Callable[[str, AgentResponse], Awaitable[QualityScore]] | None = None,
+    ) -> AsyncIterator[BatchResult]:
+        """Answer independent first-turn questions, at most ``concurrency`` at a time.
+
+        Each question runs on its own copy of ``deps`` and its own deadline;
+        ``score`` (if given) runs inside the same concurrency slot. Results are
+        yielded in completion order; ``BatchResult.index`` is the input position.
+        """
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def answer(index: int, question: str) -> BatchResult:
+            async with slots:
+                start = time.monotonic()
+                item_deps = self._fresh_deps(deps)
+                response = await self.run(question, item_deps, enable_synthesis=enable_synthesis)
+                seconds = time.monotonic() - start
+                self._record_latency("batch_question", seconds)
+                quality = None
+                if score is not None:
+                    try:
+                        with tracing.request(item_deps.request_id):
+                            quality = await score(question, response)
+                    except Exception as exc:
+                        logger.warning("Scoring failed for batch question %d: %s", index, exc)
+                return BatchResult(
+                    index=index, question=question, response=response,
+                    seconds=round(seconds, 3), quality=quality,
+                )
+
+        tasks = [asyncio.ensure_future(answer(i, q)) for i, q in enumerate(questions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _fresh_deps(deps: AgentDeps) -> AgentDeps:
+        """Copy of ``deps`` sharing the connections but none of the per-request state."""
+        return deps.model_copy(update={
+            "tool_outputs": {}, "rag_prefetch": {}, "fast_path_sql": None, "events": None, "deadline": None,
+            "request_id": None,
+        })
+
+    async def _lookup_answer(
+        self,
+        question: str,
+        enable_synthesis: bool,
+        deadline: Deadline | None = None,
+    ) -> tuple[AgentResponse | None, list[float] | None]:
+        """Answer-cache lookup: exact text first, then by question embedding.
+
+        Returns the cached response (or None) and the embedding, if computed.
+        """
+        variant = cache_variant(enable_synthesis)
+        with tracing.span("answer_cache.lookup") as lookup:
+            cached = await asyncio.to_thread(self._answers.get, question, variant)
+            if cached is not None:
+                lookup.set(hit="exact")
+                return cached, None
+            try:
+                if self._allm is not None:
+                    embedding = (await self._allm.embed([question], deadline=deadline))[0]
+                else:
+                    embedding = (await asyncio.to_thread(self._llm.embed, [question]))[0]
+            except Exception as exc:
+                logger.warning("Answer cache lookup skipped: %s", exc)
+                lookup.set(hit=None)
+                return None, None
+            cached = await asyncio.to_thread(self._answers.get_similar, question, embedding, variant)
+            lookup.set(hit="similar" if cached is not None else None)
+        return cached, embedding
+
+    async def _store_answer(
+        self,
+        question: str,
+        embedding: list[float] | None,
+        response: AgentResponse,
+        enable_synthesis: bool,
+    ) -> None:
+        try:
+            response.cache_entry = await asyncio.to_thread(
+                self._answers.put, question, embedding, response, cache_variant(enable_synthesis),
+            )
+        except Exception as exc:
+            logger.warning("Could not cache answer: %s", exc)
+
+    async def _run(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AgentResponse:
+        """Answer within ``deps.deadline``; DeadlineExceeded is left to the caller."""
         try:
             deps.tool_outputs = {}
-            history = self._build_message_history(message_history)
+            self._start_prefetch(question, deps)
+            return await self._within_deadline(
+                self._answer(question, deps, message_history, enable_synthesis), deps,
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.error("Agent error: %s", e, exc_info=True)
+            return self._error_response(e)
+        finally:
+            self._discard_prefetch(deps)
 
-            result = await self._agent.run(question, deps=deps, message_history=history)
-            answer = result.output if isinstance(result.output, str) else str(result.output)
+    async def _answer(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AgentResponse:
+        response = await self._try_fast_path(question, deps, message_history, enable_synthesis)
+        if response is not None:
+            return response
 
-            sql = deps.tool_outputs.get("sql")
-            rag = deps.tool_outputs.get("rag")
+        history = self._build_message_history(message_history)
 
-            # Fallback: if SQL returned UNANSWERABLE and RAG wasn't called,
-            # automatically invoke RAG since the answer may exist in documents
-            if self._sql_is_unanswerable(sql) and rag is None:
-                rag = self._fallback_to_rag(question, deps)
-                if rag and rag.success and rag.answer:
-                    answer = rag.answer
+        await self._admit_router_turn(question)
+        start = time.monotonic()
+        with tracing.span("router_turn", streamed=False):
+            result = await self._agent.run(
+                question, deps=deps, message_history=history, model=self._agent_model(),
+            )
+            self._trace_usage(result.usage)
+        self._record_latency("router_turn", time.monotonic() - start)
+        answer = result.output if isinstance(result.output, str) else str(result.output)
+        self._log_agent_route(question, deps)
+        return await self._complete(question, answer, deps, enable_synthesis)
 
-            source_type = self._infer_source_type(sql, rag)
+    @staticmethod
+    def _trace_usage(usage) -> None:
+        """Attribute a PydanticAI run's token usage to the current span."""
+        if callable(usage):  # a method before pydantic-ai 1.0, a property since
+            usage = usage()
+        prompt = getattr(usage, "input_tokens", None) or getattr(usage, "request_tokens", None) or 0
+        completion = getattr(usage, "output_tokens", None) or getattr(usage, "response_tokens", None) or 0
+        tracing.add_tokens(prompt, completion)
 
-            if enable_synthesis and source_type == SourceType.BOTH and sql and rag:
-                synthesized = self._synthesizer.synthesize(question, sql, rag)
-                if synthesized:
-                    answer = synthesized
+    @staticmethod
+    def _start_deadline(deps: AgentDeps) -> None:
+        if deps.deadline is None:
+            deps.deadline = Deadline(QUESTION_DEADLINE_SECONDS)
 
-            return self._build_response(answer, sql, rag)
+    @staticmethod
+    def _start_request(deps: AgentDeps) -> None:
+        if deps.request_id is None:
+            deps.request_id = tracing.new_request_id()
 
-        except Exception as e:
-            logger.error("Agent error: %s", e, exc_info=True)
-            return self._error_response(e)
+    @staticmethod
+    async def _within_deadline(aw, deps: AgentDeps) -> AgentResponse:
+        """Backstop for the whole question; stages that check the deadline give up first."""
+        if deps.deadline is None:
+            return await aw
+        return await deps.deadline.wait_for(aw, "question", grace=DEADLINE_GRACE_SECONDS)
 
     async def run_stream(
         self,
@@ -168,45 +669,149 @@ class FraudRouter:
         deps: AgentDeps,
         message_history: list[dict[str, str]] | None = None,
         enable_synthesis: bool = True,
-    ) -> AsyncIterator[str | AgentResponse]:
-        """Stream agent output as text deltas, then yield the full AgentResponse."""
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream typed progress events, ending with ``Done`` carrying the full AgentResponse.
+
+        Tool events (``sql_rows_ready``, ``chunks_retrieved``) arrive as soon as
+        each tool has them; ``token`` events carry the answer text and
+        ``synthesis_token`` events a synthesized answer that replaces it.
+        """
         error = self._validate_input(question)
         if error:
-            yield AgentResponse(answer=error, source_type=SourceType.ERROR, error=error)
+            yield Done(response=AgentResponse(answer=error, source_type=SourceType.ERROR, error=error))
             return
 
+        self._start_deadline(deps)
+        self._start_request(deps)
+        use_cache = self._answers is not None and self._is_first_turn(message_history)
+        embedding = None
+        if use_cache:
+            # Spans are never held across a yield: the consumer may resume us in another context.
+            with tracing.request(deps.request_id):
+                cached, embedding = await self._lookup_answer(question, enable_synthesis, deps.deadline)
+            if cached is not None:
+                yield Done(response=cached)
+                return
+
+        async for event in self._stream(question, deps, message_history, enable_synthesis):
+            if use_cache and isinstance(event, Done):
+                await self._store_answer(question, embedding, event.response, enable_synthesis)
+            yield event
+
+    async def _stream(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AsyncIterator[StreamEvent]:
+        """Drain the events published while the answer is produced in a background task."""
+        deps.events = asyncio.Queue()
+        producer = asyncio.ensure_future(
+            self._produce(question, deps, message_history, enable_synthesis),
+        )
         try:
-            deps.tool_outputs = {}
-            history = self._build_message_history(message_history)
-
-            full_text = ""
-            async with self._agent.run_stream(question, deps=deps, message_history=history) as stream:
+            while True:
+                event = await deps.events.get()
+                yield event
+                if isinstance(event, Done):
+                    return
+        finally:
+            producer.cancel()
+            deps.events = None
+
+    async def _produce(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> None:
+        with tracing.request(deps.request_id), tracing.span("question", streamed=True) as root:
+            try:
+                deps.tool_outputs = {}
+                self._start_prefetch(question, deps)
+                response = await self._within_deadline(
+                    self._answer_streaming(question, deps, message_history, enable_synthesis), deps,
+                )
+            except DeadlineExceeded as e:
+                logger.warning("Question ran out of time: %s", e)
+                response = self._partial_response(e, deps)
+            except Exception as e:
+                logger.error("Agent stream error: %s", e, exc_info=True)
+                response = self._error_response(e)
+            finally:
+                self._discard_prefetch(deps)
+            root.set(source_type=response.source_type.value, partial=response.partial)
+        self._emit(deps, Done(response=response))
+
+    async def _answer_streaming(
+        self,
+        question: str,
+        deps: AgentDeps,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> AgentResponse:
+        response = await self._try_fast_path(question, deps, message_history, enable_synthesis)
+        if response is not None:
+            return response
+
+        history = self._build_message_history(message_history)
+
+        full_text = ""
+        await self._admit_router_turn(question)
+        start = time.monotonic()
+        with tracing.span("router_turn", streamed=True):
+            async with self._agent.run_stream(
+                question, deps=deps, message_history=history, model=self._agent_model(),
+            ) as stream:
                 async for delta in stream.stream_text(delta=True):
                     full_text += delta
-                    yield delta
-
-            sql = deps.tool_outputs.get("sql")
-            rag = deps.tool_outputs.get("rag")
-
-            # Fallback: if SQL returned UNANSWERABLE and RAG wasn't called,
-            # automatically invoke RAG since the answer may exist in documents
-            if self._sql_is_unanswerable(sql) and rag is None:
-                rag = self._fallback_to_rag(question, deps)
-                if rag and rag.success and rag.answer:
-                    full_text = rag.answer
+                    self._emit(deps, Token(text=delta))
+                self._trace_usage(stream.usage)
+        self._record_latency("router_turn", time.monotonic() - start)
+        self._log_agent_route(question, deps)
+        return await self._complete(question, full_text, deps, enable_synthesis)
 
-            source_type = self._infer_source_type(sql, rag)
+    @staticmethod
+    def _format_sql_output(result: SQLToolResult) -> str:
+        """Render SQL results for the agent, packing up to 50 rows into the token budget."""
+        if not result.success:
+            return f"SQL query failed: {result.error}"
+        if not result.rows:
+            return "Query executed successfully but returned no results."
+
+        header = [
+            f"SQL Query: {result.sql_query}", "",
+            f"Results ({result.row_count} rows):",
+            " | ".join(result.columns),
+            "-" * 60,
+        ]
+        rows = [" | ".join(str(row.get(c, "")) for c in result.columns) for row in result.rows[:50]]
+        builder = PromptBuilder(ROUTER_SQL_OUTPUT_TOKEN_BUDGET, name="SQL tool output")
+        builder.add("header", "\n".join(header), required=True)
+        builder.add_items("rows", rows)
 
-            if enable_synthesis and source_type == SourceType.BOTH and sql and rag:
-                synthesized = self._synthesizer.synthesize(question, sql, rag)
-                if synthesized:
-                    full_text = synthesized
+        shown = builder.report()["rows"]["items"]
+        lines = [builder.build()]
+        if result.row_count > shown:
+            lines.append(f"... and {result.row_count - shown} more rows")
+        return "\n".join(lines)
 
-            yield self._build_response(full_text, sql, rag)
+    @staticmethod
+    def _flight_key(
+        question: str,
+        message_history: list[dict[str, str]] | None,
+        enable_synthesis: bool,
+    ) -> str:
+        history = [m["content"] for m in (message_history or [])[-6:] if m["role"] == "user"]
+        payload = json.dumps([question.strip(), history, enable_synthesis], ensure_ascii=False)
+        return "run:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-        except Exception as e:
-            logger.error("Agent stream error: %s", e, exc_info=True)
-            yield self._error_response(e)
+    @staticmethod
+    def _is_first_turn(message_history: list[dict[str, str]] | None) -> bool:
+        """True when no earlier user message precedes the current question."""
+        return not any(m["role"] == "user" for m in (message_history or [])[:-1])
 
     @staticmethod
     def _validate_input(question: str) -> str | None:
@@ -264,6 +869,24 @@ class FraudRouter:
             sources=rag.sources if rag and rag.success else None,
         )
 
+    def _partial_response(self, error: DeadlineExceeded, deps: AgentDeps) -> AgentResponse:
+        """Whatever finished before the time budget ran out, or an error if nothing did."""
+        sql = deps.tool_outputs.get("sql")
+        rag = deps.tool_outputs.get("rag")
+        if not sql or not sql.success or self._sql_is_unanswerable(sql):
+            sql = None
+        if not rag or not rag.success or not rag.answer:
+            rag = None
+        if rag is not None:
+            answer = rag.answer
+        elif sql is not None:
+            answer = PARTIAL_SQL_ANSWER
+        else:
+            return self._error_response(error)
+        response = self._build_response(answer, sql, rag)
+        response.partial = True
+        return response
+
     @staticmethod
     def _error_response(error: str | Exception) -> AgentResponse:
         msg = str(error)
@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator
+
+import numpy as np
+from openai import OpenAI
+
+from src.agent.answer_cache import AnswerCache
+from src.agent.intent import IntentClassifier
+from src.agent.prompts import ROUTER_SYSTEM_PROMPT
+from src.agent.router import ROUTER_MODEL, FraudRouter
+from src.core import tracing
+from src.core.batching import EmbeddingBatcher
+from src.core.cache import ResponseCache
+from src.core.config import (
+    ANSWER_CACHE_ENABLED, BATCH_CONCURRENCY, EMBEDDING_BATCHING_ENABLED, EMBEDDING_DIM,
+    INTENT_FAST_PATH_ENABLED, LLM_CACHE_ENABLED, QUESTION_DEADLINE_SECONDS,
+)
+from src.core.deadline import Deadline
+from src.core.embedding_cache import get_embedding_cache
+from src.core.llm_client import AsyncLLMClient, LLMClient, create_openai_client
+from src.core.rate_limit import RateLimiter
+from src.core.resilience import CircuitBreaker, LatencyRecorder
+from src.core.singleflight import SingleFlight
+from src.core.tokens import count_tokens
+from src.data.database import FraudDatabase
+from src.data.result_cache import get_result_cache
+from src.data.vectorstore import VectorStore
+from src.models.agent import AgentDeps, AgentResponse, BatchResult
+from src.models.events import SQLGenerated, StreamEvent, ToolStarted
+from src.models.scoring import QualityScore
+from src.scoring.quality import QualityScorer
+from src.scoring.validation import AnswerValidator
+
+logger = logging.getLogger(__name__)
+
+
+class FraudService:
+    """Process-wide owner of the clients, caches, router, scorer and validator.
+
+    Everything here is built once and shared by all sessions; the router,
+    scorer and validator keep no per-request state (that lives in
+    AgentDeps), so concurrent questions are safe.
+    """
+
+    def __init__(
+        self,
+        client: OpenAI,
+        database: FraudDatabase,
+        vector_store: VectorStore,
+        response_cache: ResponseCache | None = None,
+        answer_cache: AnswerCache | None = None,
+        intent: IntentClassifier | None = None,
+    ) -> None:
+        self.client = client
+        self.database = database
+        self.vector_store = vector_store
+        self.answer_cache = answer_cache
+        self.intent = intent
+        self.single_flight = SingleFlight()
+        self.rate_limiter = RateLimiter()
+        self.circuit_breaker = CircuitBreaker()
+        self.latency = LatencyRecorder()
+
+        batcher = None
+        if EMBEDDING_BATCHING_ENABLED:
+            upstream = LLMClient(
+                client,
+                rate_limiter=self.rate_limiter,
+                circuit_breaker=self.circuit_breaker,
+                latency=self.latency,
+            )
+            batcher = EmbeddingBatcher(lambda texts, model: upstream.embed(texts, model=model))
+        components: dict[str, Any] = {
+            "cache": response_cache,
+            "embedding_cache": get_embedding_cache(),
+            "single_flight": self.single_flight,
+            "batcher": batcher,
+            "rate_limiter": self.rate_limiter,
+            "circuit_breaker": self.circuit_breaker,
+            "latency": self.latency,
+        }
+        self.llm = LLMClient(client, **components)
+        self.async_llm = AsyncLLMClient(**components)
+
+        self.router = FraudRouter(
+            self.llm, database, vector_store,
+            async_llm_client=self.async_llm,
+            single_flight=self.single_flight,
+            latency=self.latency,
+            intent=intent,
+            answer_cache=answer_cache,
+        )
+        self.scorer = QualityScorer(self.llm, async_llm_client=self.async_llm)
+        self.validator = AnswerValidator()
+        self._questions = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, answer_cache: bool = ANSWER_CACHE_ENABLED) -> "FraudService":
+        """Build the service from the default data files and config flags."""
+        return cls(
+            client=create_openai_client(),
+            database=FraudDatabase.connect(result_cache=get_result_cache()),
+            vector_store=VectorStore.load(),
+            response_cache=ResponseCache() if LLM_CACHE_ENABLED else None,
+            answer_cache=AnswerCache() if answer_cache else None,
+            intent=IntentClassifier() if INTENT_FAST_PATH_ENABLED else None,
+        )
+
+    def warm_up(self) -> dict[str, float]:
+        """Touch DuckDB, FAISS and the prompts once so the first question is not cold.
+
+        Returns the seconds spent per step.
+        """
+        timings: dict[str, float] = {}
+
+        def step(name: str, fn) -> None:
+            start = time.monotonic()
+            try:
+                fn()
+            except Exception as exc:
+                logger.warning("Warm-up step %s failed: %s", name, exc)
+            timings[name] = round(time.monotonic() - start, 3)
+
+        step("duckdb", lambda: self.database.connection.execute("SELECT COUNT(*) FROM transactions").fetchone())
+        step("sql_prompt", self.router.warm_up)
+        step("faiss", lambda: self.vector_store.search_by_vector(np.ones(EMBEDDING_DIM, dtype=np.float32), top_k=1))
+        step("tokenizer", lambda: count_tokens(ROUTER_SYSTEM_PROMPT, ROUTER_MODEL))
+        logger.info("Warm-up finished: %s", timings)
+        return timings
+
+    def deps(self, request_id: str | None = None) -> AgentDeps:
+        """Fresh per-request agent dependencies."""
+        return AgentDeps(
+            con=self.database.connection,
+            openai_client=self.client,
+            faiss_index=self.vector_store.index,
+            chunks=self.vector_store.chunks,
+            request_id=request_id,
+        )
+
+    async def run(
+        self,
+        question: str,
+        message_history: list[dict[str, str]] | None = None,
+        enable_synthesis: bool = True,
+        request_id: str | None = None,
+    ) -> AgentResponse:
+        """Answer a question; time to first token equals time to the full answer."""
+        start = time.monotonic()
+        response = await self.router.run(
+            question, self.deps(request_id), message_history=message_history, enable_synthesis=enable_synthesis,
+        )
+        self._record_ttft(time.monotonic() - start)
+        self.latency.record("question_total", time.monotonic() - start)
+        return response
+
+    async def run_stream(
+        self,
+        question: str,
+        message_history: list[dict[str, str]] | None = None,
+        enable_synthesis: bool = True,
+        request_id: str | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Stream a question's events, recording time to the first visible output.
+
+        Progress-only events (tool started, SQL generated) do not count as output.
+        """
+        start = time.monotonic()
+        first = True
+        async for event in self.router.run_stream(
+            question, self.deps(request_id), message_history=message_history, enable_synthesis=enable_synthesis,
+        ):
+            if first and not isinstance(event, (ToolStarted, SQLGenerated)):
+                self._record_ttft(time.monotonic() - start)
+                first = False
+            yield event
+        self.latency.record("question_total", time.monotonic() - start)
+
+    async def run_batch(
+        self,
+        questions: list[str],
+        concurrency: int = BATCH_CONCURRENCY,
+        enable_synthesis: bool = True,
+        score: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """Answer (and optionally score) many questions with bounded concurrency."""
+
+        async def _score(question: str, response: AgentResponse) -> QualityScore:
+            return await self.score(question, response)
+
+        async for result in self.router.run_batch(
+            questions, self.deps(),
+            concurrency=concurrency,
+            enable_synthesis=enable_synthesis,
+            score=_score if score else None,
+        ):
+            yield result
+
+    def _record_ttft(self, seconds: float) -> None:
+        with self._lock:
+            self._questions += 1
+            first = self._questions == 1
+        if first:
+            # The first question shows the cold-start cost (with or without warm-up).
+            self.latency.record("ttft_first_question", seconds)
+            logger.info("Time to first token for the first question: %.2fs", seconds)
+        self.latency.record("ttft", seconds)
+
+    async def score(
+        self,
+        question: str,
+        response: AgentResponse,
+        deadline: Deadline | None = None,
+        request_id: str | None = None,
+    ) -> QualityScore:
+        """Quality score plus validation; reuses the score stored with cached answers.
+
+        Scoring gets its own time budget unless a ``deadline`` is given. Its spans
+        join the trace of ``request_id`` (or of the request already in scope).
+        """
+        with tracing.request(request_id or tracing.current_request_id()), tracing.span("scoring"):
+            return await self._score(question, response, deadline)
+
+    async def _score(
+        self,
+        question: str,
+        response: AgentResponse,
+        deadline: Deadline | None,
+    ) -> QualityScore:
+        if response.quality is not None:
+            quality = response.quality.model_copy()
+        else:
+            context = ""
+            if response.sql_results:
+                context = str(response.sql_results[:20])
+            if response.retrieved_chunks:
+                context += "\n".join(response.retrieved_chunks)
+            quality = await self.scorer.ascore(
+                question=question,
+                answer=response.answer,
+                context=context or response.answer,
+                source_type=response.source_type,
+                similarity_scores=response.similarity_scores,
+                sql_success=response.sql_results is not None and len(response.sql_results) > 0,
+                sql_row_count=len(response.sql_results) if response.sql_results else 0,
+                deadline=deadline or Deadline(QUESTION_DEADLINE_SECONDS),
+            )
+            if self.answer_cache is not None and response.cache_entry is not None:
+                await asyncio.to_thread(self.answer_cache.attach_quality, response.cache_entry, quality)
+
+        with tracing.span("validation"):
+            quality.validation_passed, quality.validation_reason = self.validator.validate(
+                answer=response.answer,
+                source_type=response.source_type,
+                sql_results=response.sql_results,
+                retrieved_chunks=response.retrieved_chunks,
+            )
+        return quality
@@ -1,41 +1,135 @@
+import asyncio
 import logging
-from typing import Any
+import threading
+from functools import partial
+from typing import Any, Callable
 
 import duckdb
 
-from src.agent.prompts import SQL_SYSTEM_PROMPT, SQL_ERROR_CORRECTION_PROMPT, format_sql_few_shot
-from src.core.config import MAX_SQL_RETRIES, PII_COLUMNS
-from src.core.llm_client import LLMClient
+from src.agent.prompt_builder import PromptBuilder
+from src.agent.prompts import (
+    SQL_SYSTEM_PROMPT, SQL_ERROR_CORRECTION_PROMPT, SQL_FEW_SHOT_HEADER, SQL_TIMEOUT_HINT,
+    format_sql_few_shot_examples,
+)
+from src.core.config import (
+    HEDGE_ENABLED, MAX_SQL_RETRIES, OPENAI_TIMEOUT, PII_COLUMNS, QUERY_TIMEOUT_SECONDS, SQL_PROMPT_TOKEN_BUDGET,
+)
+from src.core import tracing
+from src.core.deadline import Deadline
+from src.core.llm_client import AsyncLLMClient, LLMClient
 from src.data.database import FraudDatabase
-from src.models.tools import SQLToolResult
+from src.data.generation import DB_ARTIFACTS, data_generation
+from src.models.tools import QueryResult, SQLToolResult
 
 logger = logging.getLogger(__name__)
 
 
 class SQLTool:
-    """Text-to-SQL pipeline: generate SQL from questions, execute, mask PII."""
+    """Text-to-SQL pipeline: generate SQL from questions, execute, mask PII.
 
-    def __init__(self, llm_client: LLMClient, database: FraudDatabase) -> None:
+    The system prompt (schema, sample rows, column statistics, few-shot) is
+    built once per database generation and reused for every question.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        database: FraudDatabase,
+        async_llm_client: AsyncLLMClient | None = None,
+        generation_fn: Callable[[], str] = partial(data_generation, DB_ARTIFACTS),
+    ) -> None:
         self._llm = llm_client
+        self._allm = async_llm_client
         self._db = database
+        self._generation_fn = generation_fn
+        self._prompt_lock = threading.Lock()
+        self._prompt: tuple[str, str] | None = None  # (generation, system prompt)
 
     def run(self, question: str) -> SQLToolResult:
         """Execute the Text-to-SQL pipeline. Returns typed SQLToolResult."""
-        system_prompt = self._build_prompt()
-        sql = self._generate_sql(system_prompt, question)
+        with tracing.span("sql.prompt_build"):
+            system_prompt = self._system_prompt()
+        with tracing.span("sql.generate"):
+            sql = self._generate_sql(system_prompt, question)
         logger.info("Generated SQL:\n%s", sql)
 
-        result = self._db.execute_query(sql)
+        result = self._execute(sql)
 
         if not result.success and MAX_SQL_RETRIES > 0:
             logger.info("SQL failed, attempting self-correction...")
-            error_prompt = SQL_ERROR_CORRECTION_PROMPT.format(
-                error=result.error, failed_sql=sql,
-            )
-            sql = self._generate_sql(system_prompt, question, error_context=error_prompt)
-            logger.info("Corrected SQL:\n%s", sql)
+            with tracing.span("sql.self_correct"):
+                error_prompt = self._correction_prompt(sql, result)
+                with tracing.span("sql.generate"):
+                    sql = self._generate_sql(system_prompt, question, error_context=error_prompt)
+                logger.info("Corrected SQL:\n%s", sql)
+                result = self._execute(sql)
+
+        return self._to_tool_result(sql, result)
+
+    async def arun(
+        self,
+        question: str,
+        on_sql: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> SQLToolResult:
+        """Async Text-to-SQL pipeline; DuckDB work runs off the event loop.
+
+        ``on_sql`` is called with each generated (or corrected) query before it
+        runs. Under a ``deadline`` queries are interrupted when the budget runs
+        out and self-correction is skipped once it has.
+        """
+        with tracing.span("sql.prompt_build") as span:
+            system_prompt = self._cached_prompt()
+            span.set(cached=system_prompt is not None)
+            if system_prompt is None:
+                system_prompt = await asyncio.to_thread(self._system_prompt)
+        with tracing.span("sql.generate"):
+            sql = await self._agenerate_sql(system_prompt, question, deadline=deadline)
+        logger.info("Generated SQL:\n%s", sql)
+        if on_sql is not None:
+            on_sql(sql)
+
+        result = await self._aexecute(sql, deadline)
+
+        if not result.success and MAX_SQL_RETRIES > 0 and not (deadline and deadline.expired):
+            logger.info("SQL failed, attempting self-correction...")
+            with tracing.span("sql.self_correct"):
+                error_prompt = self._correction_prompt(sql, result)
+                with tracing.span("sql.generate"):
+                    sql = await self._agenerate_sql(
+                        system_prompt, question, error_context=error_prompt, deadline=deadline,
+                    )
+                logger.info("Corrected SQL:\n%s", sql)
+                if on_sql is not None:
+                    on_sql(sql)
+                result = await self._aexecute(sql, deadline)
+
+        return self._to_tool_result(sql, result)
+
+    def _execute(self, sql: str) -> QueryResult:
+        with tracing.span("sql.execute") as span:
             result = self._db.execute_query(sql)
+            span.set(success=result.success, rows=result.row_count, timed_out=result.timed_out)
+        return result
+
+    async def _aexecute(self, sql: str, deadline: Deadline | None) -> QueryResult:
+        """Run a query in a worker thread, interrupted at the remaining budget."""
+        timeout = deadline.timeout(QUERY_TIMEOUT_SECONDS) if deadline is not None else None
+        with tracing.span("sql.execute") as span:
+            result = await asyncio.to_thread(self._db.execute_query, sql, timeout)
+            span.set(success=result.success, rows=result.row_count, timed_out=result.timed_out)
+        return result
 
+    @staticmethod
+    def _correction_prompt(sql: str, result: QueryResult) -> str:
+        """Self-correction prompt for a failed query; timeouts ask for a cheaper query."""
+        error = result.error
+        if result.timed_out:
+            error = f"{error}\n{SQL_TIMEOUT_HINT}"
+        return SQL_ERROR_CORRECTION_PROMPT.format(error=error, failed_sql=sql)
+
+    def _to_tool_result(self, sql: str, result: QueryResult) -> SQLToolResult:
+        """Convert a raw QueryResult into a PII-masked SQLToolResult."""
         if result.success:
             masked = self._mask_pii(result.columns, result.rows)
             return SQLToolResult(
@@ -48,42 +142,79 @@ class SQLTool:
 
         return SQLToolResult(success=False, sql_query=sql, error=result.error)
 
+    def warm_up(self) -> None:
+        """Build the system prompt once, loading schema, samples and stats."""
+        self._system_prompt()
+
+    def _cached_prompt(self) -> str | None:
+        """The system prompt if it was built for the current database generation."""
+        cached = self._prompt
+        if cached is not None and cached[0] == self._generation_fn():
+            return cached[1]
+        return None
+
+    def _system_prompt(self) -> str:
+        """The system prompt, rebuilt only when the database generation changes."""
+        prompt = self._cached_prompt()
+        if prompt is not None:
+            return prompt
+        with self._prompt_lock:
+            generation = self._generation_fn()
+            if self._prompt is None or self._prompt[0] != generation:
+                self._prompt = (generation, self._build_prompt())
+                logger.info("Built SQL system prompt for database generation %s", generation)
+            return self._prompt[1]
+
     def _build_prompt(self) -> str:
         """Build the SQL system prompt with schema, sample rows, stats, and few-shot."""
         schema = self._db.get_schema()
         sample = self._db.get_sample_rows(n=3)
-        few_shot = format_sql_few_shot()
         stats = self._get_column_stats()
-        return SQL_SYSTEM_PROMPT.format(schema=schema, sample_rows=sample) + "\n" + stats + "\n" + few_shot
+
+        builder = PromptBuilder(SQL_PROMPT_TOKEN_BUDGET, name="SQL prompt")
+        builder.add("instructions", SQL_SYSTEM_PROMPT.format(schema=schema, sample_rows=""), required=True)
+        builder.add("column_stats", stats, priority=0)
+        builder.add_items(
+            "few_shot", format_sql_few_shot_examples(), priority=1, header=SQL_FEW_SHOT_HEADER,
+        )
+        builder.add("sample_rows", sample, priority=2)
+        logger.debug("SQL prompt sections: %s", builder.report())
+
+        return (
+            SQL_SYSTEM_PROMPT.format(schema=schema, sample_rows=builder.section("sample_rows"))
+            + "\n" + builder.section("column_stats")
+            + "\n" + builder.section("few_shot")
+        )
 
     def _get_column_stats(self) -> str:
-        """Fetch column statistics from the database for prompt context."""
+        """Format the database's column statistics catalog for prompt context."""
         try:
-            con = self._db.connection
+            stats = self._db.column_stats()
             lines = ["\n**Column statistics**:"]
 
-            date_range = con.execute(
-                "SELECT MIN(trans_date_trans_time)::DATE, MAX(trans_date_trans_time)::DATE FROM transactions"
-            ).fetchone()
-            lines.append(f"- Date range: {date_range[0]} to {date_range[1]}")
+            dates = stats["trans_date_trans_time"]
+            lines.append(f"- Date range: {dates['min_value'][:10]} to {dates['max_value'][:10]}")
 
-            total = con.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
-            frauds = con.execute("SELECT COUNT(*) FROM transactions WHERE is_fraud = 1").fetchone()[0]
+            fraud = stats["is_fraud"]
+            total = fraud["row_count"]
+            frauds = round(fraud["avg_value"] * (total - fraud["null_count"]))
             lines.append(f"- Total transactions: {total:,}")
             lines.append(f"- Fraudulent: {frauds:,} ({100.0 * frauds / total:.2f}%)")
 
-            cats = con.execute("SELECT DISTINCT category FROM transactions ORDER BY category").fetchall()
-            lines.append(f"- Categories ({len(cats)}): {', '.join(c[0] for c in cats)}")
+            cats = stats["category"]["distinct_values"] or []
+            lines.append(f"- Categories ({len(cats)}): {', '.join(cats)}")
 
-            amounts = con.execute(
-                "SELECT ROUND(MIN(amt),2), ROUND(MAX(amt),2), ROUND(AVG(amt),2) FROM transactions"
-            ).fetchone()
-            lines.append(f"- Amount range: ${amounts[0]} – ${amounts[1]} (avg: ${amounts[2]})")
+            amt = stats["amt"]
+            lines.append(
+                f"- Amount range: ${float(amt['min_value']):.2f} – ${float(amt['max_value']):.2f} "
+                f"(avg: ${amt['avg_value']:.2f})"
+            )
 
-            months = con.execute(
-                "SELECT MIN(transaction_month), MAX(transaction_month) FROM transactions"
-            ).fetchone()
-            lines.append(f"- transaction_month range: '{months[0]}' to '{months[1]}' (VARCHAR, YYYY-MM format)")
+            months = stats["transaction_month"]
+            lines.append(
+                f"- transaction_month range: '{months['min_value']}' to '{months['max_value']}' "
+                "(VARCHAR, YYYY-MM format)"
+            )
 
             return "\n".join(lines)
         except Exception as exc:
@@ -97,13 +228,47 @@ class SQLTool:
         error_context: str | None = None,
     ) -> str:
         """Call LLM to generate a SQL query."""
+        messages = self._sql_messages(system_prompt, question, error_context)
+        return self._strip_fences(
+            self._llm.chat(messages, operation="sql_generation", hedge=HEDGE_ENABLED),
+        )
+
+    async def _agenerate_sql(
+        self,
+        system_prompt: str,
+        question: str,
+        error_context: str | None = None,
+        deadline: Deadline | None = None,
+    ) -> str:
+        """Async variant of _generate_sql using the async LLM client when available."""
+        messages = self._sql_messages(system_prompt, question, error_context)
+        if self._allm is not None:
+            sql = await self._allm.chat(
+                messages, operation="sql_generation", hedge=HEDGE_ENABLED, deadline=deadline,
+            )
+        else:
+            if deadline is not None:
+                deadline.check("sql_generation")
+            sql = await asyncio.to_thread(
+                self._llm.chat, messages, operation="sql_generation", hedge=HEDGE_ENABLED,
+                timeout=deadline.timeout(OPENAI_TIMEOUT) if deadline is not None else None,
+            )
+        return self._strip_fences(sql)
+
+    @staticmethod
+    def _sql_messages(
+        system_prompt: str,
+        question: str,
+        error_context: str | None = None,
+    ) -> list[dict[str, str]]:
         user_content = error_context or question
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_content},
         ]
-        sql = self._llm.chat(messages)
 
+    @staticmethod
+    def _strip_fences(sql: str) -> str:
         if sql.startswith("```"):
             lines = [line for line in sql.split("\n") if not line.startswith("```")]
             sql = "\n".join(lines).strip()
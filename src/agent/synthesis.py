@@ -1,7 +1,12 @@
+import asyncio
 import logging
+from typing import Callable
 
-from src.core.llm_client import LLMClient
-from src.agent.prompts import SYNTHESIS_PROMPT
+from src.core import tracing
+from src.core.config import OPENAI_TIMEOUT
+from src.core.deadline import Deadline
+from src.core.llm_client import AsyncLLMClient, LLMClient
+from src.agent.prompts import SQL_ANSWER_PROMPT, SYNTHESIS_PROMPT
 from src.models.tools import SQLToolResult, RAGToolResult
 
 logger = logging.getLogger(__name__)
@@ -10,8 +15,13 @@ logger = logging.getLogger(__name__)
 class ResultSynthesizer:
     """Synthesize SQL and RAG results into a single unified answer."""
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        async_llm_client: AsyncLLMClient | None = None,
+    ) -> None:
         self._llm = llm_client
+        self._allm = async_llm_client
 
     def synthesize(
         self,
@@ -20,21 +30,98 @@ class ResultSynthesizer:
         rag: RAGToolResult,
     ) -> str:
         """Returns the synthesized answer, or empty string on failure."""
-        prompt = SYNTHESIS_PROMPT.format(
-            question=question,
-            sql_context=self._format_sql_context(sql),
-            rag_context=self._format_rag_context(rag),
-        )
+        prompt = self._build_prompt(question, sql, rag)
         try:
-            return self._llm.chat(
-                [{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=1000,
-            )
+            with tracing.span("synthesis"):
+                return self._llm.chat(
+                    [{"role": "user", "content": prompt}],
+                    temperature=0.3,
+                    max_tokens=1000,
+                    operation="synthesis",
+                )
+        except Exception as exc:
+            logger.error("Synthesis failed: %s", exc)
+            return ""
+
+    async def asynthesize(
+        self,
+        question: str,
+        sql: SQLToolResult,
+        rag: RAGToolResult,
+        on_delta: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> str:
+        """Async variant of synthesize. Returns empty string on failure.
+
+        ``on_delta`` receives the answer text as it streams; running past the
+        ``deadline`` counts as a failure.
+        """
+        messages = [{"role": "user", "content": self._build_prompt(question, sql, rag)}]
+        try:
+            return await self._achat(messages, 1000, "synthesis", on_delta, deadline)
         except Exception as exc:
             logger.error("Synthesis failed: %s", exc)
             return ""
 
+    async def aanswer_sql(
+        self,
+        question: str,
+        sql: SQLToolResult,
+        on_delta: Callable[[str], None] | None = None,
+        deadline: Deadline | None = None,
+    ) -> str:
+        """Write a prose answer from SQL results alone. Returns empty string on failure."""
+        prompt = SQL_ANSWER_PROMPT.format(
+            question=question, sql_context=self._format_sql_context(sql),
+        )
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            return await self._achat(messages, 600, "sql_answer", on_delta, deadline)
+        except Exception as exc:
+            logger.error("SQL answer failed: %s", exc)
+            return ""
+
+    async def _achat(
+        self,
+        messages: list[dict[str, str]],
+        max_tokens: int,
+        operation: str,
+        on_delta: Callable[[str], None] | None,
+        deadline: Deadline | None,
+    ) -> str:
+        """One chat call at temperature 0.3, streamed when a delta callback is given."""
+        with tracing.span(operation, streamed=on_delta is not None):
+            if self._allm is not None and on_delta is not None:
+                parts = []
+                async for delta in self._allm.chat_stream(
+                    messages, temperature=0.3, max_tokens=max_tokens, operation=operation, deadline=deadline,
+                ):
+                    parts.append(delta)
+                    on_delta(delta)
+                return "".join(parts).strip()
+            if self._allm is not None:
+                return await self._allm.chat(
+                    messages, temperature=0.3, max_tokens=max_tokens, operation=operation, deadline=deadline,
+                )
+            if deadline is not None:
+                deadline.check(operation)
+            return await asyncio.to_thread(
+                self._llm.chat, messages, temperature=0.3, max_tokens=max_tokens, operation=operation,
+                timeout=deadline.timeout(OPENAI_TIMEOUT) if deadline is not None else None,
+            )
+
+    def _build_prompt(
+        self,
+        question: str,
+        sql: SQLToolResult,
+        rag: RAGToolResult,
+    ) -> str:
+        return SYNTHESIS_PROMPT.format(
+            question=question,
+            sql_context=self._format_sql_context(sql),
+            rag_context=self._format_rag_context(rag),
+        )
+
     @staticmethod
     def _format_sql_context(sql: SQLToolResult) -> str:
         """Format SQL results as context for the synthesis prompt."""
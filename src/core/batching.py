@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.core.config import EMBEDDING_BATCH_WINDOW_MS, EMBEDDING_BATCH_MAX_SIZE
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str], str], list[Any]]
+
+
+def _resolve(fut: Future, result: Any = None, error: BaseException | None = None) -> None:
+    """Settle ``fut`` unless it is already done (e.g. cancelled by its caller)."""
+    try:
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+class EmbeddingBatcher:
+    """Collect embedding requests from concurrent callers into batched calls.
+
+    Requests are gathered for up to ``window_ms`` (or until ``max_batch``
+    texts are pending) and sent as one ``embeddings.create`` call per model;
+    each caller receives only its own vectors.
+    """
+
+    def __init__(
+        self,
+        fetch: EmbedFn,
+        window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+        max_batch: int = EMBEDDING_BATCH_MAX_SIZE,
+        max_concurrent_batches: int = 4,
+    ) -> None:
+        self._fetch = fetch
+        self._window = window_ms / 1000.0
+        self._max_batch = max_batch
+        self._queue: queue.Queue[tuple[str, str, Future]] = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_batches, thread_name_prefix="embedding-batch",
+        )
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._collect, name="embedding-batcher", daemon=True,
+                )
+                self._thread.start()
+
+    def submit(self, text: str, model: str) -> Future:
+        """Queue one text for embedding. Returns a Future of its vector."""
+        self._ensure_started()
+        fut: Future = Future()
+        self._queue.put((text, model, fut))
+        return fut
+
+    def embed(self, texts: list[str], model: str) -> list[Any]:
+        """Blocking helper: embed texts through the shared batches."""
+        futures = [self.submit(t, model) for t in texts]
+        return [f.result() for f in futures]
+
+    async def aembed(self, texts: list[str], model: str) -> list[Any]:
+        """Async helper: await vectors without blocking the event loop."""
+        futures = [self.submit(t, model) for t in texts]
+        return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in futures)))
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            by_model: dict[str, list[tuple[str, Future]]] = {}
+            for text, model, fut in batch:
+                by_model.setdefault(model, []).append((text, fut))
+            for model, items in by_model.items():
+                self._executor.submit(self._dispatch, model, items)
+
+    def _dispatch(self, model: str, items: list[tuple[str, Future]]) -> None:
+        unique = list(dict.fromkeys(text for text, _ in items))
+        with self._stats_lock:
+            self.requests += len(items)
+            self.batches += 1
+        try:
+            fetched = list(self._fetch(unique, model))
+            if len(fetched) != len(unique):
+                raise ValueError(f"Embedding batch returned {len(fetched)} vectors for {len(unique)} texts")
+            vectors = dict(zip(unique, fetched))
+            logger.debug("Embedded batch of %d texts for %d requests", len(unique), len(items))
+            for text, fut in items:
+                _resolve(fut, result=vectors[text])
+        except BaseException as exc:
+            # Every caller must hear back, whatever went wrong.
+            for _, fut in items:
+                _resolve(fut, error=exc)
+            if not isinstance(exc, Exception):
+                raise
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            }
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.core.config import LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+CACHE_PATH = DATA_DIR / "processed" / "llm_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def chat_cache_key(
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """Content-addressed key for a chat completion request."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LLM response cache with TTL and size-based LRU eviction."""
+
+    def __init__(
+        self,
+        path: Path | str = CACHE_PATH,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+    ) -> None:
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute(_SCHEMA)
+        self._con.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses(accessed)")
+        self._con.commit()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value, or None on miss or expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._con.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created = row
+            if self._ttl and now - created > self._ttl:
+                self._con.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._con.commit()
+                self.misses += 1
+                return None
+            self._con.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._con.commit()
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store a value and evict least-recently-used entries over the size cap."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+            self._con.commit()
+
+    def _evict(self) -> None:
+        total = self._con.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        rows = self._con.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        for key, size in rows:
+            if total <= self._max_bytes:
+                break
+            self._con.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._con.execute("DELETE FROM responses")
+            self._con.commit()
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters plus current entry count and stored bytes."""
+        with self._lock:
+            entries, size = self._con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses",
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
@@ -0,0 +1,215 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.core.config import LLM_CASSETTE_MODE, LLM_CASSETTE_PATH, LLM_CASSETTE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+CASSETTE_PATH = DATA_DIR / "processed" / "llm_cassette.jsonl.gz"
+
+_MODES = ("record", "replay")
+
+
+class CassetteMissError(httpx.TransportError):
+    """Raised on replay when a request was never recorded."""
+
+
+def request_key(request: httpx.Request) -> str:
+    """Stable key for an API request: method, path and canonical JSON body.
+
+    The host is left out so a cassette recorded against one base URL
+    replays against any other.
+    """
+    body = request.content
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        pass
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.url.path}\0".encode("utf-8"))
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class Cassette:
+    """Recorded OpenAI HTTP exchanges, stored as gzipped JSON lines.
+
+    Each line holds the request key, response status, content type, body
+    and the original wall-clock latency. Identical requests are replayed
+    in recording order, repeating the last one once exhausted.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = CASSETTE_PATH,
+        mode: str = "replay",
+        latency: str = "original",
+    ) -> None:
+        if mode not in _MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self._path = Path(path)
+        self.mode = mode
+        self._zero_latency = latency == "zero"
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self._path}")
+        with gzip.open(self._path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+        logger.info(
+            "Loaded cassette %s: %d exchanges",
+            self._path, sum(len(v) for v in self._entries.values()),
+        )
+
+    def record(self, key: str, response: httpx.Response, body: bytes, elapsed: float) -> None:
+        entry = {
+            "key": key,
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": body.decode("utf-8"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Each append is its own gzip member; gzip readers concatenate them.
+            with gzip.open(self._path, "at", encoding="utf-8") as f:
+                f.write(line)
+            self.recorded += 1
+
+    def lookup(self, request: httpx.Request) -> dict[str, Any]:
+        key = request_key(request)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.misses += 1
+                raise CassetteMissError(
+                    f"No recorded response for {request.method} {request.url.path} ({key[:12]})",
+                    request=request,
+                )
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.replayed += 1
+            return entries[min(index, len(entries) - 1)]
+
+    def delay(self, entry: dict[str, Any]) -> float:
+        return 0.0 if self._zero_latency else entry["elapsed"]
+
+    @staticmethod
+    def build_response(entry: dict[str, Any], request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            entry["status"],
+            headers={"content-type": entry["content_type"]},
+            content=entry["body"].encode("utf-8"),
+            request=request,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """Sync httpx transport that records to or replays from a cassette."""
+
+    def __init__(self, cassette: Cassette, transport: httpx.BaseTransport | None = None) -> None:
+        self._cassette = cassette
+        self._transport = transport or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._cassette.mode == "replay":
+            entry = self._cassette.lookup(request)
+            time.sleep(self._cassette.delay(entry))
+            return Cassette.build_response(entry, request)
+
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        try:
+            body = response.read()
+        finally:
+            response.close()
+        self._cassette.record(request_key(request), response, body, time.perf_counter() - start)
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": response.headers.get("content-type", "application/json")},
+            content=body,
+            request=request,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """Async httpx transport that records to or replays from a cassette."""
+
+    def __init__(self, cassette: Cassette, transport: httpx.AsyncBaseTransport | None = None) -> None:
+        self._cassette = cassette
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._cassette.mode == "replay":
+            entry = self._cassette.lookup(request)
+            await asyncio.sleep(self._cassette.delay(entry))
+            return Cassette.build_response(entry, request)
+
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        elapsed = time.perf_counter() - start
+        await asyncio.to_thread(self._cassette.record, request_key(request), response, body, elapsed)
+        return httpx.Response(
+            response.status_code,
+            headers={"content-type": response.headers.get("content-type", "application/json")},
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_default_cassette: Cassette | None = None
+_default_lock = threading.Lock()
+
+
+def get_cassette() -> Cassette | None:
+    """Process-wide cassette from LLM_CASSETTE_MODE, or None when disabled."""
+    global _default_cassette
+    if LLM_CASSETTE_MODE not in _MODES:
+        return None
+    with _default_lock:
+        if _default_cassette is None:
+            _default_cassette = Cassette(
+                LLM_CASSETTE_PATH or CASSETTE_PATH, LLM_CASSETTE_MODE, LLM_CASSETTE_LATENCY,
+            )
+        return _default_cassette
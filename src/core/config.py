@@ -2,13 +2,91 @@ import os
 
 MODEL: str = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
 EMBEDDING_MODEL: str = "text-embedding-3-small"
+EMBEDDING_DIM: int = 1536
 
 OPENAI_TIMEOUT: int = 30
 MAX_API_RETRIES: int = 2
+OPENAI_MAX_CONNECTIONS: int = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.environ.get("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY: float = float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "30"))
+OPENAI_RPM_LIMIT: int = int(os.environ.get("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT: int = int(os.environ.get("OPENAI_TPM_LIMIT", "200000"))
+RATE_LIMIT_BACKGROUND_RESERVE: float = float(os.environ.get("RATE_LIMIT_BACKGROUND_RESERVE", "0.2"))
+
+CIRCUIT_FAILURE_THRESHOLD: int = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS: float = float(os.environ.get("CIRCUIT_RESET_SECONDS", "30"))
+HEDGE_ENABLED: bool = os.environ.get("HEDGE_ENABLED", "1") == "1"
+HEDGE_QUANTILE: float = float(os.environ.get("HEDGE_QUANTILE", "0.95"))
+HEDGE_MIN_SAMPLES: int = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_SECONDS: float = float(os.environ.get("HEDGE_MIN_DELAY_SECONDS", "0.5"))
+
+LLM_CACHE_ENABLED: bool = os.environ.get("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_MAX_BYTES: int = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS: float = float(os.environ.get("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_TEMPERATURE: float = float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", "0.0"))
+
+EMBEDDING_CACHE_ENABLED: bool = os.environ.get("EMBEDDING_CACHE_ENABLED", "1") == "1"
+EMBEDDING_CACHE_MEMORY_SIZE: int = int(os.environ.get("EMBEDDING_CACHE_MEMORY_SIZE", "4096"))
+
+SQL_RESULT_CACHE_ENABLED: bool = os.environ.get("SQL_RESULT_CACHE_ENABLED", "1") == "1"
+SQL_RESULT_CACHE_MEMORY_SIZE: int = int(os.environ.get("SQL_RESULT_CACHE_MEMORY_SIZE", "256"))
+SQL_RESULT_CACHE_DISK_ENABLED: bool = os.environ.get("SQL_RESULT_CACHE_DISK_ENABLED", "1") == "1"
+SQL_RESULT_CACHE_MAX_BYTES: int = int(os.environ.get("SQL_RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Answer compatible aggregate SQL from the rollup tables built at ingest.
+ROLLUP_ROUTING_ENABLED: bool = os.environ.get("ROLLUP_ROUTING_ENABLED", "1") == "1"
+
+EMBEDDING_BATCHING_ENABLED: bool = os.environ.get("EMBEDDING_BATCHING_ENABLED", "1") == "1"
+EMBEDDING_BATCH_WINDOW_MS: float = float(os.environ.get("EMBEDDING_BATCH_WINDOW_MS", "10"))
+EMBEDDING_BATCH_MAX_SIZE: int = int(os.environ.get("EMBEDDING_BATCH_MAX_SIZE", "64"))
+
+SQL_PROMPT_TOKEN_BUDGET: int = int(os.environ.get("SQL_PROMPT_TOKEN_BUDGET", "3000"))
+RAG_CONTEXT_TOKEN_BUDGET: int = int(os.environ.get("RAG_CONTEXT_TOKEN_BUDGET", "2500"))
+ROUTER_SQL_OUTPUT_TOKEN_BUDGET: int = int(os.environ.get("ROUTER_SQL_OUTPUT_TOKEN_BUDGET", "1500"))
+
+PARALLEL_TOOLS_ENABLED: bool = os.environ.get("PARALLEL_TOOLS_ENABLED", "1") == "1"
+PARALLEL_TOOLS_TIMEOUT_SECONDS: float = float(os.environ.get("PARALLEL_TOOLS_TIMEOUT_SECONDS", "30"))
+SPECULATIVE_RAG_ENABLED: bool = os.environ.get("SPECULATIVE_RAG_ENABLED", "1") == "1"
+
+ANSWER_CACHE_ENABLED: bool = os.environ.get("ANSWER_CACHE_ENABLED", "1") == "1"
+ANSWER_CACHE_SIMILARITY: float = float(os.environ.get("ANSWER_CACHE_SIMILARITY", "0.95"))
+ANSWER_CACHE_MAX_ENTRIES: int = int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "2000"))
+
+BATCH_CONCURRENCY: int = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+
+# Set to 0 to measure cold-start time to first token without warm-up.
+SERVICE_WARM_UP: bool = os.environ.get("SERVICE_WARM_UP", "1") == "1"
+
+INTENT_FAST_PATH_ENABLED: bool = os.environ.get("INTENT_FAST_PATH_ENABLED", "1") == "1"
+INTENT_CONFIDENCE_THRESHOLD: float = float(os.environ.get("INTENT_CONFIDENCE_THRESHOLD", "0.9"))
+INTENT_LOG_PATH: str = os.environ.get("INTENT_LOG_PATH", "")
+
+# "off", "record" or "replay"; latency is "original" or "zero" on replay.
+LLM_CASSETTE_MODE: str = os.environ.get("LLM_CASSETTE_MODE", "off")
+LLM_CASSETTE_PATH: str = os.environ.get("LLM_CASSETTE_PATH", "")
+LLM_CASSETTE_LATENCY: str = os.environ.get("LLM_CASSETTE_LATENCY", "original")
+
+# Overall time budget per question across every stage; 0 disables it.
+QUESTION_DEADLINE_SECONDS: float = float(os.environ.get("QUESTION_DEADLINE_SECONDS", "60"))
+# Extra time the router agent turn gets past the budget so deadline-aware stages fail first.
+DEADLINE_GRACE_SECONDS: float = float(os.environ.get("DEADLINE_GRACE_SECONDS", "1"))
+
+# Per-request stage spans, exported as JSONL (default data/processed/traces.jsonl).
+TRACING_ENABLED: bool = os.environ.get("TRACING_ENABLED", "1") == "1"
+TRACE_PATH: str = os.environ.get("TRACE_PATH", "")
+TRACE_SUMMARY_WINDOW: int = int(os.environ.get("TRACE_SUMMARY_WINDOW", "1000"))
+# The trace file is rotated to <path>.1 past this size, so at most twice this is kept (0 = unbounded).
+TRACE_MAX_BYTES: int = int(os.environ.get("TRACE_MAX_BYTES", str(50 * 1024 * 1024)))
 
 MAX_SQL_RETRIES: int = 1
 MAX_QUERY_ROWS: int = 1000
-QUERY_TIMEOUT_SECONDS: int = 10
+# Generated SQL is interrupted after this long (0 disables the watchdog).
+QUERY_TIMEOUT_SECONDS: float = float(os.environ.get("QUERY_TIMEOUT_SECONDS", "10"))
+# DuckDB worker threads (0 = one per core) and memory limit (e.g. "4GB"; empty = DuckDB default).
+DUCKDB_THREADS: int = int(os.environ.get("DUCKDB_THREADS", "0"))
+DUCKDB_MEMORY_LIMIT: str = os.environ.get("DUCKDB_MEMORY_LIMIT", "")
+# Queries run on cursors leased from a pool of this size; further queries wait for a free one.
+DUCKDB_CURSOR_POOL_SIZE: int = int(os.environ.get("DUCKDB_CURSOR_POOL_SIZE", "8"))
 PII_COLUMNS: set[str] = {"cc_num", "first", "last", "street"}
 
 DEDUP_SIMILARITY_THRESHOLD: float = 0.95
@@ -0,0 +1,60 @@
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage starts or runs past the question's time budget."""
+
+
+class Deadline:
+    """Absolute time budget for one question, shared by every stage that serves it.
+
+    Stages ask for ``timeout(default)`` to shrink their own per-call timeout
+    to what is left, call ``check`` before starting new work, and wrap
+    awaits in ``wait_for`` so in-flight calls are cancelled when time runs
+    out. ``seconds=None`` (or 0) means unbounded.
+    """
+
+    def __init__(
+        self,
+        seconds: float | None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self.budget = seconds if seconds else None
+        self._expires_at = clock() + seconds if seconds else math.inf
+
+    def remaining(self) -> float:
+        """Seconds left (never negative); ``inf`` when unbounded."""
+        return max(0.0, self._expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def timeout(self, default: float) -> float:
+        """``default`` shrunk to the remaining budget (at least a millisecond)."""
+        return max(0.001, min(default, self.remaining()))
+
+    def check(self, stage: str) -> None:
+        """Raise DeadlineExceeded if no budget is left for ``stage``."""
+        if self.expired:
+            raise DeadlineExceeded(f"{stage} skipped: the {self.budget:.0f}s time budget is used up")
+
+    async def wait_for(self, aw: Awaitable[T], stage: str, grace: float = 0.0) -> T:
+        """Await ``aw``, cancelling it once the budget (plus ``grace``) runs out."""
+        remaining = self.remaining()
+        if math.isinf(remaining):
+            return await aw
+        try:
+            return await asyncio.wait_for(aw, remaining + grace)
+        except DeadlineExceeded:
+            raise
+        except asyncio.TimeoutError as exc:
+            raise DeadlineExceeded(
+                f"{stage} cancelled: the {self.budget:.0f}s time budget ran out",
+            ) from exc
@@ -0,0 +1,216 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, so the disk tier is single-process there.
+    fcntl = None
+
+from src.core.config import (
+    EMBEDDING_DIM, EMBEDDING_CACHE_ENABLED, EMBEDDING_CACHE_MEMORY_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+EMBEDDING_CACHE_DIR = DATA_DIR / "processed" / "embedding_cache"
+
+_INITIAL_CAPACITY = 1024
+
+
+def embedding_key(text: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-memory LRU over a memory-mapped float32 store.
+
+    The disk tier is a row-major ``vectors.f32`` matrix plus an append-only
+    ``keys.txt`` whose line number is the row of each key's vector. Several
+    processes (the app's workers, ``scripts/ingest.py``) may share it: an
+    exclusive lock on ``cache.lock`` covers taking the next row from the line
+    count, writing the vector and appending its key, and keys appended by
+    other processes are picked up on a miss.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = EMBEDDING_CACHE_DIR,
+        dim: int = EMBEDDING_DIM,
+        memory_size: int = EMBEDDING_CACHE_MEMORY_SIZE,
+    ) -> None:
+        self._dir = Path(directory)
+        self._dim = dim
+        self._memory_size = memory_size
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._vectors_path = self._dir / "vectors.f32"
+        self._keys_path = self._dir / "keys.txt"
+        self._rows: dict[str, int] = {}
+        # Lines (rows) and bytes of keys.txt indexed so far.
+        self._next_row = 0
+        self._keys_offset = 0
+        self._mmap: np.memmap | None = None
+        self._capacity = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._open()
+
+    def _open(self) -> None:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self._dir / "cache.lock", "a+b")
+        with self._file_lock(exclusive=True):
+            self._read_new_keys()
+            self._ensure_capacity(max(self._next_row, _INITIAL_CAPACITY))
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        """Cross-process lock on the disk tier (a no-op without fcntl)."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _keys_size(self) -> int:
+        return self._keys_path.stat().st_size if self._keys_path.exists() else 0
+
+    def _read_new_keys(self) -> None:
+        """Index the complete key lines appended since the last read, by any process."""
+        if self._keys_size() <= self._keys_offset:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            key = line.strip()
+            if key:
+                self._rows.setdefault(key, self._next_row)
+            self._next_row += 1
+        self._keys_offset += end
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Map at least ``rows`` rows, growing (never shrinking) the shared file.
+
+        Growing the file requires the exclusive file lock.
+        """
+        if self._mmap is not None and rows <= self._capacity:
+            return
+        row_bytes = self._dim * 4
+        on_disk = self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        capacity = max(on_disk, self._capacity, _INITIAL_CAPACITY)
+        while capacity < rows:
+            capacity *= 2
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap = None
+        if capacity > on_disk:
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        self._mmap = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self._dim),
+        )
+        self._capacity = capacity
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, model: str) -> np.ndarray | None:
+        """Return the cached embedding for ``text``, or None on miss."""
+        key = embedding_key(text, model)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+            row = self._rows.get(key)
+            if row is None and self._keys_size() > self._keys_offset:
+                with self._file_lock(exclusive=False):
+                    self._read_new_keys()
+                    row = self._rows.get(key)
+                    if row is not None:
+                        self._ensure_capacity(row + 1)
+            if row is None:
+                self.misses += 1
+                return None
+            vector = np.array(self._mmap[row], dtype=np.float32)
+            self._remember(key, vector)
+            self.disk_hits += 1
+            return vector
+
+    def put(self, text: str, model: str, vector: Any) -> np.ndarray:
+        """Store an embedding in both tiers. Returns it as a float32 array."""
+        key = embedding_key(text, model)
+        arr = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(key, arr)
+            if key in self._rows or arr.shape != (self._dim,):
+                return arr
+            with self._file_lock(exclusive=True):
+                self._read_new_keys()
+                if key in self._rows:
+                    return arr
+                if self._keys_size() > self._keys_offset:
+                    # A key line cut short by a crashed writer; drop it before appending.
+                    with open(self._keys_path, "r+b") as f:
+                        f.truncate(self._keys_offset)
+                row = self._next_row
+                self._ensure_capacity(row + 1)
+                # Vector before key: a key line always points at a written vector.
+                self._mmap[row] = arr
+                self._mmap.flush()
+                line = (key + "\n").encode("utf-8")
+                with open(self._keys_path, "ab") as f:
+                    f.write(line)
+                self._rows[key] = row
+                self._next_row += 1
+                self._keys_offset += len(line)
+        return arr
+
+    def lookup(self, texts: list[str], model: str) -> tuple[list[np.ndarray | None], list[int]]:
+        """Return cached vectors (None for misses) and the indices that missed."""
+        vectors = [self.get(t, model) for t in texts]
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        return vectors, missing
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._rows),
+        }
+
+
+_default_cache: EmbeddingCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Process-wide embedding cache shared by retrieval, scoring and ingestion."""
+    global _default_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = EmbeddingCache()
+        return _default_cache
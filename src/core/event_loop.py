@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Coroutine, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class BackgroundLoop:
+    """One asyncio event loop running on a daemon thread for the whole process.
+
+    Streamlit script runs are synchronous; they hand coroutines to this loop
+    instead of calling ``asyncio.run`` per question, so loop-bound state
+    (httpx connection pools, single-flight futures, rate-limiter waits)
+    persists between questions.
+    """
+
+    def __init__(self, name: str = "fraud-event-loop") -> None:
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name=name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _serve(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._ready.set)
+        self._loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule a coroutine on the loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run a coroutine on the loop and block the calling thread for its result."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, agen: AsyncIterator[T]) -> Iterator[T]:
+        """Consume an async generator from a sync thread, item by item.
+
+        Items cross threads through a queue as soon as they are produced;
+        closing the returned iterator early cancels the producer.
+        """
+        items: "queue.Queue[Any]" = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in agen:
+                    items.put(item)
+            except BaseException as exc:
+                items.put(exc)
+                raise
+            finally:
+                items.put(_DONE)
+
+        future = self.submit(pump())
+        try:
+            while True:
+                item = items.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            if not future.done():
+                future.cancel()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_default_loop: BackgroundLoop | None = None
+_default_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Process-wide background loop, started on first use."""
+    global _default_loop
+    with _default_lock:
+        if _default_loop is None:
+            _default_loop = BackgroundLoop()
+        return _default_loop
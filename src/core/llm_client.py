@@ -1,42 +1,185 @@
+import asyncio
+import hashlib
 import logging
+import threading
 import time
-from typing import Any
+import weakref
+from contextlib import nullcontext
+from typing import Any, AsyncIterator
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI, RateLimitError
 
-from src.core.config import MODEL, EMBEDDING_MODEL, OPENAI_TIMEOUT, MAX_API_RETRIES
+from src.core.batching import EmbeddingBatcher
+from src.core.cache import ResponseCache, chat_cache_key
+from src.core.cassette import AsyncCassetteTransport, CassetteTransport, get_cassette
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core import tracing
+from src.core.embedding_cache import EmbeddingCache
+from src.core.rate_limit import Priority, RateLimiter
+from src.core.resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyRecorder, ahedged_call, hedged_call,
+)
+from src.core.singleflight import SingleFlight
+from src.core.tokens import count_message_tokens, count_tokens
+from src.core.config import (
+    MODEL, EMBEDDING_MODEL, OPENAI_TIMEOUT, MAX_API_RETRIES,
+    OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS, OPENAI_KEEPALIVE_EXPIRY,
+    LLM_CACHE_MAX_TEMPERATURE,
+)
 
 logger = logging.getLogger(__name__)
 
+# httpx connection pools are bound to the event loop that opened them, so the
+# shared AsyncOpenAI client is kept per loop rather than as a bare singleton.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+
+
+def shared_async_openai() -> AsyncOpenAI:
+    """Return the process-wide pooled AsyncOpenAI client for the running loop."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(limits=_pool_limits())
+            cassette = get_cassette()
+            if cassette is not None:
+                transport = AsyncCassetteTransport(cassette, transport)
+            client = AsyncOpenAI(http_client=DefaultAsyncHttpxClient(transport=transport))
+            _async_clients[loop] = client
+        return client
+
+
+def create_openai_client() -> OpenAI:
+    """Sync OpenAI client on a tuned pool, recording or replaying when a cassette is set."""
+    transport: httpx.BaseTransport = httpx.HTTPTransport(limits=_pool_limits())
+    cassette = get_cassette()
+    if cassette is not None:
+        transport = CassetteTransport(cassette, transport)
+    return OpenAI(http_client=DefaultHttpxClient(transport=transport))
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _cache_key(
+    cache: ResponseCache | None,
+    model: str,
+    messages: list[dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+) -> str | None:
+    """Cache key for deterministic chat calls, or None when caching does not apply."""
+    if cache is None or temperature > LLM_CACHE_MAX_TEMPERATURE:
+        return None
+    return chat_cache_key(model, messages, temperature, max_tokens)
+
+
+def _trace_usage(response: Any) -> None:
+    """Attribute a response's token usage to the current tracing span."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        tracing.add_tokens(usage.prompt_tokens or 0, getattr(usage, "completion_tokens", 0) or 0)
+
+
+def _lookup_embeddings(
+    cache: EmbeddingCache | None,
+    texts: list[str],
+    model: str,
+) -> tuple[list[Any], list[int]]:
+    if cache is None:
+        return [None] * len(texts), list(range(len(texts)))
+    return cache.lookup(texts, model)
+
+
+def _embed_flight_key(model: str, texts: list[str], priority: Priority) -> str:
+    # Priority is part of the key so interactive callers never wait on a background leader.
+    digest = hashlib.sha256("\0".join([model, *texts]).encode("utf-8")).hexdigest()
+    return f"embed:{priority.name.lower()}:{digest}"
+
+
+def _merge_embeddings(
+    cache: EmbeddingCache | None,
+    texts: list[str],
+    model: str,
+    vectors: list[Any],
+    missing: list[int],
+    fetched: list[Any],
+) -> list[Any]:
+    """Fill cache misses with freshly fetched vectors, storing them as they land."""
+    for i, vector in zip(missing, fetched):
+        vectors[i] = cache.put(texts[i], model, vector) if cache is not None else vector
+    return vectors
+
 
 class LLMClient:
     """Wrapper around OpenAI providing retried chat and embedding calls."""
 
-    def __init__(self, client: OpenAI) -> None:
+    def __init__(
+        self,
+        client: OpenAI,
+        cache: ResponseCache | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+        single_flight: SingleFlight | None = None,
+        batcher: EmbeddingBatcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        latency: LatencyRecorder | None = None,
+    ) -> None:
         self._client = client
+        self._cache = cache
+        self._embedding_cache = embedding_cache
+        self._flight = single_flight
+        self._batcher = batcher
+        self._limiter = rate_limiter
+        self._breaker = circuit_breaker
+        self._latency = latency
 
-    def _retry(self, operation: str, fn, *args, **kwargs) -> Any:
-        """Execute a callable with exponential-backoff retry."""
+    def _retry(self, operation: str, fn, *, hedge: bool = False) -> Any:
+        """Execute a callable with circuit breaking, optional hedging and backoff retry."""
         last_error: Exception | None = None
         for attempt in range(MAX_API_RETRIES + 1):
+            guard = self._breaker.guard() if self._breaker is not None else nullcontext()
+            delay = self._latency.hedge_delay(operation) if hedge and self._latency else None
+            start = time.monotonic()
             try:
-                return fn(*args, **kwargs)
+                with guard:
+                    result = hedged_call(fn, delay) if delay is not None else fn()
+            except CircuitOpenError:
+                raise
             except Exception as exc:
                 last_error = exc
                 if attempt < MAX_API_RETRIES:
                     wait = 2 ** attempt
                     logger.warning(
-                        "%s failed (attempt %d), retrying in %ds: %s",
+                        "OpenAI %s failed (attempt %d), retrying in %ds: %s",
                         operation, attempt + 1, wait, exc,
                     )
+                    if self._limiter is not None and isinstance(exc, RateLimitError):
+                        self._limiter.pause(wait)
                     time.sleep(wait)
                 else:
                     logger.error(
-                        "%s failed after %d attempts: %s",
+                        "OpenAI %s failed after %d attempts: %s",
                         operation, MAX_API_RETRIES + 1, exc,
                     )
+            else:
+                self._record_success(operation, time.monotonic() - start)
+                return result
         raise last_error  # type: ignore[misc]
 
+    def _record_success(self, operation: str, elapsed: float) -> None:
+        if self._latency is not None:
+            self._latency.record(operation, elapsed)
+
     def chat(
         self,
         messages: list[dict[str, str]],
@@ -45,12 +188,26 @@ class LLMClient:
         max_tokens: int = 500,
         model: str | None = None,
         timeout: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        operation: str = "chat",
+        hedge: bool = False,
     ) -> str:
-        """Call OpenAI chat completion with retry. Returns stripped response text."""
+        """Call OpenAI chat completion with retry. Returns stripped response text.
+
+        ``operation`` labels the latency histogram; ``hedge`` races a duplicate
+        request once the call outlives that operation's p95 latency.
+        """
         _model = model or MODEL
         _timeout = timeout or OPENAI_TIMEOUT
+        key = _cache_key(self._cache, _model, messages, temperature, max_tokens)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
 
         def _call():
+            if self._limiter is not None:
+                self._limiter.acquire(count_message_tokens(messages, _model) + max_tokens, priority)
             response = self._client.chat.completions.create(
                 model=_model,
                 messages=messages,
@@ -58,20 +215,302 @@ class LLMClient:
                 max_tokens=max_tokens,
                 timeout=_timeout,
             )
+            _trace_usage(response)
             return response.choices[0].message.content.strip()
 
-        return self._retry("OpenAI chat", _call)
+        def _fetch():
+            content = self._retry(operation, _call, hedge=hedge)
+            if key is not None:
+                self._cache.put(key, content)
+            return content
 
-    def embed(self, texts: list[str], model: str | None = None) -> list[Any]:
+        if self._flight is None:
+            return _fetch()
+        flight_key = key or chat_cache_key(_model, messages, temperature, max_tokens)
+        return self._flight.do(f"chat:{flight_key}", _fetch)
+
+    def embed(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> list[Any]:
         """Embed texts via OpenAI with retry. Returns list of embedding vectors."""
         _model = model or EMBEDDING_MODEL
+        vectors, missing = _lookup_embeddings(self._embedding_cache, texts, _model)
+        if not missing:
+            return vectors
+        pending = [texts[i] for i in missing]
 
         def _call():
+            if self._limiter is not None:
+                self._limiter.acquire(sum(count_tokens(t, _model) for t in pending), priority)
             response = self._client.embeddings.create(
                 model=_model,
-                input=texts,
+                input=pending,
                 timeout=OPENAI_TIMEOUT,
             )
+            _trace_usage(response)
             return [item.embedding for item in response.data]
 
-        return self._retry("OpenAI embeddings", _call)
+        def _fetch():
+            # The batcher's fetch function owns retries for batched calls. Batches are
+            # admitted as interactive, so background embeds go direct at their own priority.
+            if self._batcher is not None and priority == Priority.INTERACTIVE:
+                return self._batcher.embed(pending, _model)
+            return self._retry("embeddings", _call)
+
+        if self._flight is None:
+            fetched = _fetch()
+        else:
+            fetched = self._flight.do(_embed_flight_key(_model, pending, priority), _fetch)
+        return _merge_embeddings(self._embedding_cache, texts, _model, vectors, missing, fetched)
+
+
+class AsyncLLMClient:
+    """Async twin of LLMClient backed by the shared pooled AsyncOpenAI transport.
+
+    When no client is given, each call resolves the pooled client for the
+    running event loop, so one instance can be shared across sessions.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI | None = None,
+        cache: ResponseCache | None = None,
+        embedding_cache: EmbeddingCache | None = None,
+        single_flight: SingleFlight | None = None,
+        batcher: EmbeddingBatcher | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        latency: LatencyRecorder | None = None,
+    ) -> None:
+        self._client = client
+        self._cache = cache
+        self._embedding_cache = embedding_cache
+        self._flight = single_flight
+        self._batcher = batcher
+        self._limiter = rate_limiter
+        self._breaker = circuit_breaker
+        self._latency = latency
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        return self._client or shared_async_openai()
+
+    async def admit(
+        self,
+        tokens: int,
+        priority: Priority = Priority.INTERACTIVE,
+        requests: int = 1,
+    ) -> None:
+        """Reserve rate-limit capacity for calls made outside this client."""
+        if self._limiter is not None:
+            await self._limiter.aacquire(tokens, priority, requests)
+
+    async def _retry(
+        self,
+        operation: str,
+        fn,
+        *,
+        hedge: bool = False,
+        deadline: Deadline | None = None,
+    ) -> Any:
+        """Await a coroutine function with circuit breaking, hedging and non-blocking backoff.
+
+        With a ``deadline``, each attempt is cancelled when the budget runs
+        out and no retry starts (or backs off) past it.
+        """
+        last_error: Exception | None = None
+        for attempt in range(MAX_API_RETRIES + 1):
+            if deadline is not None:
+                deadline.check(f"OpenAI {operation}")
+            guard = self._breaker.guard() if self._breaker is not None else nullcontext()
+            delay = self._latency.hedge_delay(operation) if hedge and self._latency else None
+            start = time.monotonic()
+            try:
+                with guard:
+                    call = ahedged_call(fn, delay) if delay is not None else fn()
+                    if deadline is not None:
+                        call = deadline.wait_for(call, f"OpenAI {operation}")
+                    result = await call
+            except (asyncio.CancelledError, DeadlineExceeded, CircuitOpenError):
+                raise
+            except Exception as exc:
+                last_error = exc
+                if deadline is not None and deadline.remaining() < 2 ** attempt:
+                    logger.error("OpenAI %s failed with no time left to retry: %s", operation, exc)
+                    raise
+                if attempt < MAX_API_RETRIES:
+                    wait = 2 ** attempt
+                    logger.warning(
+                        "OpenAI %s failed (attempt %d), retrying in %ds: %s",
+                        operation, attempt + 1, wait, exc,
+                    )
+                    if self._limiter is not None and isinstance(exc, RateLimitError):
+                        self._limiter.pause(wait)
+                    await asyncio.sleep(wait)
+                else:
+                    logger.error(
+                        "OpenAI %s failed after %d attempts: %s",
+                        operation, MAX_API_RETRIES + 1, exc,
+                    )
+            else:
+                self._record_success(operation, time.monotonic() - start)
+                return result
+        raise last_error  # type: ignore[misc]
+
+    def _record_success(self, operation: str, elapsed: float) -> None:
+        if self._latency is not None:
+            self._latency.record(operation, elapsed)
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float = 0.0,
+        max_tokens: int = 500,
+        model: str | None = None,
+        timeout: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        operation: str = "chat",
+        hedge: bool = False,
+        deadline: Deadline | None = None,
+    ) -> str:
+        """Call OpenAI chat completion with retry. Returns stripped response text.
+
+        ``operation`` labels the latency histogram; ``hedge`` races a duplicate
+        request once the call outlives that operation's p95 latency;
+        ``deadline`` shrinks the timeout and cancels the call when it expires.
+        """
+        _model = model or MODEL
+        _timeout = timeout or OPENAI_TIMEOUT
+        key = _cache_key(self._cache, _model, messages, temperature, max_tokens)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def _call():
+            if self._limiter is not None:
+                await self._limiter.aacquire(count_message_tokens(messages, _model) + max_tokens, priority)
+            response = await self.client.chat.completions.create(
+                model=_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=deadline.timeout(_timeout) if deadline is not None else _timeout,
+            )
+            _trace_usage(response)
+            return response.choices[0].message.content.strip()
+
+        async def _fetch():
+            content = await self._retry(operation, _call, hedge=hedge, deadline=deadline)
+            if key is not None:
+                self._cache.put(key, content)
+            return content
+
+        if self._flight is None:
+            return await _fetch()
+        flight_key = key or chat_cache_key(_model, messages, temperature, max_tokens)
+        return await self._flight.ado(f"chat:{flight_key}", _fetch)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        temperature: float = 0.0,
+        max_tokens: int = 500,
+        model: str | None = None,
+        timeout: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        operation: str = "chat",
+        deadline: Deadline | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion as text deltas.
+
+        Opening the stream is retried like ``chat``; the latency recorded is
+        the time to the first delta. A cache hit is yielded as one delta, and
+        the full text is cached once the stream completes. Past the
+        ``deadline`` the stream stops with DeadlineExceeded.
+        """
+        _model = model or MODEL
+        _timeout = timeout or OPENAI_TIMEOUT
+        key = _cache_key(self._cache, _model, messages, temperature, max_tokens)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        async def _open():
+            if self._limiter is not None:
+                await self._limiter.aacquire(count_message_tokens(messages, _model) + max_tokens, priority)
+            stream = await self.client.chat.completions.create(
+                model=_model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=deadline.timeout(_timeout) if deadline is not None else _timeout,
+                stream=True,
+            )
+            chunks = stream.__aiter__()
+            # Wait for the first content delta inside the retried section.
+            async for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    return chunks, chunk.choices[0].delta.content
+            return chunks, ""
+
+        chunks, first = await self._retry(operation, _open, deadline=deadline)
+        parts = [first] if first else []
+        if first:
+            yield first
+        async for chunk in chunks:
+            if deadline is not None:
+                deadline.check(f"OpenAI {operation} stream")
+            if chunk.choices and chunk.choices[0].delta.content:
+                delta = chunk.choices[0].delta.content
+                parts.append(delta)
+                yield delta
+        if tracing.active():
+            # Streamed responses carry no usage block; count tokens locally.
+            tracing.add_tokens(count_message_tokens(messages, _model), count_tokens("".join(parts), _model))
+        if key is not None:
+            self._cache.put(key, "".join(parts).strip())
+
+    async def embed(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        deadline: Deadline | None = None,
+    ) -> list[Any]:
+        """Embed texts via OpenAI with retry. Returns list of embedding vectors."""
+        _model = model or EMBEDDING_MODEL
+        vectors, missing = _lookup_embeddings(self._embedding_cache, texts, _model)
+        if not missing:
+            return vectors
+        pending = [texts[i] for i in missing]
+
+        async def _call():
+            if self._limiter is not None:
+                await self._limiter.aacquire(sum(count_tokens(t, _model) for t in pending), priority)
+            response = await self.client.embeddings.create(
+                model=_model,
+                input=pending,
+                timeout=deadline.timeout(OPENAI_TIMEOUT) if deadline is not None else OPENAI_TIMEOUT,
+            )
+            _trace_usage(response)
+            return [item.embedding for item in response.data]
+
+        async def _fetch():
+            if self._batcher is not None and priority == Priority.INTERACTIVE:
+                batch = self._batcher.aembed(pending, _model)
+                return await (deadline.wait_for(batch, "embeddings") if deadline is not None else batch)
+            return await self._retry("embeddings", _call, deadline=deadline)
+
+        if self._flight is None:
+            fetched = await _fetch()
+        else:
+            fetched = await self._flight.ado(_embed_flight_key(_model, pending, priority), _fetch)
+        return _merge_embeddings(self._embedding_cache, texts, _model, vectors, missing, fetched)
@@ -0,0 +1,154 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from enum import IntEnum
+
+from src.core.config import OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT, RATE_LIMIT_BACKGROUND_RESERVE
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 0.05
+
+
+class Priority(IntEnum):
+    """Admission priority; lower values are admitted first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class _Bucket:
+    """Continuously refilling token bucket."""
+
+    def __init__(self, capacity: float) -> None:
+        self.capacity = capacity
+        self.level = capacity
+        self._rate = capacity / 60.0
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it already is)."""
+        deficit = amount - self.level
+        return max(0.0, deficit / self._rate)
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limiter.
+
+    Waiting calls are admitted strictly in (priority, arrival) order, and
+    background calls additionally leave ``background_reserve`` of each
+    bucket free for interactive traffic.
+    """
+
+    def __init__(
+        self,
+        rpm: int = OPENAI_RPM_LIMIT,
+        tpm: int = OPENAI_TPM_LIMIT,
+        background_reserve: float = RATE_LIMIT_BACKGROUND_RESERVE,
+    ) -> None:
+        self._requests = _Bucket(rpm)
+        self._tokens = _Bucket(tpm)
+        self._reserve = background_reserve
+        self._lock = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self.admitted = 0
+        self.waited_seconds = 0.0
+
+    def _enqueue(self, priority: Priority) -> tuple[int, int]:
+        ticket = (int(priority), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _try_admit(self, ticket: tuple[int, int], tokens: int, requests: int) -> float:
+        """Admit ``ticket`` if it is at the head and capacity allows; else seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._waiters[0] != ticket:
+                return _POLL_INTERVAL
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            # Oversized requests are clamped so they can still be admitted.
+            tokens = min(tokens, self._tokens.capacity)
+            reserve = self._reserve if ticket[0] > Priority.INTERACTIVE else 0.0
+            wait = max(
+                self._requests.wait_for(self._with_reserve(self._requests, requests, reserve)),
+                self._tokens.wait_for(self._with_reserve(self._tokens, tokens, reserve)),
+            )
+            if wait > 0:
+                return wait
+            self._requests.level -= requests
+            self._tokens.level -= tokens
+            heapq.heappop(self._waiters)
+            self.admitted += 1
+            self._lock.notify_all()
+            return 0.0
+
+    @staticmethod
+    def _with_reserve(bucket: _Bucket, amount: float, reserve: float) -> float:
+        return min(bucket.capacity, amount + reserve * bucket.capacity)
+
+    def _abandon(self, ticket: tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._lock.notify_all()
+
+    def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE, requests: int = 1) -> None:
+        """Block until the call may be sent."""
+        ticket = self._enqueue(priority)
+        start = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens, requests)) > 0:
+                with self._lock:
+                    self._lock.wait(timeout=min(wait, 1.0))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        self._record_wait(start)
+
+    async def aacquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE, requests: int = 1) -> None:
+        """Async variant of acquire that never blocks the event loop."""
+        ticket = self._enqueue(priority)
+        start = time.monotonic()
+        try:
+            while (wait := self._try_admit(ticket, tokens, requests)) > 0:
+                await asyncio.sleep(min(wait, _POLL_INTERVAL * 4))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        self._record_wait(start)
+
+    def _record_wait(self, start: float) -> None:
+        waited = time.monotonic() - start
+        if waited > 0.5:
+            logger.info("Rate limiter delayed call by %.2fs", waited)
+        with self._lock:
+            self.waited_seconds += waited
+
+    def pause(self, seconds: float) -> None:
+        """Stop admitting calls for ``seconds`` (e.g. after an upstream 429)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "waiting": len(self._waiters),
+                "waited_seconds": round(self.waited_seconds, 3),
+                "requests_available": round(self._requests.level, 1),
+                "tokens_available": round(self._tokens.level, 1),
+            }
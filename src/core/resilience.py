@@ -0,0 +1,229 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Iterator
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError
+
+from src.core.config import (
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS,
+    HEDGE_QUANTILE, HEDGE_MIN_SAMPLES, HEDGE_MIN_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+LATENCY_BUCKETS_MS: list[float] = [
+    5, 10, 25, 50, 100, 250, 500, 750, 1000, 1500, 2000, 3000,
+    5000, 7500, 10000, 15000, 20000, 30000, 60000,
+]
+
+_hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether an exception indicates a degraded upstream (not a bad request)."""
+    return isinstance(exc, (APIConnectionError, APITimeoutError, InternalServerError))
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker over upstream failures.
+
+    After ``failure_threshold`` consecutive upstream failures the circuit
+    opens and calls fail fast for ``reset_seconds``; then a single probe is
+    let through and its outcome closes or re-opens the circuit. A probe that
+    ends any other way (a bad request, cancellation, a deadline) is released
+    so the next call can probe instead.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ) -> None:
+        self._threshold = failure_threshold
+        self._reset = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe: object | None = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self._reset:
+                return "half_open"
+            return "open"
+
+    def before_call(self) -> object | None:
+        """Raise CircuitOpenError if the call must not reach upstream.
+
+        Returns a token when the call is the half-open probe; pass it to
+        ``release_probe`` once the call ends.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return None
+            if time.monotonic() - self._opened_at >= self._reset and self._probe is None:
+                self._probe = object()
+                return self._probe
+            self.rejected += 1
+            raise CircuitOpenError("OpenAI circuit is open; upstream is degraded")
+
+    def release_probe(self, probe: object | None) -> None:
+        """Let another call probe if ``probe`` ended without recording an outcome."""
+        with self._lock:
+            if probe is not None and self._probe is probe:
+                self._probe = None
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Admit one upstream call and record its outcome; the probe is always released."""
+        probe = self.before_call()
+        try:
+            yield
+        except Exception as exc:
+            if is_upstream_failure(exc):
+                self.record_failure()
+            raise
+        else:
+            self.record_success()
+        finally:
+            self.release_probe(probe)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            probing = self._probe is not None
+            if probing or self._failures >= self._threshold:
+                if self._opened_at is None or probing:
+                    logger.warning("Opening OpenAI circuit after %d failures", self._failures)
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate quantiles."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000.0
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound (seconds) of the bucket holding the q-quantile."""
+        if not self.total:
+            return None
+        target = q * self.total
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                bound = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else LATENCY_BUCKETS_MS[-1] * 2
+                return bound / 1000.0
+        return None
+
+
+class LatencyRecorder:
+    """Per-operation latency histograms, shared across clients."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        with self._lock:
+            self._histograms.setdefault(operation, LatencyHistogram()).record(seconds)
+
+    def mean(self, operation: str) -> float | None:
+        """Mean latency (seconds) of ``operation``, or None before any samples."""
+        with self._lock:
+            hist = self._histograms.get(operation)
+            return hist.sum_ms / hist.total / 1000.0 if hist is not None and hist.total else None
+
+    def hedge_delay(self, operation: str) -> float | None:
+        """Delay before hedging ``operation``, or None while data is insufficient."""
+        with self._lock:
+            hist = self._histograms.get(operation)
+            if hist is None or hist.total < HEDGE_MIN_SAMPLES:
+                return None
+            p = hist.quantile(HEDGE_QUANTILE)
+        return max(p, HEDGE_MIN_DELAY_SECONDS) if p is not None else None
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                op: {
+                    "count": h.total,
+                    "mean_ms": round(h.sum_ms / h.total, 1) if h.total else 0.0,
+                    "p50_s": h.quantile(0.5),
+                    "p95_s": h.quantile(0.95),
+                    "p99_s": h.quantile(0.99),
+                    "buckets_ms": dict(zip([*map(str, LATENCY_BUCKETS_MS), "inf"], h.counts)),
+                }
+                for op, h in self._histograms.items()
+            }
+
+
+def hedged_call(fn: Callable[[], Any], delay: float) -> Any:
+    """Run ``fn``; if it has not returned after ``delay`` seconds, race a duplicate."""
+    first = _hedge_executor.submit(fn)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    logger.info("Hedging call after %.2fs", delay)
+    pending = {first, _hedge_executor.submit(fn)}
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                return fut.result()
+            error = fut.exception()
+    raise error  # type: ignore[misc]
+
+
+async def ahedged_call(fn: Callable[[], Awaitable[Any]], delay: float) -> Any:
+    """Async variant of hedged_call; the losing request is cancelled."""
+    tasks = {asyncio.ensure_future(fn())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            logger.info("Hedging call after %.2fs", delay)
+            tasks.add(asyncio.ensure_future(fn()))
+        error: BaseException | None = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+from src.core.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class _LeaderCancelled(Exception):
+    """Raised to followers when the leading call was cancelled or ran out of its own deadline."""
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one upstream call.
+
+    In-flight calls are tracked with ``concurrent.futures.Future`` so that
+    threads and coroutines on any event loop can share the same result.
+    A leader that is cancelled or exceeds its own deadline does not fail its
+    followers: each one runs ``fn`` itself, under its own budget.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self.leaders = 0
+        self.collapsed = 0
+
+    def _join(self, key: str) -> tuple[Future, bool]:
+        """Return (future, is_leader) for ``key``."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.collapsed += 1
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            self.leaders += 1
+            return fut, True
+
+    def _finish(self, key: str) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once per key among concurrent callers and share its result."""
+        fut, leader = self._join(key)
+        if not leader:
+            try:
+                return fut.result()
+            except _LeaderCancelled:
+                return fn()
+        try:
+            result = fn()
+        except DeadlineExceeded:
+            fut.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of ``do``; followers await the leader without blocking."""
+        fut, leader = self._join(key)
+        if not leader:
+            try:
+                return await asyncio.shield(asyncio.wrap_future(fut))
+            except _LeaderCancelled:
+                return await fn()
+        try:
+            result = await fn()
+        except (asyncio.CancelledError, DeadlineExceeded):
+            fut.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            inflight = len(self._inflight)
+        return {"leaders": self.leaders, "collapsed": self.collapsed, "inflight": inflight}
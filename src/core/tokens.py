@@ -0,0 +1,61 @@
+import logging
+import math
+from functools import lru_cache
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Per-message framing overhead of the chat format (role, separators).
+_MESSAGE_OVERHEAD = 4
+_REPLY_PRIMER = 3
+
+
+# Characters per token assumed when no tiktoken encoding can be loaded.
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> tiktoken.Encoding | None:
+    """tiktoken encoding for ``model``, or None if it cannot be loaded.
+
+    tiktoken downloads its BPE files on first use; offline or behind a proxy
+    that fails, and counts fall back to a character estimate so admission
+    control never fails a request.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            logger.debug("No tiktoken encoding for %s, using o200k_base", model)
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:
+        logger.warning("tiktoken encoding for %s unavailable (%s); estimating tokens from length", model, exc)
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Number of tokens ``text`` encodes to for ``model``."""
+    enc = _encoding(model)
+    if enc is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: list[dict[str, str]], model: str) -> int:
+    """Approximate prompt tokens for a chat completion request."""
+    total = _REPLY_PRIMER
+    for message in messages:
+        total += _MESSAGE_OVERHEAD + count_tokens(message.get("content") or "", model)
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens."""
+    enc = _encoding(model)
+    if enc is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    return enc.decode(ids[:max_tokens])
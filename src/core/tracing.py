@@ -0,0 +1,219 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src.core.config import TRACE_MAX_BYTES, TRACE_PATH, TRACE_SUMMARY_WINDOW, TRACING_ENABLED
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+DEFAULT_TRACE_PATH = DATA_DIR / "processed" / "traces.jsonl"
+
+_request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("trace_request_id", default=None)
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar("trace_span", default=None)
+
+
+class Span:
+    """One timed pipeline stage within a request.
+
+    Spans nest through a context variable, so children started in awaited
+    coroutines, gathered tasks and ``asyncio.to_thread`` workers find their
+    parent without it being passed around.
+    """
+
+    __slots__ = ("name", "request_id", "span_id", "parent_id", "start", "duration", "attrs", "_t0")
+
+    def __init__(self, name: str, request_id: str, parent_id: str | None, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.request_id = request_id
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration: float | None = None
+        self.attrs = attrs
+        self._t0 = time.monotonic()
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def add_tokens(self, prompt: int = 0, completion: int = 0) -> None:
+        """Accumulate token usage for the LLM calls made under this span."""
+        self.attrs["prompt_tokens"] = self.attrs.get("prompt_tokens", 0) + prompt
+        self.attrs["completion_tokens"] = self.attrs.get("completion_tokens", 0) + completion
+
+    def finish(self) -> None:
+        self.duration = time.monotonic() - self._t0
+
+    def to_record(self) -> dict[str, Any]:
+        return {
+            "request_id": self.request_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attrs": self.attrs,
+        }
+
+
+class Tracer:
+    """Exports finished spans as JSONL and keeps recent durations per stage.
+
+    Once the file passes ``max_bytes`` it is moved to ``<path>.1`` (replacing
+    the previous one) and a new file is started, so disk use stays bounded.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = DEFAULT_TRACE_PATH,
+        window: int = TRACE_SUMMARY_WINDOW,
+        max_bytes: int = TRACE_MAX_BYTES,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._durations: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._path = Path(path) if path is not None else None
+        self._max_bytes = max_bytes
+        self._file = None
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self._path.open("a", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_record(), default=str)
+        with self._lock:
+            self._durations[span.name].append(span.duration or 0.0)
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self._file.flush()
+                if self._max_bytes and self._file.tell() >= self._max_bytes:
+                    self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._path.replace(rotated_path(self._path))
+        self._file = self._path.open("a", encoding="utf-8")
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """p50/p95 milliseconds per stage over the recent window."""
+        with self._lock:
+            samples = {name: list(durations) for name, durations in self._durations.items()}
+        return {name: _percentiles([d * 1000 for d in values]) for name, values in samples.items() if values}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _percentiles(values_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(values_ms)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {"count": len(ordered), "p50_ms": pick(0.5), "p95_ms": pick(0.95)}
+
+
+def summarize(records: Iterable[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """p50/p95 milliseconds per stage from exported span records."""
+    durations: dict[str, list[float]] = defaultdict(list)
+    for record in records:
+        durations[record["name"]].append(record["duration_ms"])
+    return {name: _percentiles(values) for name, values in sorted(durations.items())}
+
+
+def rotated_path(path: Path | str) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".1")
+
+
+def load_records(path: Path | str = DEFAULT_TRACE_PATH) -> Iterator[dict[str, Any]]:
+    """Span records from ``path``, oldest first, including its rotated predecessor."""
+    for file in (rotated_path(path), Path(path)):
+        if not file.exists():
+            continue
+        with file.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def current_request_id() -> str | None:
+    return _request_id.get()
+
+
+@contextmanager
+def request(request_id: str | None = None) -> Iterator[str]:
+    """Scope the spans started inside to ``request_id`` (a new id when None)."""
+    request_id = request_id or new_request_id()
+    token = _request_id.set(request_id)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(token)
+
+
+def active() -> bool:
+    """Whether spans started now would be recorded."""
+    return _current_span.get() is not None
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """Time a stage as a child of the current span.
+
+    Outside a request, or with tracing disabled, the span is not exported.
+    """
+    tracer = get_tracer()
+    request_id = _request_id.get()
+    parent = _current_span.get()
+    current = Span(name, request_id or "", parent.span_id if parent else None, attrs)
+    if tracer is None or request_id is None:
+        yield current
+        return
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.set(error=type(exc).__name__)
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+        tracer.export(current)
+
+
+def add_tokens(prompt: int = 0, completion: int = 0) -> None:
+    """Attribute token usage to the current span, if any."""
+    current = _current_span.get()
+    if current is not None:
+        current.add_tokens(prompt, completion)
+
+
+_tracer: Tracer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer | None:
+    """Process-wide tracer, or None when TRACING_ENABLED is off."""
+    global _tracer
+    if not TRACING_ENABLED:
+        return None
+    if _tracer is not None:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(TRACE_PATH or DEFAULT_TRACE_PATH)
+        return _tracer
@@ -1,9 +1,18 @@
 import logging
 import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Iterator
 
 import duckdb
 
+from src.core.config import (
+    DUCKDB_CURSOR_POOL_SIZE, DUCKDB_MEMORY_LIMIT, DUCKDB_THREADS, MAX_QUERY_ROWS, QUERY_TIMEOUT_SECONDS,
+    ROLLUP_ROUTING_ENABLED,
+)
+from src.data.result_cache import SQLResultCache
+from src.data.rollups import RollupRouter, build_rollups
 from src.models.tools import QueryResult
 
 logger = logging.getLogger(__name__)
@@ -12,8 +21,11 @@ DATA_DIR = Path(__file__).parent.parent.parent / "data"
 RAW_DIR = DATA_DIR / "raw"
 DB_PATH = DATA_DIR / "processed" / "fraud.duckdb"
 
-MAX_QUERY_ROWS = 1000
-QUERY_TIMEOUT_SECONDS = 10
+STATS_TABLE = "column_stats"
+# Columns with at most this many distinct values have them listed in the catalog.
+STATS_MAX_LISTED_VALUES = 50
+_NUMERIC_TYPES = {"TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "FLOAT", "DOUBLE"}
+
 _BLOCKED_KEYWORDS = re.compile(
     r"\b(INSERT|UPDATE|DELETE|DROP|ALTER|CREATE|TRUNCATE|EXEC|EXECUTE|GRANT|REVOKE)\b",
     re.IGNORECASE,
@@ -46,6 +58,94 @@ _CSV_COLUMNS = {
 }
 
 
+def duckdb_config() -> dict[str, Any]:
+    """DuckDB settings from DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT; unset values keep DuckDB's defaults."""
+    config: dict[str, Any] = {}
+    if DUCKDB_THREADS > 0:
+        config["threads"] = DUCKDB_THREADS
+    if DUCKDB_MEMORY_LIMIT:
+        config["memory_limit"] = DUCKDB_MEMORY_LIMIT
+    return config
+
+
+class CursorPool:
+    """Bounded pool of DuckDB cursors over one database connection.
+
+    A DuckDB connection runs one statement at a time, so concurrent sessions
+    sharing it serialize. Each cursor is an independent connection to the same
+    database: leasing one per query lets queries from different threads run in
+    parallel, and interrupting one never cancels another. At most ``size``
+    cursors are leased at once; further callers wait for one to be returned.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, size: int = DUCKDB_CURSOR_POOL_SIZE) -> None:
+        if size < 1:
+            raise ValueError("Cursor pool size must be at least 1")
+        self._con = con
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: list[duckdb.DuckDBPyConnection] = []
+        self.size = size
+        self.created = 0
+
+    @contextmanager
+    def lease(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a cursor for the duration of the ``with`` block."""
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._idle:
+                    cursor = self._idle.pop()
+                else:
+                    cursor = self._con.cursor()
+                    self.created += 1
+            try:
+                yield cursor
+            finally:
+                with self._lock:
+                    self._idle.append(cursor)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close the idle cursors; leased ones are closed with the connection."""
+        with self._lock:
+            for cursor in self._idle:
+                cursor.close()
+            self._idle.clear()
+
+
+class _QueryWatchdog:
+    """Interrupts a DuckDB cursor if the query it guards outlives ``timeout``.
+
+    The interrupt only fires while the query is still running, so a late
+    timer never cancels the next statement run on the same cursor.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, timeout: float) -> None:
+        self._con = con
+        self._lock = threading.Lock()
+        self._running = True
+        self.fired = False
+        self._timer = threading.Timer(timeout, self._fire)
+        self._timer.daemon = True
+
+    def _fire(self) -> None:
+        with self._lock:
+            if self._running:
+                self.fired = True
+                self._con.interrupt()
+
+    def __enter__(self) -> "_QueryWatchdog":
+        self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        with self._lock:
+            self._running = False
+        self._timer.cancel()
+
+
 class FraudDatabase:
     """DuckDB-backed database for fraud transaction data."""
 
@@ -90,20 +190,39 @@ SQL dialect: DuckDB (use strftime for date formatting, FILTER clause for conditi
         "EXTRACT(HOUR FROM CAST(trans_date_trans_time AS TIMESTAMP)) AS transaction_hour"
     )
 
-    def __init__(self, con: duckdb.DuckDBPyConnection) -> None:
+    def __init__(
+        self,
+        con: duckdb.DuckDBPyConnection,
+        result_cache: SQLResultCache | None = None,
+        rollup_routing: bool = ROLLUP_ROUTING_ENABLED,
+        pool_size: int = DUCKDB_CURSOR_POOL_SIZE,
+    ) -> None:
         self._con = con
+        self._results = result_cache
+        self._cursors = CursorPool(con, pool_size)
+        self._rollups = RollupRouter(con.cursor()) if rollup_routing else None
 
     @classmethod
-    def connect(cls, read_only: bool = True) -> "FraudDatabase":
+    def connect(
+        cls,
+        read_only: bool = True,
+        result_cache: SQLResultCache | None = None,
+        rollup_routing: bool = ROLLUP_ROUTING_ENABLED,
+        pool_size: int = DUCKDB_CURSOR_POOL_SIZE,
+    ) -> "FraudDatabase":
         """Create a new FraudDatabase with a connection to the default DB path."""
         DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        con = duckdb.connect(str(DB_PATH), read_only=read_only)
-        return cls(con)
+        con = duckdb.connect(str(DB_PATH), read_only=read_only, config=duckdb_config())
+        return cls(con, result_cache=result_cache, rollup_routing=rollup_routing, pool_size=pool_size)
 
     @property
     def connection(self) -> duckdb.DuckDBPyConnection:
         return self._con
 
+    @property
+    def cursors(self) -> CursorPool:
+        return self._cursors
+
     def ingest_csv(self) -> int:
         """Load CSV files into the transactions table. Returns row count."""
         logger.info("Dropping existing transactions table if present")
@@ -132,15 +251,92 @@ SQL dialect: DuckDB (use strftime for date formatting, FILTER clause for conditi
 
         row_count = self._con.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
         logger.info("Total rows ingested: %s", f"{row_count:,}")
+        self.build_column_stats()
+        build_rollups(self._con)
         return row_count
 
+    def build_column_stats(self) -> int:
+        """(Re)build the column statistics catalog table. Returns the number of columns."""
+        stats = self._compute_column_stats(self._con)
+        self._con.execute(f"DROP TABLE IF EXISTS {STATS_TABLE}")
+        self._con.execute(
+            f"CREATE TABLE {STATS_TABLE} ("
+            "column_name VARCHAR PRIMARY KEY, data_type VARCHAR, row_count BIGINT, null_count BIGINT, "
+            "distinct_count BIGINT, min_value VARCHAR, max_value VARCHAR, avg_value DOUBLE, "
+            "distinct_values VARCHAR[])"
+        )
+        self._con.executemany(
+            f"INSERT INTO {STATS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                [name, s["data_type"], s["row_count"], s["null_count"], s["distinct_count"],
+                 s["min_value"], s["max_value"], s["avg_value"], s["distinct_values"]]
+                for name, s in stats.items()
+            ],
+        )
+        logger.info("Built %s catalog for %d columns", STATS_TABLE, len(stats))
+        return len(stats)
+
+    def column_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-column statistics from the catalog, keyed by column name.
+
+        Databases ingested before the catalog existed fall back to computing
+        the same statistics from the transactions table.
+        """
+        with self._cursors.lease() as cursor:
+            try:
+                result = cursor.execute(f"SELECT * FROM {STATS_TABLE}")
+            except duckdb.CatalogException:
+                logger.warning("No %s catalog; re-run ingest. Scanning transactions instead", STATS_TABLE)
+                return self._compute_column_stats(cursor)
+            fields = [desc[0] for desc in result.description]
+            return {row[0]: dict(zip(fields[1:], row[1:])) for row in result.fetchall()}
+
+    @staticmethod
+    def _compute_column_stats(con: duckdb.DuckDBPyConnection) -> dict[str, dict[str, Any]]:
+        """Min/max/avg, distinct and null counts per column in one scan, plus small value sets."""
+        columns = [(row[0], row[1]) for row in con.execute("DESCRIBE transactions").fetchall()]
+        aggregates = ["COUNT(*)"]
+        for name, data_type in columns:
+            col = f'"{name}"'
+            avg = f"AVG({col})" if data_type in _NUMERIC_TYPES else "NULL"
+            aggregates.append(
+                f"COUNT(*) - COUNT({col}), COUNT(DISTINCT {col}), "
+                f"MIN({col})::VARCHAR, MAX({col})::VARCHAR, {avg}"
+            )
+        values = con.execute(f"SELECT {', '.join(aggregates)} FROM transactions").fetchone()
+        row_count = values[0]
+
+        stats: dict[str, dict[str, Any]] = {}
+        for i, (name, data_type) in enumerate(columns):
+            null_count, distinct_count, min_value, max_value, avg_value = values[1 + 5 * i:6 + 5 * i]
+            distinct_values = None
+            if distinct_count <= STATS_MAX_LISTED_VALUES:
+                distinct_values = [
+                    row[0] for row in con.execute(
+                        f'SELECT DISTINCT "{name}"::VARCHAR FROM transactions '
+                        f'WHERE "{name}" IS NOT NULL ORDER BY 1'
+                    ).fetchall()
+                ]
+            stats[name] = {
+                "data_type": data_type,
+                "row_count": row_count,
+                "null_count": null_count,
+                "distinct_count": distinct_count,
+                "min_value": min_value,
+                "max_value": max_value,
+                "avg_value": avg_value,
+                "distinct_values": distinct_values,
+            }
+        return stats
+
     def get_schema(self) -> str:
         """Return a formatted table schema string for LLM prompts."""
         return self._SCHEMA_DESCRIPTION
 
     def get_sample_rows(self, n: int = 5) -> str:
         """Return formatted sample rows for LLM prompts."""
-        result = self._con.execute(f"SELECT * FROM transactions LIMIT {n}").fetchdf()
+        with self._cursors.lease() as cursor:
+            result = cursor.execute(f"SELECT * FROM transactions LIMIT {n}").fetchdf()
         return result.to_string(index=False)
 
     @staticmethod
@@ -153,8 +349,18 @@ SQL dialect: DuckDB (use strftime for date formatting, FILTER clause for conditi
             return "Query contains blocked keywords."
         return None
 
-    def execute_query(self, sql: str) -> QueryResult:
-        """Execute a validated SQL query. Returns typed QueryResult."""
+    def execute_query(self, sql: str, timeout: float | None = None) -> QueryResult:
+        """Execute a validated SQL query. Returns typed QueryResult.
+
+        The query is interrupted once it runs for ``timeout`` seconds
+        (QUERY_TIMEOUT_SECONDS by default; 0 disables the limit) and a result
+        with ``timed_out`` set is returned.
+        Each query runs on its own cursor leased from the pool, so concurrent
+        sessions do not serialize on one connection.
+        Successful results are served from the result cache, when configured,
+        for any query with the same normalized SQL. Compatible aggregates run
+        on a rollup table, falling back to the base table if that fails.
+        """
         error = self.validate_query(sql)
         if error:
             return QueryResult(success=False, error=error)
@@ -162,8 +368,45 @@ SQL dialect: DuckDB (use strftime for date formatting, FILTER clause for conditi
         if not re.search(r"\bLIMIT\b", sql, re.IGNORECASE):
             sql = sql.rstrip().rstrip(";") + f" LIMIT {MAX_QUERY_ROWS}"
 
+        if self._results is not None:
+            cached = self._results.get(sql)
+            if cached is not None:
+                return cached
+
+        result = None
+        rewritten = self._rollups.rewrite(sql) if self._rollups is not None else None
+        if rewritten is not None:
+            result = self._run(rewritten, timeout)
+            if not result.success and not result.timed_out:
+                logger.warning("Rollup query failed (%s); running on transactions", result.error)
+                result = None
+        if result is None:
+            result = self._run(sql, timeout)
+
+        if self._results is not None:
+            self._results.put(sql, result)
+        return result
+
+    def _run(self, sql: str, timeout: float | None) -> QueryResult:
+        timeout = QUERY_TIMEOUT_SECONDS if timeout is None else timeout
+        with self._cursors.lease() as cursor:
+            if timeout <= 0:
+                return self._execute(cursor, sql)
+            with _QueryWatchdog(cursor, timeout) as watchdog:
+                result = self._execute(cursor, sql)
+        if watchdog.fired and not result.success:
+            logger.warning("SQL interrupted after %.1fs: %s", timeout, sql)
+            return QueryResult(
+                success=False,
+                error=f"Query interrupted after exceeding its {timeout:.1f}s time limit.",
+                timed_out=True,
+            )
+        return result
+
+    @staticmethod
+    def _execute(cursor: duckdb.DuckDBPyConnection, sql: str) -> QueryResult:
         try:
-            result = self._con.execute(sql)
+            result = cursor.execute(sql)
             columns = [desc[0] for desc in result.description]
             rows = result.fetchall()
             return QueryResult(
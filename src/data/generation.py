@@ -0,0 +1,26 @@
+import hashlib
+from pathlib import Path
+from typing import Iterable
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+PROCESSED_DIR = DATA_DIR / "processed"
+
+# Artifacts written by scripts/ingest.py; rebuilding any of them changes the generation.
+DB_ARTIFACTS = (PROCESSED_DIR / "fraud.duckdb",)
+INDEX_ARTIFACTS = (PROCESSED_DIR / "faiss_index.bin", PROCESSED_DIR / "chunks.pkl")
+
+
+def data_generation(paths: Iterable[Path] = DB_ARTIFACTS + INDEX_ARTIFACTS) -> str:
+    """Fingerprint of the processed data files (name, size and mtime).
+
+    Cheap enough to check per request; caches derived from the data compare
+    it to drop entries built against an older ingest.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        try:
+            st = Path(path).stat()
+            digest.update(f"{path}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+        except FileNotFoundError:
+            digest.update(f"{path}:missing\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
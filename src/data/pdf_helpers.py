@@ -8,6 +8,7 @@ import numpy as np
 from openai import OpenAI
 
 from src.core.config import EMBEDDING_MODEL
+from src.core.embedding_cache import EmbeddingCache, get_embedding_cache
 from src.models.chunks import ChunkMetadata
 
 logger = logging.getLogger(__name__)
@@ -25,18 +26,37 @@ def extract_pdf_pages(pdf_path: Path) -> list[tuple[int, str]]:
     return pages
 
 
-def embed_texts(texts: list[str], client: OpenAI) -> np.ndarray:
-    """Batch-embed texts via OpenAI and return normalized numpy array."""
-    embeddings: list[list[float]] = []
+def embed_texts(
+    texts: list[str],
+    client: OpenAI,
+    cache: EmbeddingCache | None = None,
+) -> np.ndarray:
+    """Batch-embed texts via OpenAI and return normalized numpy array.
+
+    Texts already present in the embedding cache are not re-embedded.
+    """
+    cache = cache or get_embedding_cache()
+    if cache is not None:
+        embeddings, missing = cache.lookup(texts, EMBEDDING_MODEL)
+    else:
+        embeddings, missing = [None] * len(texts), list(range(len(texts)))
+    if cache is not None and texts:
+        logger.info("Embedding cache: %d/%d texts cached", len(texts) - len(missing), len(texts))
+
     batch_size = 100
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
+    for i in range(0, len(missing), batch_size):
+        batch_idx = missing[i : i + batch_size]
+        batch = [texts[j] for j in batch_idx]
         response = client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
-        embeddings.extend([item.embedding for item in response.data])
+        for j, item in zip(batch_idx, response.data):
+            if cache is not None:
+                embeddings[j] = cache.put(texts[j], EMBEDDING_MODEL, item.embedding)
+            else:
+                embeddings[j] = item.embedding
         logger.info(
             "Embedded batch %d/%d",
             i // batch_size + 1,
-            (len(texts) - 1) // batch_size + 1,
+            (len(missing) - 1) // batch_size + 1,
         )
     arr = np.array(embeddings, dtype=np.float32)
     faiss.normalize_L2(arr)
@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from src.core.config import (
+    SQL_RESULT_CACHE_DISK_ENABLED, SQL_RESULT_CACHE_ENABLED, SQL_RESULT_CACHE_MAX_BYTES,
+    SQL_RESULT_CACHE_MEMORY_SIZE,
+)
+from src.data.generation import DB_ARTIFACTS, data_generation
+from src.data.sql_text import normalize_sql
+from src.models.tools import QueryResult
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+RESULT_CACHE_PATH = DATA_DIR / "processed" / "sql_result_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    generation TEXT NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def result_key(sql: str) -> str:
+    return hashlib.sha256(normalize_sql(sql).encode("utf-8")).hexdigest()
+
+
+class SQLResultCache:
+    """Cache of successful QueryResults keyed by normalized SQL.
+
+    Hot results live in an in-memory LRU; with a ``path`` every result is also
+    kept in a size-capped SQLite file that survives restarts. The database is
+    read-only between ingests, so entries stay valid until the DuckDB file's
+    generation changes, which drops both tiers.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = RESULT_CACHE_PATH,
+        memory_size: int = SQL_RESULT_CACHE_MEMORY_SIZE,
+        max_bytes: int = SQL_RESULT_CACHE_MAX_BYTES,
+        generation_fn: Callable[[], str] = partial(data_generation, DB_ARTIFACTS),
+    ) -> None:
+        self._memory_size = memory_size
+        self._max_bytes = max_bytes
+        self._generation_fn = generation_fn
+        self._memory: OrderedDict[str, QueryResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._con = None
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._con = sqlite3.connect(str(path), check_same_thread=False)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute(_SCHEMA)
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON results(accessed)")
+            self._con.commit()
+        self._generation = ""
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        with self._lock:
+            self._sync_generation()
+
+    def _sync_generation(self) -> None:
+        """Drop every entry computed against an older ingest."""
+        generation = self._generation_fn()
+        if generation == self._generation:
+            return
+        self._memory.clear()
+        if self._con is not None:
+            purged = self._con.execute(
+                "DELETE FROM results WHERE generation != ?", (generation,),
+            ).rowcount
+            self._con.commit()
+            if purged:
+                logger.info("SQL result cache: dropped %d results from an older database", purged)
+        self._generation = generation
+
+    def _remember(self, key: str, result: QueryResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, sql: str) -> QueryResult | None:
+        """Cached result for ``sql`` (or any query with the same normalized form)."""
+        key = result_key(sql)
+        with self._lock:
+            self._sync_generation()
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result.model_copy()
+            if self._con is not None:
+                row = self._con.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    columns, rows = pickle.loads(row[0])
+                    result = QueryResult(success=True, columns=columns, rows=rows, row_count=len(rows))
+                    self._con.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self._con.commit()
+                    self._remember(key, result)
+                    self.disk_hits += 1
+                    return result.model_copy()
+            self.misses += 1
+            return None
+
+    def put(self, sql: str, result: QueryResult) -> None:
+        """Store a successful result; failures are never cached."""
+        if not result.success:
+            return
+        key = result_key(sql)
+        with self._lock:
+            self._sync_generation()
+            self._remember(key, result.model_copy())
+            if self._con is None:
+                return
+            value = pickle.dumps((result.columns, result.rows), protocol=pickle.HIGHEST_PROTOCOL)
+            self._con.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, generation, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), self._generation, time.time()),
+            )
+            self._evict()
+            self._con.commit()
+
+    def _evict(self) -> None:
+        total = self._con.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        for key, size in self._con.execute("SELECT key, size FROM results ORDER BY accessed").fetchall():
+            if total <= self._max_bytes:
+                break
+            self._con.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        with self._lock:
+            disk_entries = 0
+            if self._con is not None:
+                disk_entries = self._con.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+
+_default_cache: SQLResultCache | None = None
+_default_lock = threading.Lock()
+
+
+def get_result_cache() -> SQLResultCache | None:
+    """Process-wide SQL result cache, or None when SQL_RESULT_CACHE_ENABLED is off."""
+    global _default_cache
+    if not SQL_RESULT_CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SQLResultCache(RESULT_CACHE_PATH if SQL_RESULT_CACHE_DISK_ENABLED else None)
+        return _default_cache
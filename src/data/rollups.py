@@ -0,0 +1,309 @@
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from itertools import combinations
+from typing import Any
+
+import duckdb
+
+from src.data.sql_text import SQLToken, tokenize_sql
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_CATALOG = "rollup_catalog"
+ROLLUP_PREFIX = "rollup_"
+
+_LOW_CARDINALITY = ("transaction_month", "category", "transaction_hour", "state", "gender")
+ROLLUP_DIMENSIONS = _LOW_CARDINALITY + ("merchant",)
+# Every single dimension, every pair of low-cardinality ones, and merchant by category or month.
+ROLLUP_SETS: tuple[tuple[str, ...], ...] = (
+    tuple((d,) for d in ROLLUP_DIMENSIONS)
+    + tuple(combinations(_LOW_CARDINALITY, 2))
+    + (("merchant", "category"), ("merchant", "transaction_month"))
+)
+
+# Aggregates over raw rows and their equivalent over a rollup's partial aggregates.
+# ``{f}`` is the original FILTER clause, applied to every partial aggregate.
+_REWRITES = {
+    ("count_star", ""): "COALESCE(SUM(rollup_count){f}, 0)::BIGINT",
+    ("sum", "amt"): "SUM(rollup_amt_sum){f}",
+    ("avg", "amt"): "(SUM(rollup_amt_sum){f} / SUM(rollup_count){f})",
+    ("min", "amt"): "MIN(rollup_amt_min){f}",
+    ("max", "amt"): "MAX(rollup_amt_max){f}",
+    ("sum", "is_fraud"): "SUM(is_fraud * rollup_count){f}",
+    ("avg", "is_fraud"): "(SUM(is_fraud * rollup_count){f} / SUM(rollup_count){f})",
+}
+_ALLOWED_EXPRESSIONS = {
+    "COLUMN_REF", "CONSTANT", "FUNCTION", "COMPARISON", "CONJUNCTION", "OPERATOR", "CASE", "CAST", "BETWEEN",
+}
+_ALLOWED_MODIFIERS = {"ORDER_MODIFIER", "LIMIT_MODIFIER", "DISTINCT_MODIFIER"}
+
+
+def rollup_table(dimensions: tuple[str, ...]) -> str:
+    return ROLLUP_PREFIX + "_".join(dimensions)
+
+
+def build_rollups(con: duckdb.DuckDBPyConnection) -> int:
+    """(Re)build the rollup tables and their catalog from ``transactions``. Returns the table count."""
+    catalog = []
+    for dimensions in ROLLUP_SETS:
+        table = rollup_table(dimensions)
+        dims = ", ".join(dimensions)
+        con.execute(f"DROP TABLE IF EXISTS {table}")
+        con.execute(
+            f"CREATE TABLE {table} AS SELECT {dims}, is_fraud, "
+            "COUNT(*) AS rollup_count, SUM(amt) AS rollup_amt_sum, "
+            "MIN(amt) AS rollup_amt_min, MAX(amt) AS rollup_amt_max "
+            f"FROM transactions GROUP BY {dims}, is_fraud"
+        )
+        rows = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        catalog.append([table, list(dimensions), rows])
+    con.execute(f"DROP TABLE IF EXISTS {ROLLUP_CATALOG}")
+    con.execute(f"CREATE TABLE {ROLLUP_CATALOG} (table_name VARCHAR, dimensions VARCHAR[], row_count BIGINT)")
+    con.executemany(f"INSERT INTO {ROLLUP_CATALOG} VALUES (?, ?, ?)", catalog)
+    logger.info("Built %d rollup tables (%s rows)", len(catalog), f"{sum(c[2] for c in catalog):,}")
+    return len(catalog)
+
+
+class _Unsupported(Exception):
+    """The query cannot be answered from a rollup."""
+
+
+class RollupRouter:
+    """Rewrites aggregate queries over ``transactions`` to run on a rollup table.
+
+    Deliberately conservative: a query qualifies only if DuckDB's parser shows
+    a single SELECT over ``transactions`` (no joins, subqueries, CTEs or window
+    functions) whose columns are rollup dimensions or ``is_fraud``, whose
+    scalar functions are deterministic, and whose aggregates over raw rows are
+    COUNT(*), or SUM/AVG/MIN/MAX of ``amt`` (SUM and AVG also of ``is_fraud``),
+    optionally with FILTER. Anything else runs unchanged on the base table.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection) -> None:
+        self._con = con
+        # Parsing happens on a private in-memory connection, never the shared one.
+        self._parser = duckdb.connect()
+        self._lock = threading.Lock()
+        self._aggregates: set[str] = {
+            row[0] for row in self._parser.execute(
+                "SELECT DISTINCT function_name FROM duckdb_functions() WHERE function_type = 'aggregate'"
+            ).fetchall()
+        }
+        self._deterministic = self._deterministic_functions()
+        self._rollups: list[tuple[str, frozenset[str]]] | None = None
+        self._base_columns: set[str] = set()
+
+    def _deterministic_functions(self) -> set[str]:
+        """Scalar functions and macros whose result depends only on their arguments.
+
+        Volatile (random, uuid, nextval) and per-query (now, current_*) functions
+        are excluded, as are macros built on them.
+        """
+        rows = self._parser.execute(
+            "SELECT lower(function_name), function_type, stability, macro_definition "
+            "FROM duckdb_functions() WHERE function_type IN ('scalar', 'macro')"
+        ).fetchall()
+        unstable = {name for name, kind, stability, _ in rows if kind == "scalar" and stability != "CONSISTENT"}
+        mentions_unstable = re.compile(
+            r"\b(?:current_\w+|" + "|".join(re.escape(name) for name in unstable) + r")\b", re.IGNORECASE,
+        )
+        return {
+            name for name, kind, stability, definition in rows
+            if (kind == "scalar" and stability == "CONSISTENT")
+            or (kind == "macro" and not mentions_unstable.search(definition or ""))
+        } - unstable
+
+    def _load(self) -> list[tuple[str, frozenset[str]]]:
+        if self._rollups is None:
+            try:
+                rows = self._con.execute(
+                    f"SELECT table_name, dimensions FROM {ROLLUP_CATALOG} ORDER BY row_count"
+                ).fetchall()
+                self._base_columns = {row[0] for row in self._con.execute("DESCRIBE transactions").fetchall()}
+            except duckdb.CatalogException:
+                logger.info("No rollup tables; re-run ingest to enable rollup routing")
+                rows = []
+            self._rollups = [(table, frozenset(dims)) for table, dims in rows]
+        return self._rollups
+
+    def rewrite(self, sql: str) -> str | None:
+        """Equivalent SQL over the smallest rollup that covers the query, or None."""
+        with self._lock:
+            rollups = self._load()
+            if not rollups:
+                return None
+            try:
+                tree = json.loads(self._parser.execute("SELECT json_serialize_sql(?)", [sql]).fetchone()[0])
+                dimensions, aggregates = self._analyze(tree)
+            except (_Unsupported, duckdb.Error) as exc:
+                logger.debug("Not routed to a rollup: %s", exc)
+                return None
+        for table, covered in rollups:
+            if dimensions <= covered:
+                rewritten = self._rewrite_text(sql, table, aggregates)
+                if rewritten is not None:
+                    logger.info("Answering from rollup %s", table)
+                return rewritten
+        return None
+
+    def _analyze(self, tree: dict[str, Any]) -> tuple[set[str], Counter]:
+        """Dimensions the query needs and the raw-row aggregates it uses."""
+        if tree.get("error") or len(tree.get("statements", [])) != 1:
+            raise _Unsupported("not a single statement")
+        node = tree["statements"][0]["node"]
+        if node.get("type") != "SELECT_NODE" or node.get("cte_map", {}).get("map"):
+            raise _Unsupported("not a plain SELECT")
+        table = node.get("from_table") or {}
+        if (table.get("type") != "BASE_TABLE" or table.get("table_name", "").lower() != "transactions"
+                or table.get("schema_name") or table.get("catalog_name") or table.get("sample")):
+            raise _Unsupported("not a scan of transactions")
+        if node.get("sample") or node.get("qualify"):
+            raise _Unsupported("SAMPLE or QUALIFY")
+        modifiers = {m["type"] for m in node.get("modifiers", [])}
+        if modifiers - _ALLOWED_MODIFIERS:
+            raise _Unsupported(f"modifiers {modifiers - _ALLOWED_MODIFIERS}")
+
+        aliases = {e["alias"].lower() for e in node["select_list"] if e.get("alias")}
+        shadowing = (aliases & self._base_columns) - set(ROLLUP_DIMENSIONS) - {"is_fraud"}
+        if shadowing:
+            raise _Unsupported(f"aliases shadow columns {shadowing}")
+        state = {"columns": set(), "aggregates": Counter(), "aggregated": False}
+        self._walk(node["select_list"], state, aliases=set())
+        self._walk(node.get("where_clause"), state, aliases=set())
+        self._walk(node.get("group_expressions"), state, aliases)
+        self._walk(node.get("having"), state, aliases)
+        self._walk(node.get("modifiers"), state, aliases)
+        # Without aggregation, a rollup row stands for many transactions.
+        if not (state["aggregated"] or node.get("group_expressions") or "DISTINCT_MODIFIER" in modifiers):
+            raise _Unsupported("not an aggregate query")
+        return state["columns"] & set(ROLLUP_DIMENSIONS), state["aggregates"]
+
+    def _walk(self, value: Any, state: dict[str, Any], aliases: set[str]) -> None:
+        if isinstance(value, list):
+            for item in value:
+                self._walk(item, state, aliases)
+            return
+        if not isinstance(value, dict):
+            return
+        if "class" not in value:
+            for item in value.values():
+                self._walk(item, state, aliases)
+            return
+        if value["class"] not in _ALLOWED_EXPRESSIONS:
+            raise _Unsupported(f"{value['class']} expression")
+        if value["class"] == "COLUMN_REF":
+            self._column(value, state, aliases)
+        elif value["class"] == "FUNCTION" and value["function_name"].lower() in self._aggregates:
+            self._aggregate(value, state)
+        elif value["class"] == "FUNCTION" and value["function_name"].lower() not in self._deterministic:
+            raise _Unsupported(f"non-deterministic function {value['function_name']}")
+        else:
+            for key, item in value.items():
+                if key != "class":
+                    self._walk(item, state, aliases)
+
+    def _column(self, ref: dict[str, Any], state: dict[str, Any], aliases: set[str]) -> None:
+        names = ref["column_names"]
+        if len(names) != 1:
+            raise _Unsupported(f"qualified column {'.'.join(names)}")
+        name = names[0].lower()
+        if name in ROLLUP_DIMENSIONS or name == "is_fraud":
+            state["columns"].add(name)
+        elif name not in aliases:
+            raise _Unsupported(f"column {name}")
+
+    def _aggregate(self, fn: dict[str, Any], state: dict[str, Any]) -> None:
+        name = fn["function_name"].lower()
+        children = fn.get("children", [])
+        state["aggregated"] = True
+        if fn.get("order_bys", {}).get("orders"):
+            raise _Unsupported(f"ordered aggregate {name}")
+        if fn.get("filter") is not None:
+            self._walk(fn["filter"], state, aliases=set())
+
+        if name == "count_star" and not children:
+            state["aggregates"][("count_star", "")] += 1
+            return
+        if (len(children) != 1 or children[0]["class"] != "COLUMN_REF"
+                or len(children[0]["column_names"]) != 1):
+            raise _Unsupported(f"aggregate {name} over an expression")
+        column = children[0]["column_names"][0].lower()
+        if (name, column) in _REWRITES and not fn.get("distinct"):
+            state["aggregates"][(name, column)] += 1
+        elif column in ROLLUP_DIMENSIONS + ("is_fraud",) and (
+            name in ("min", "max") or (name == "count" and fn.get("distinct"))
+        ):
+            # Unchanged on a rollup: every group present there has at least one transaction.
+            state["columns"].add(column)
+        else:
+            raise _Unsupported(f"aggregate {name}({column})")
+
+    @staticmethod
+    def _rewrite_text(sql: str, table: str, expected: Counter) -> str | None:
+        """Swap the table and raw-row aggregates, keeping the rest of the text as written.
+
+        Returns None unless exactly the aggregates the parser found were rewritten.
+        """
+        tokens = tokenize_sql(sql)
+        if any(t.kind == "word" and t.text.lower().startswith(ROLLUP_PREFIX) for t in tokens):
+            return None
+        out: list[str] = []
+        done: Counter = Counter()
+        tables = 0
+        last = i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token.kind == "word" and token.text.lower() == "transactions":
+                out += [sql[last:token.start], table]
+                last = token.end
+                tables += 1
+            else:
+                key = RollupRouter._call_key(tokens, i)
+                if key is not None:
+                    end = i + 4
+                    clause = ""
+                    if (end + 1 < len(tokens) and tokens[end].text.lower() == "filter"
+                            and tokens[end + 1].text == "("):
+                        close = RollupRouter._closing_paren(tokens, end + 1)
+                        if close is None:
+                            return None
+                        clause = " " + sql[tokens[end].start:tokens[close].end]
+                        end = close + 1
+                    out += [sql[last:token.start], _REWRITES[key].format(f=clause)]
+                    last = tokens[end - 1].end
+                    done[key] += 1
+                    i = end
+                    continue
+            i += 1
+        out.append(sql[last:])
+        if tables != 1 or done != expected:
+            return None
+        return "".join(out)
+
+    @staticmethod
+    def _call_key(tokens: list[SQLToken], i: int) -> tuple[str, str] | None:
+        """Rewrite key for a ``name ( arg )`` call starting at ``tokens[i]``."""
+        if i + 3 >= len(tokens) or tokens[i].kind != "word":
+            return None
+        if tokens[i + 1].text != "(" or tokens[i + 3].text != ")":
+            return None
+        name, arg = tokens[i].text.lower(), tokens[i + 2]
+        if name == "count" and arg.text == "*":
+            return ("count_star", "")
+        key = (name, arg.text.lower())
+        return key if arg.kind == "word" and key in _REWRITES else None
+
+    @staticmethod
+    def _closing_paren(tokens: list[SQLToken], open_index: int) -> int | None:
+        depth = 0
+        for j in range(open_index, len(tokens)):
+            if tokens[j].text == "(":
+                depth += 1
+            elif tokens[j].text == ")":
+                depth -= 1
+                if depth == 0:
+                    return j
+        return None
@@ -0,0 +1,58 @@
+import re
+from typing import NamedTuple
+
+_TOKEN = re.compile(
+    r"""
+    (?P<string>'(?:[^']|'')*')
+    | (?P<ident>"(?:[^"]|"")*")
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class SQLToken(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+def tokenize_sql(sql: str, significant: bool = True) -> list[SQLToken]:
+    """Lexical tokens of ``sql`` with their offsets; whitespace and comments
+    are dropped unless ``significant`` is False.
+    """
+    tokens = [SQLToken(m.lastgroup, m.group(), m.start(), m.end()) for m in _TOKEN.finditer(sql)]
+    if significant:
+        tokens = [t for t in tokens if t.kind not in ("space", "comment")]
+    return tokens
+
+
+def _normalize_number(literal: str) -> str:
+    """Drop redundant zeros (``0.50`` -> ``0.5``) without changing the literal's type."""
+    if "e" in literal.lower() or "." not in literal:
+        return literal.lstrip("0") or "0"
+    whole, _, frac = literal.partition(".")
+    return f"{whole.lstrip('0') or '0'}.{frac.rstrip('0') or '0'}"
+
+
+def normalize_sql(sql: str) -> str:
+    """Canonical form of a query: comments dropped, whitespace collapsed,
+    unquoted words lowercased and numeric literals reformatted.
+
+    String literals and quoted identifiers are kept verbatim, so two queries
+    share a form only if DuckDB would read them the same way.
+    """
+    normalized = []
+    for token in tokenize_sql(sql.strip().rstrip(";")):
+        if token.kind == "word":
+            normalized.append(token.text.lower())
+        elif token.kind == "number":
+            normalized.append(_normalize_number(token.text))
+        else:
+            normalized.append(token.text)
+    return " ".join(normalized)
@@ -10,7 +10,7 @@ import faiss
 import numpy as np
 from openai import OpenAI
 
-from src.core.config import EMBEDDING_MODEL, CHUNKING_MODE
+from src.core.config import EMBEDDING_DIM, CHUNKING_MODE
 from src.data.strategies import chunk_pages
 from src.data.pdf_helpers import extract_pdf_pages, embed_texts, coerce_metadata
 from src.models.chunks import ChunkMetadata, SearchResult
@@ -23,8 +23,6 @@ PROCESSED_DIR = DATA_DIR / "processed"
 FAISS_INDEX_PATH = PROCESSED_DIR / "faiss_index.bin"
 CHUNKS_PATH = PROCESSED_DIR / "chunks.pkl"
 
-EMBEDDING_DIM = 1536
-
 PDF_SOURCES = {
     "Bhatla.pdf": "bhatla",
     "EBA_ECB_2024_Report.pdf": "eba_ecb_2024",
@@ -105,8 +103,17 @@ class VectorStore:
         source_filter: str | None = None,
     ) -> list[SearchResult]:
         """Search the vector store for chunks matching the query."""
-        response = client.embeddings.create(model=EMBEDDING_MODEL, input=[query])
-        query_vec = np.array([response.data[0].embedding], dtype=np.float32)
+        query_vec = embed_texts([query], client)
+        return self.search_by_vector(query_vec[0], top_k, source_filter)
+
+    def search_by_vector(
+        self,
+        embedding: list[float],
+        top_k: int = 5,
+        source_filter: str | None = None,
+    ) -> list[SearchResult]:
+        """Search the vector store with a precomputed query embedding."""
+        query_vec = np.array([embedding], dtype=np.float32)
         faiss.normalize_L2(query_vec)
 
         search_k = top_k * 3 if source_filter else top_k
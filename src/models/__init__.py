@@ -1,13 +1,15 @@
 from src.models.source_type import SourceType
-from src.models.agent import AgentDeps, AgentResponse
+from src.models.agent import AgentDeps, AgentResponse, BatchResult
 from src.models.tools import QueryResult, SQLToolResult, RAGToolResult
 from src.models.scoring import QualityScore, ConfidenceContext
 from src.models.chunks import ChunkMetadata, SearchResult
+from src.models.events import StreamEvent
 
 __all__ = [
     "SourceType",
     "AgentDeps",
     "AgentResponse",
+    "BatchResult",
     "QueryResult",
     "SQLToolResult",
     "RAGToolResult",
@@ -15,4 +17,5 @@ __all__ = [
     "ConfidenceContext",
     "ChunkMetadata",
     "SearchResult",
+    "StreamEvent",
 ]
@@ -9,7 +9,10 @@ import faiss
 from openai import OpenAI
 from pydantic import BaseModel, ConfigDict
 
+from src.core.deadline import Deadline
+from src.models.scoring import QualityScore
 from src.models.source_type import SourceType
+from src.models.tools import SQLToolResult
 
 
 class AgentDeps(BaseModel):
@@ -22,6 +25,16 @@ class AgentDeps(BaseModel):
     faiss_index: faiss.IndexFlatIP
     chunks: list[dict[str, Any]]
     tool_outputs: dict[str, Any] = {}
+    # Speculative retrieval tasks keyed by question, consumed by the RAG tool.
+    rag_prefetch: dict[str, Any] = {}
+    # SQL result of a fast path that could not write its answer; the agent's next SQL call reuses it.
+    fast_path_sql: SQLToolResult | None = None
+    # asyncio.Queue of StreamEvents while FraudRouter.run_stream is consuming; None otherwise.
+    events: Any = None
+    # Per-question time budget; the router starts one when none is given.
+    deadline: Deadline | None = None
+    # Correlates the trace spans of one question; the router assigns one when None.
+    request_id: str | None = None
 
 
 class AgentResponse(BaseModel):
@@ -36,3 +49,19 @@ class AgentResponse(BaseModel):
     similarity_scores: list[float] | None = None
     sources: list[dict[str, Any]] | None = None
     error: str | None = None
+    cached: bool = False
+    # Answer cache entry this response was stored in or served from, if any.
+    cache_entry: str | None = None
+    # True when the time budget ran out and only finished stages are included.
+    partial: bool = False
+    quality: QualityScore | None = None
+
+
+class BatchResult(BaseModel):
+    """One answered question from a batch run, with its wall-clock time."""
+
+    index: int
+    question: str
+    response: AgentResponse
+    seconds: float
+    quality: QualityScore | None = None
@@ -0,0 +1,67 @@
+"""Typed events streamed by FraudRouter.run_stream as a question progresses."""
+
+from __future__ import annotations
+
+from typing import Any, Literal, Union
+
+from pydantic import BaseModel
+
+from src.models.agent import AgentResponse
+
+
+class ToolStarted(BaseModel):
+    """A tool (``sql`` or ``rag``) began working on the question."""
+
+    type: Literal["tool_started"] = "tool_started"
+    tool: str
+    question: str
+
+
+class SQLGenerated(BaseModel):
+    """SQL was generated and is about to run."""
+
+    type: Literal["sql_generated"] = "sql_generated"
+    sql: str
+
+
+class SQLRowsReady(BaseModel):
+    """SQL executed; rows are ready to render."""
+
+    type: Literal["sql_rows_ready"] = "sql_rows_ready"
+    sql: str
+    columns: list[str]
+    rows: list[dict[str, Any]]
+    row_count: int
+
+
+class ChunksRetrieved(BaseModel):
+    """Document chunks were retrieved for the question."""
+
+    type: Literal["chunks_retrieved"] = "chunks_retrieved"
+    retrieved_chunks: list[str]
+    sources: list[dict[str, Any]]
+    similarity_scores: list[float]
+
+
+class Token(BaseModel):
+    """A delta of the answer text."""
+
+    type: Literal["token"] = "token"
+    text: str
+
+
+class SynthesisToken(BaseModel):
+    """A delta of the synthesized answer, which supersedes earlier tokens."""
+
+    type: Literal["synthesis_token"] = "synthesis_token"
+    text: str
+
+
+class Done(BaseModel):
+    """The final, authoritative response."""
+
+    type: Literal["done"] = "done"
+    response: AgentResponse
+
+
+StreamEvent = Union[ToolStarted, SQLGenerated, SQLRowsReady, ChunksRetrieved, Token, SynthesisToken, Done]
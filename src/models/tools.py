@@ -11,6 +11,8 @@ class QueryResult(BaseModel):
     rows: list[Any] = []
     row_count: int = 0
     error: str | None = None
+    # True when the query was interrupted for exceeding its time limit.
+    timed_out: bool = False
 
 
 class SQLToolResult(BaseModel):
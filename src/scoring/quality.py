@@ -1,10 +1,15 @@
+import asyncio
 import json
 import logging
 
 import numpy as np
 
 from src.agent.prompts import FAITHFULNESS_PROMPT
-from src.core.llm_client import LLMClient
+from src.core import tracing
+from src.core.config import OPENAI_TIMEOUT
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.llm_client import AsyncLLMClient, LLMClient
+from src.core.rate_limit import Priority
 from src.models.scoring import ConfidenceContext, QualityScore
 from src.models.source_type import SourceType
 from src.scoring.strategies import compute_confidence
@@ -18,8 +23,13 @@ class QualityScorer:
     Weights: 50% faithfulness, 30% relevance, 20% confidence.
     """
 
-    def __init__(self, llm_client: LLMClient) -> None:
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        async_llm_client: AsyncLLMClient | None = None,
+    ) -> None:
         self._llm = llm_client
+        self._allm = async_llm_client
 
     def score(
         self,
@@ -32,12 +42,59 @@ class QualityScorer:
         sql_row_count: int = 0,
     ) -> QualityScore:
         """Compute overall quality score for a chatbot response."""
+        with tracing.span("scoring.faithfulness"):
+            faithfulness, faith_reason = self._score_faithfulness(question, answer, context)
+        with tracing.span("scoring.relevance"):
+            relevance = self._score_relevance(question, answer)
+        return self._combine(
+            faithfulness, faith_reason, relevance,
+            source_type, similarity_scores, sql_success, sql_row_count,
+        )
+
+    async def ascore(
+        self,
+        question: str,
+        answer: str,
+        context: str,
+        source_type: SourceType | str,
+        similarity_scores: list[float] | None = None,
+        sql_success: bool = False,
+        sql_row_count: int = 0,
+        deadline: Deadline | None = None,
+    ) -> QualityScore:
+        """Async variant of score; faithfulness and relevance run concurrently.
+
+        Checks still running at the ``deadline`` fall back to neutral scores.
+        """
+        (faithfulness, faith_reason), relevance = await asyncio.gather(
+            self._traced(
+                "scoring.faithfulness", self._ascore_faithfulness(question, answer, context, deadline),
+            ),
+            self._traced("scoring.relevance", self._ascore_relevance(question, answer, deadline)),
+        )
+        return self._combine(
+            faithfulness, faith_reason, relevance,
+            source_type, similarity_scores, sql_success, sql_row_count,
+        )
+
+    @staticmethod
+    async def _traced(name: str, aw):
+        with tracing.span(name):
+            return await aw
+
+    @staticmethod
+    def _combine(
+        faithfulness: float,
+        faith_reason: str,
+        relevance: float,
+        source_type: SourceType | str,
+        similarity_scores: list[float] | None,
+        sql_success: bool,
+        sql_row_count: int,
+    ) -> QualityScore:
         if isinstance(source_type, str):
             source_type = SourceType(source_type)
 
-        faithfulness, faith_reason = self._score_faithfulness(question, answer, context)
-        relevance = self._score_relevance(question, answer)
-
         confidence = compute_confidence(ConfidenceContext(
             source_type=source_type,
             similarity_scores=similarity_scores,
@@ -69,33 +126,101 @@ class QualityScorer:
             raw = self._llm.chat(
                 [{"role": "user", "content": prompt}],
                 max_tokens=200,
+                priority=Priority.BACKGROUND,
+                operation="faithfulness",
             )
-            if raw.startswith("```"):
-                lines = [line for line in raw.split("\n") if not line.startswith("```")]
-                raw = "\n".join(lines).strip()
+            return self._parse_faithfulness(raw)
+
+        except (json.JSONDecodeError, KeyError, ValueError) as exc:
+            logger.warning("Failed to parse faithfulness score: %s", exc)
+            return 0.5, "Could not evaluate faithfulness"
 
-            result = json.loads(raw)
-            score = max(0.0, min(1.0, float(result.get("score", 0.5))))
-            reason = result.get("reason", "No reason provided")
-            return score, reason
+    async def _ascore_faithfulness(
+        self,
+        question: str,
+        answer: str,
+        context: str,
+        deadline: Deadline | None = None,
+    ) -> tuple[float, str]:
+        """Async variant of _score_faithfulness."""
+        prompt = FAITHFULNESS_PROMPT.format(
+            context=context, question=question, answer=answer,
+        )
+        messages = [{"role": "user", "content": prompt}]
+        try:
+            if self._allm is not None:
+                raw = await self._allm.chat(
+                    messages, max_tokens=200, priority=Priority.BACKGROUND, operation="faithfulness",
+                    deadline=deadline,
+                )
+            else:
+                if deadline is not None:
+                    deadline.check("faithfulness")
+                raw = await asyncio.to_thread(
+                    self._llm.chat, messages, max_tokens=200,
+                    priority=Priority.BACKGROUND, operation="faithfulness",
+                    timeout=deadline.timeout(OPENAI_TIMEOUT) if deadline is not None else None,
+                )
+            return self._parse_faithfulness(raw)
+
+        except DeadlineExceeded as exc:
+            logger.warning("Faithfulness scoring skipped: %s", exc)
+            return 0.5, "Not evaluated: time budget exceeded"
 
         except (json.JSONDecodeError, KeyError, ValueError) as exc:
             logger.warning("Failed to parse faithfulness score: %s", exc)
             return 0.5, "Could not evaluate faithfulness"
 
+    @staticmethod
+    def _parse_faithfulness(raw: str) -> tuple[float, str]:
+        if raw.startswith("```"):
+            lines = [line for line in raw.split("\n") if not line.startswith("```")]
+            raw = "\n".join(lines).strip()
+
+        result = json.loads(raw)
+        score = max(0.0, min(1.0, float(result.get("score", 0.5))))
+        reason = result.get("reason", "No reason provided")
+        return score, reason
+
     def _score_relevance(self, question: str, answer: str) -> float:
         """Cosine similarity between question and answer embeddings."""
         try:
-            vecs = self._llm.embed([question, answer])
-            q_vec = np.array(vecs[0], dtype=np.float32)
-            a_vec = np.array(vecs[1], dtype=np.float32)
+            vecs = self._llm.embed([question, answer], priority=Priority.BACKGROUND)
+            return self._cosine(vecs[0], vecs[1])
 
-            norm = np.linalg.norm(q_vec) * np.linalg.norm(a_vec)
-            if norm == 0:
-                return 0.0
-            similarity = float(np.dot(q_vec, a_vec) / norm)
-            return max(0.0, min(1.0, similarity))
+        except Exception as exc:
+            logger.warning("Relevance scoring failed: %s", exc)
+            return 0.5
+
+    async def _ascore_relevance(
+        self,
+        question: str,
+        answer: str,
+        deadline: Deadline | None = None,
+    ) -> float:
+        """Async variant of _score_relevance."""
+        try:
+            if self._allm is not None:
+                vecs = await self._allm.embed(
+                    [question, answer], priority=Priority.BACKGROUND, deadline=deadline,
+                )
+            else:
+                vecs = await asyncio.to_thread(
+                    self._llm.embed, [question, answer], priority=Priority.BACKGROUND,
+                )
+            return self._cosine(vecs[0], vecs[1])
 
         except Exception as exc:
             logger.warning("Relevance scoring failed: %s", exc)
             return 0.5
+
+    @staticmethod
+    def _cosine(q: list[float], a: list[float]) -> float:
+        q_vec = np.array(q, dtype=np.float32)
+        a_vec = np.array(a, dtype=np.float32)
+
+        norm = np.linalg.norm(q_vec) * np.linalg.norm(a_vec)
+        if norm == 0:
+            return 0.0
+        similarity = float(np.dot(q_vec, a_vec) / norm)
+        return max(0.0, min(1.0, similarity))
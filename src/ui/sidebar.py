@@ -13,7 +13,10 @@ EXAMPLE_QUESTIONS = [
 ]
 
 
-def render_sidebar() -> str | None:
+def render_sidebar(
+    latency_stats: dict[str, dict[str, Any]] | None = None,
+    routing_stats: dict[str, Any] | None = None,
+) -> str | None:
     """Render the sidebar and return selected example question (if any)."""
     selected_question: str | None = None
 
@@ -83,6 +86,30 @@ def render_sidebar() -> str | None:
                 help="Show response tokens as they are generated.",
             )
 
+        if latency_stats:
+            with st.expander("⏱️ Latency", expanded=False):
+                st.dataframe(
+                    [
+                        {
+                            "operation": op,
+                            "calls": stats["count"],
+                            "mean (ms)": stats["mean_ms"],
+                            "p50 (s)": stats["p50_s"],
+                            "p95 (s)": stats["p95_s"],
+                        }
+                        for op, stats in sorted(latency_stats.items())
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
+
+        if routing_stats and routing_stats["questions"]:
+            st.caption(
+                f"⚡ Routed locally: {routing_stats['local_pct']}% of "
+                f"{routing_stats['questions']} questions · "
+                f"~{routing_stats['latency_saved_s']}s saved"
+            )
+
         st.divider()
         st.caption("Built with PydanticAI + OpenAI + DuckDB + FAISS")
 
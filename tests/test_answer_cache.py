@@ -0,0 +1,115 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.answer_cache import AnswerCache, normalize_question
+from src.agent.service import FraudService
+from src.core.config import EMBEDDING_DIM
+from src.models.agent import AgentResponse
+from src.models.scoring import QualityScore
+from src.models.source_type import SourceType
+
+
+def _vector(seed: int, noise: float = 0.0) -> list[float]:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=EMBEDDING_DIM)
+    if noise:
+        base = base + noise * np.random.default_rng(seed + 1000).normal(size=EMBEDDING_DIM)
+    return (base / np.linalg.norm(base)).tolist()
+
+
+def _response(answer: str = "The fraud rate is 0.52%.") -> AgentResponse:
+    return AgentResponse(answer=answer, source_type=SourceType.SQL)
+
+
+def _quality(overall: float) -> QualityScore:
+    return QualityScore(
+        faithfulness=overall, faithfulness_reason="", relevance=overall, confidence=overall, overall=overall,
+    )
+
+
+class _FixedScorer:
+
+    def __init__(self, overall: float) -> None:
+        self.overall = overall
+
+    async def ascore(self, **kwargs) -> QualityScore:
+        return _quality(self.overall)
+
+
+def _service(cache: AnswerCache, overall: float) -> FraudService:
+    service = object.__new__(FraudService)
+    service.answer_cache = cache
+    service.scorer = _FixedScorer(overall)
+    service.validator = SimpleNamespace(validate=lambda **kwargs: (True, ""))
+    return service
+
+
+class TestAnswerCache:
+
+    def test_normalized_exact_hit(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: "g1")
+        cache.put("What is the fraud rate?", None, _response(), "synthesis")
+        hit = cache.get("  what is the FRAUD rate  ", "synthesis")
+        assert hit is not None and hit.cached
+        assert cache.get("What is the fraud rate?", "plain") is None
+
+    def test_semantic_hit_above_threshold(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", threshold=0.9, generation_fn=lambda: "g1")
+        cache.put("What is the fraud rate?", _vector(1), _response(), "synthesis")
+        assert cache.get_similar("What's the rate of fraud?", _vector(1, noise=0.1), "synthesis") is not None
+        assert cache.get_similar("Top merchants by fraud", _vector(2), "synthesis") is None
+
+    def test_numbers_must_match(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", threshold=0.9, generation_fn=lambda: "g1")
+        cache.put("Fraud count in 2019", _vector(1), _response(), "synthesis")
+        assert cache.get_similar("Fraud count in 2020", _vector(1), "synthesis") is None
+
+    def test_generation_change_invalidates(self, tmp_path):
+        generation = {"value": "g1"}
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: generation["value"])
+        cache.put("What is the fraud rate?", _vector(1), _response(), "synthesis")
+        generation["value"] = "g2"
+        assert cache.get("What is the fraud rate?", "synthesis") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_errors_are_not_cached(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: "g1")
+        cache.put("Broken?", None, AgentResponse(answer="x", error="boom"), "synthesis")
+        assert cache.get("Broken?", "synthesis") is None
+
+    def test_normalize_question(self):
+        assert normalize_question("  How   many frauds?? ") == "how many frauds"
+
+
+class TestAttachQuality:
+
+    def test_quality_is_stored_on_the_scored_entry(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: "g1")
+        entry = cache.put("What is the fraud rate?", None, _response(), "synthesis")
+        cache.attach_quality(entry, _quality(0.9))
+        hit = cache.get("What is the fraud rate?", "synthesis")
+        assert hit.cache_entry == entry
+        assert hit.quality.overall == 0.9
+
+    def test_replaced_entry_keeps_its_own_quality(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: "g1")
+        stale = cache.put("What is the fraud rate?", None, _response("old"), "synthesis")
+        cache.put("What is the fraud rate?", None, _response("new"), "synthesis")
+        cache.attach_quality(stale, _quality(0.1))
+        assert cache.get("What is the fraud rate?", "synthesis").quality is None
+
+    def test_uncached_follow_up_does_not_overwrite_cached_quality(self, tmp_path):
+        cache = AnswerCache(tmp_path / "answers.sqlite", generation_fn=lambda: "g1")
+        first = _response()
+        first.cache_entry = cache.put("What is the fraud rate?", None, first, "synthesis")
+        asyncio.run(_service(cache, 0.9).score("What is the fraud rate?", first))
+
+        follow_up = _response("The fraud rate for those merchants is 2.1%.")
+        asyncio.run(_service(cache, 0.2).score("What is the fraud rate?", follow_up))
+        assert cache.get("What is the fraud rate?", "synthesis").quality.overall == 0.9
@@ -0,0 +1,95 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.batching import EmbeddingBatcher
+from src.core.llm_client import LLMClient
+from src.core.rate_limit import Priority, RateLimiter
+
+
+class TestEmbeddingBatcher:
+
+    def test_concurrent_requests_share_a_batch(self):
+        calls: list[list[str]] = []
+
+        def fetch(texts, model):
+            calls.append(list(texts))
+            return [[float(len(t))] for t in texts]
+
+        batcher = EmbeddingBatcher(fetch, window_ms=100, max_batch=16)
+        results: dict[str, list] = {}
+        threads = [
+            threading.Thread(target=lambda q=q: results.update({q: batcher.embed([q], "m")[0]}))
+            for q in ["a", "bb", "ccc", "bb"]
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {"a": [1.0], "bb": [2.0], "ccc": [3.0]}
+        assert len(calls) == 1
+        assert sorted(calls[0]) == ["a", "bb", "ccc"]
+        assert batcher.stats()["requests"] == 4
+
+    def test_max_batch_splits_requests(self):
+        calls: list[list[str]] = []
+
+        def fetch(texts, model):
+            calls.append(list(texts))
+            return [[0.0] for _ in texts]
+
+        batcher = EmbeddingBatcher(fetch, window_ms=50, max_batch=2)
+        batcher.embed(["a", "b", "c", "d", "e"], "m")
+        assert all(len(c) <= 2 for c in calls)
+
+    def test_errors_reach_every_caller(self):
+        def fetch(texts, model):
+            raise RuntimeError("rate limited")
+
+        batcher = EmbeddingBatcher(fetch, window_ms=1)
+        with pytest.raises(RuntimeError):
+            batcher.embed(["a"], "m")
+
+    def test_short_batch_fails_every_caller(self):
+        def fetch(texts, model):
+            return [[0.0] for _ in texts[:-1]]
+
+        batcher = EmbeddingBatcher(fetch, window_ms=50)
+        futures = [batcher.submit(text, "m") for text in ("a", "b", "c")]
+        for fut in futures:
+            with pytest.raises(ValueError):
+                fut.result(timeout=5)
+
+
+class TestBatchedEmbeddingPriority:
+
+    def test_scoring_embed_waits_behind_interactive(self):
+        limiter = RateLimiter(rpm=600, tpm=1_000_000, background_reserve=0.0)
+        order: list[str] = []
+
+        def create(model, input, timeout):
+            order.extend(input)
+            return SimpleNamespace(data=[SimpleNamespace(embedding=[0.0]) for _ in input], usage=None)
+
+        client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        upstream = LLMClient(client, rate_limiter=limiter)
+        batcher = EmbeddingBatcher(lambda texts, model: upstream.embed(texts, model=model), window_ms=1)
+        llm = LLMClient(client, batcher=batcher, rate_limiter=limiter)
+        for _ in range(600):
+            limiter.acquire(1)
+
+        scoring = threading.Thread(target=lambda: llm.embed(["answer relevance"], priority=Priority.BACKGROUND))
+        scoring.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=lambda: llm.embed(["user question"]))
+        interactive.start()
+        scoring.join(timeout=5)
+        interactive.join(timeout=5)
+        assert order == ["user question", "answer relevance"]
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.cache import ResponseCache, chat_cache_key
+
+
+class TestChatCacheKey:
+
+    def test_key_is_stable(self):
+        messages = [{"role": "user", "content": "What is the fraud rate?"}]
+        assert chat_cache_key("gpt-4o-mini", messages, 0.0, 500) == chat_cache_key(
+            "gpt-4o-mini", list(messages), 0.0, 500,
+        )
+
+    def test_key_depends_on_parameters(self):
+        messages = [{"role": "user", "content": "What is the fraud rate?"}]
+        base = chat_cache_key("gpt-4o-mini", messages, 0.0, 500)
+        assert base != chat_cache_key("gpt-4o", messages, 0.0, 500)
+        assert base != chat_cache_key("gpt-4o-mini", messages, 0.1, 500)
+        assert base != chat_cache_key("gpt-4o-mini", messages, 0.0, 200)
+
+
+class TestResponseCache:
+
+    def test_hit_and_miss_counters(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite")
+        assert cache.get("k") is None
+        cache.put("k", "SELECT 1")
+        assert cache.get("k") == "SELECT 1"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_survives_reopen(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        ResponseCache(path).put("k", "cached answer")
+        assert ResponseCache(path).get("k") == "cached answer"
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", ttl_seconds=-1)
+        cache.put("k", "value")
+        assert cache.get("k") is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=10)
+        cache.put("a", "12345")
+        cache.put("b", "12345")
+        cache.get("a")
+        cache.put("c", "12345")
+        assert cache.get("b") is None
+        assert cache.get("a") == "12345"
+        assert cache.get("c") == "12345"
+        assert cache.stats()["evictions"] == 1
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.cassette import Cassette, CassetteMissError, CassetteTransport, request_key
+
+
+def _upstream(calls: list[int]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(200, json={"answer": len(calls)})
+    return httpx.MockTransport(handler)
+
+
+class TestRequestKey:
+
+    def test_ignores_host_and_json_key_order(self):
+        a = httpx.Request("POST", "https://api.openai.com/v1/chat/completions", content=b'{"a":1,"b":2}')
+        b = httpx.Request("POST", "http://127.0.0.1:8765/v1/chat/completions", content=b'{"b": 2, "a": 1}')
+        assert request_key(a) == request_key(b)
+
+
+class TestCassette:
+
+    def test_record_then_replay(self, tmp_path):
+        path = tmp_path / "cassette.jsonl.gz"
+        calls: list[int] = []
+        recorder = httpx.Client(transport=CassetteTransport(Cassette(path, "record"), _upstream(calls)))
+        first = recorder.post("https://api.test/v1/embeddings", json={"input": ["a"]}).json()
+        second = recorder.post("https://api.test/v1/embeddings", json={"input": ["a"]}).json()
+
+        replayer = httpx.Client(
+            transport=CassetteTransport(Cassette(path, "replay", latency="zero"), _upstream(calls)),
+        )
+        assert replayer.post("https://other/v1/embeddings", json={"input": ["a"]}).json() == first
+        assert replayer.post("https://other/v1/embeddings", json={"input": ["a"]}).json() == second
+        # Exhausted entries repeat the last recording; upstream is never hit.
+        assert replayer.post("https://other/v1/embeddings", json={"input": ["a"]}).json() == second
+        assert len(calls) == 2
+
+    def test_replay_miss_raises(self, tmp_path):
+        path = tmp_path / "cassette.jsonl.gz"
+        httpx.Client(transport=CassetteTransport(Cassette(path, "record"), _upstream([]))).post(
+            "https://api.test/v1/embeddings", json={"input": ["a"]},
+        )
+        replayer = httpx.Client(transport=CassetteTransport(Cassette(path, "replay", latency="zero")))
+        with pytest.raises(CassetteMissError):
+            replayer.post("https://api.test/v1/embeddings", json={"input": ["b"]})
@@ -0,0 +1,110 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data import database
+from src.data.database import CursorPool, FraudDatabase
+
+CROSS_JOIN = "SELECT COUNT(*) FROM range(100000000) a, range(100000000) b WHERE a.range + b.range = 7"
+
+
+@pytest.fixture
+def db():
+    con = duckdb.connect()
+    con.execute("CREATE TABLE transactions AS SELECT range AS id, range % 2 AS is_fraud FROM range(1000)")
+    return FraudDatabase(con, rollup_routing=False, pool_size=4)
+
+
+class TestCursorPool:
+
+    def test_cursors_are_reused(self):
+        pool = CursorPool(duckdb.connect(), size=2)
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            assert second is first
+        assert pool.created == 1
+
+    def test_lease_waits_for_a_free_cursor(self):
+        pool = CursorPool(duckdb.connect(), size=1)
+        acquired = threading.Event()
+
+        def borrow():
+            with pool.lease():
+                acquired.set()
+
+        with pool.lease():
+            worker = threading.Thread(target=borrow)
+            worker.start()
+            assert not acquired.wait(0.2)
+        worker.join(5)
+        assert acquired.is_set()
+        assert pool.created == 1
+
+    def test_cursor_is_returned_after_an_error(self):
+        pool = CursorPool(duckdb.connect(), size=1)
+        with pytest.raises(duckdb.Error):
+            with pool.lease() as cursor:
+                cursor.execute("SELECT * FROM missing_table")
+        with pool.lease() as cursor:
+            assert cursor.execute("SELECT 1").fetchone() == (1,)
+
+    def test_rejects_empty_pool(self):
+        with pytest.raises(ValueError):
+            CursorPool(duckdb.connect(), size=0)
+
+
+class TestConcurrentQueries:
+
+    def test_queries_from_many_threads_all_succeed(self, db):
+        results = []
+
+        def query(i: int):
+            results.append(db.execute_query(f"SELECT COUNT(*) FROM transactions WHERE id >= {i}"))
+
+        workers = [threading.Thread(target=query, args=(i,)) for i in range(16)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(10)
+        assert len(results) == 16
+        assert all(result.success for result in results)
+        assert sorted(result.rows[0][0] for result in results) == list(range(985, 1001))
+        assert db.cursors.created <= db.cursors.size
+
+    def test_timeout_interrupts_only_its_own_query(self, db):
+        slow = {}
+        worker = threading.Thread(target=lambda: slow.update(result=db.execute_query(CROSS_JOIN, timeout=1.5)))
+        worker.start()
+        time.sleep(0.2)
+        start = time.monotonic()
+        fast = db.execute_query("SELECT SUM(is_fraud) FROM transactions")
+        assert time.monotonic() - start < 1.0
+        assert fast.success and fast.rows == [(500,)]
+        worker.join(10)
+        assert slow["result"].timed_out
+
+
+class TestDuckDBConfig:
+
+    def test_defaults_leave_duckdb_settings_alone(self, monkeypatch):
+        monkeypatch.setattr(database, "DUCKDB_THREADS", 0)
+        monkeypatch.setattr(database, "DUCKDB_MEMORY_LIMIT", "")
+        assert database.duckdb_config() == {}
+
+    def test_threads_and_memory_limit_are_applied(self, monkeypatch):
+        monkeypatch.setattr(database, "DUCKDB_THREADS", 2)
+        monkeypatch.setattr(database, "DUCKDB_MEMORY_LIMIT", "512MB")
+        con = duckdb.connect(config=database.duckdb_config())
+        cursor = con.cursor()
+        assert cursor.execute("SELECT current_setting('threads')").fetchone() == (2,)
+        reference = duckdb.connect()
+        reference.execute("SET memory_limit = '512MB'")
+        expected = reference.execute("SELECT current_setting('memory_limit')").fetchone()
+        assert cursor.execute("SELECT current_setting('memory_limit')").fetchone() == expected
@@ -0,0 +1,78 @@
+import asyncio
+import math
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.deadline import Deadline, DeadlineExceeded
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeadline:
+
+    def test_remaining_shrinks_with_time(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        clock.now += 4
+        assert deadline.remaining() == pytest.approx(6)
+        assert not deadline.expired
+        clock.now += 7
+        assert deadline.remaining() == 0.0
+        assert deadline.expired
+
+    def test_timeout_is_capped_by_remaining_budget(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+        assert deadline.timeout(30) == pytest.approx(10)
+        assert deadline.timeout(5) == pytest.approx(5)
+        clock.now += 20
+        assert deadline.timeout(30) == pytest.approx(0.001)
+
+    def test_check_raises_once_expired(self):
+        clock = FakeClock()
+        deadline = Deadline(1, clock=clock)
+        deadline.check("sql_generation")
+        clock.now += 2
+        with pytest.raises(DeadlineExceeded, match="sql_generation"):
+            deadline.check("sql_generation")
+
+    def test_zero_or_none_is_unbounded(self):
+        for seconds in (0, None):
+            deadline = Deadline(seconds)
+            assert math.isinf(deadline.remaining())
+            assert deadline.timeout(30) == 30
+            deadline.check("anything")
+
+    def test_wait_for_cancels_slow_work(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def scenario():
+            with pytest.raises(DeadlineExceeded, match="synthesis"):
+                await Deadline(0.05).wait_for(slow(), "synthesis")
+            assert cancelled.is_set()
+
+        asyncio.run(scenario())
+
+    def test_wait_for_returns_fast_results(self):
+        async def fast():
+            return "done"
+
+        assert asyncio.run(Deadline(5).wait_for(fast(), "rag_answer")) == "done"
@@ -0,0 +1,77 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import embedding_cache
+from src.core.embedding_cache import EmbeddingCache
+
+
+def _write_vectors(directory: str, worker: int, count: int) -> None:
+    cache = EmbeddingCache(directory, dim=2, memory_size=1)
+    for i in range(count):
+        cache.put(f"worker {worker} text {i}", "m", [float(worker), float(i)])
+
+
+class TestEmbeddingCache:
+
+    def test_miss_then_memory_hit(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, dim=4)
+        assert cache.get("fraud", "m") is None
+        cache.put("fraud", "m", [0.1, 0.2, 0.3, 0.4])
+        np.testing.assert_allclose(cache.get("fraud", "m"), [0.1, 0.2, 0.3, 0.4], rtol=1e-6)
+        assert cache.stats()["memory_hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_disk_tier_survives_reopen(self, tmp_path):
+        EmbeddingCache(tmp_path, dim=4).put("fraud", "m", [1.0, 0.0, 0.0, 0.0])
+        reopened = EmbeddingCache(tmp_path, dim=4)
+        np.testing.assert_allclose(reopened.get("fraud", "m"), [1.0, 0.0, 0.0, 0.0])
+        assert reopened.stats()["disk_hits"] == 1
+
+    def test_model_is_part_of_key(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, dim=4)
+        cache.put("fraud", "model-a", [1.0, 0.0, 0.0, 0.0])
+        assert cache.get("fraud", "model-b") is None
+
+    def test_grows_past_initial_capacity(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, dim=2, memory_size=1)
+        for i in range(1100):
+            cache.put(f"text {i}", "m", [float(i), 0.0])
+        np.testing.assert_allclose(cache.get("text 3", "m"), [3.0, 0.0])
+        np.testing.assert_allclose(cache.get("text 1099", "m"), [1099.0, 0.0])
+
+    def test_lookup_reports_missing_indices(self, tmp_path):
+        cache = EmbeddingCache(tmp_path, dim=2)
+        cache.put("a", "m", [1.0, 0.0])
+        vectors, missing = cache.lookup(["a", "b", "c"], "m")
+        assert vectors[0] is not None
+        assert missing == [1, 2]
+
+    def test_sees_vectors_written_by_another_instance(self, tmp_path):
+        reader = EmbeddingCache(tmp_path, dim=2)
+        writer = EmbeddingCache(tmp_path, dim=2)
+        for i in range(1100):
+            writer.put(f"text {i}", "m", [float(i), 1.0])
+        np.testing.assert_allclose(reader.get("text 1099", "m"), [1099.0, 1.0])
+        reader.put("reader text", "m", [5.0, 5.0])
+        np.testing.assert_allclose(EmbeddingCache(tmp_path, dim=2).get("reader text", "m"), [5.0, 5.0])
+
+    @pytest.mark.skipif(embedding_cache.fcntl is None, reason="cross-process locking needs fcntl")
+    def test_concurrent_processes_never_share_a_row(self, tmp_path):
+        ctx = multiprocessing.get_context("spawn")
+        workers = [ctx.Process(target=_write_vectors, args=(str(tmp_path), w, 300)) for w in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+        cache = EmbeddingCache(tmp_path, dim=2)
+        assert cache.stats()["disk_entries"] == 900
+        for w in range(3):
+            for i in (0, 150, 299):
+                np.testing.assert_allclose(cache.get(f"worker {w} text {i}", "m"), [float(w), float(i)])
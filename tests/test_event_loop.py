@@ -0,0 +1,62 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.event_loop import BackgroundLoop
+
+
+@pytest.fixture
+def background():
+    loop = BackgroundLoop(name="test-loop")
+    yield loop
+    loop.stop()
+
+
+class TestBackgroundLoop:
+
+    def test_run_uses_the_same_loop_every_time(self, background):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert background.run(current_loop()) is background.run(current_loop())
+        assert background.run(current_loop()) is background.loop
+
+    def test_iterate_streams_items_in_order(self, background):
+        async def numbers():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+
+        assert list(background.iterate(numbers())) == [0, 1, 2, 3, 4]
+
+    def test_iterate_propagates_errors(self, background):
+        async def failing():
+            yield 1
+            raise ValueError("boom")
+
+        items = []
+        with pytest.raises(ValueError):
+            for item in background.iterate(failing()):
+                items.append(item)
+        assert items == [1]
+
+    def test_closing_iterator_early_cancels_producer(self, background):
+        cancelled = threading.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield 1
+                    await asyncio.sleep(0.01)
+            finally:
+                cancelled.set()
+
+        iterator = background.iterate(endless())
+        assert next(iterator) == 1
+        iterator.close()
+        assert cancelled.wait(timeout=2)
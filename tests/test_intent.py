@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.intent import IntentClassifier, looks_borderline
+
+
+class TestIntentClassifier:
+
+    def test_routes_confident_questions_locally(self, tmp_path):
+        classifier = IntentClassifier(log_path=tmp_path / "routing.jsonl")
+        assert classifier.predict("What is the fraud rate by hour of day?").route == "sql"
+        assert classifier.predict("What are the primary methods by which credit card fraud is committed?").route == "rag"
+        assert classifier.predict("How does the fraud rate in the dataset compare with the EBA report?").route == "both"
+
+    def test_defers_without_evidence(self, tmp_path):
+        classifier = IntentClassifier(log_path=tmp_path / "routing.jsonl")
+        assert classifier.predict("Tell me a joke").route is None
+        assert classifier.stats()["deferred"] == 1
+
+    def test_logged_decisions_are_reloaded(self, tmp_path):
+        path = tmp_path / "routing.jsonl"
+        question = "Explain the chargeback workflow for disputed payments"
+        classifier = IntentClassifier(log_path=path)
+        for _ in range(5):
+            classifier.log_decision(question, "rag")
+        assert IntentClassifier(log_path=path).predict(question).route == "rag"
+
+    def test_stats_report_local_share(self, tmp_path):
+        classifier = IntentClassifier(log_path=tmp_path / "routing.jsonl")
+        classifier.predict("What is the fraud rate by state?")
+        classifier.predict("Tell me a joke")
+        classifier.record_local("sql", 1.5)
+        stats = classifier.stats()
+        assert stats["local_pct"] == 50.0
+        assert stats["latency_saved_s"] == 1.5
+
+
+class TestLooksBorderline:
+
+    def test_document_and_out_of_range_questions(self):
+        assert looks_borderline("What share of card fraud in H1 2023 was cross-border?")
+        assert looks_borderline("How many fraud cases were there in 2023?")
+        assert not looks_borderline("How many fraud cases were there in 2020?")
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.prompt_builder import PromptBuilder
+from src.agent.prompts import SQL_FEW_SHOT_HEADER, format_sql_few_shot, format_sql_few_shot_examples
+
+
+class TestPromptBuilder:
+
+    def test_everything_fits_unchanged(self):
+        builder = PromptBuilder(budget=1000)
+        builder.add("instructions", "Answer in SQL.", required=True)
+        builder.add("stats", "- rows: 10\n- frauds: 1")
+        assert builder.build() == "Answer in SQL.\n- rows: 10\n- frauds: 1"
+        report = builder.report()
+        assert report["stats"]["items"] == report["stats"]["total_items"] == 2
+
+    def test_lower_priority_section_dropped_first(self):
+        long_text = "\n".join(f"row {i} " + "x " * 20 for i in range(50))
+        builder = PromptBuilder(budget=120)
+        builder.add("instructions", "Answer in SQL.", required=True)
+        builder.add("stats", "- rows: 10", priority=0)
+        builder.add("samples", long_text, priority=2)
+        assert builder.section("stats") == "- rows: 10"
+        samples = builder.section("samples")
+        assert samples.startswith("row 0")
+        assert len(samples) < len(long_text)
+        assert builder.total_tokens() <= 120
+
+    def test_items_pack_in_order(self):
+        builder = PromptBuilder(budget=30)
+        builder.add_items("chunks", ["alpha " * 5, "beta " * 5, "gamma " * 50], separator="\n\n")
+        packed = builder.section("chunks")
+        assert "alpha" in packed and "beta" in packed and "gamma" not in packed
+        assert builder.report()["chunks"]["items"] == 2
+
+    def test_few_shot_items_match_joined_format(self):
+        items = format_sql_few_shot_examples()
+        builder = PromptBuilder(budget=100_000)
+        builder.add_items("few_shot", items, header=SQL_FEW_SHOT_HEADER)
+        assert builder.section("few_shot") == format_sql_few_shot()
@@ -0,0 +1,45 @@
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.prompts import SQL_TIMEOUT_HINT
+from src.agent.sql_tool import SQLTool
+from src.data.database import FraudDatabase
+from src.models.tools import QueryResult
+
+CROSS_JOIN = "SELECT COUNT(*) FROM range(100000000) a, range(100000000) b WHERE a.range + b.range = 7"
+
+
+class TestQueryWatchdog:
+
+    def test_runaway_query_is_interrupted(self):
+        db = FraudDatabase(duckdb.connect(), rollup_routing=False)
+        start = time.monotonic()
+        result = db.execute_query(CROSS_JOIN, timeout=0.2)
+        assert time.monotonic() - start < 5
+        assert not result.success
+        assert result.timed_out
+        assert "0.2s time limit" in result.error
+
+    def test_connection_is_usable_after_an_interrupt(self):
+        db = FraudDatabase(duckdb.connect(), rollup_routing=False)
+        db.execute_query(CROSS_JOIN, timeout=0.2)
+        result = db.execute_query("SELECT 42 AS answer")
+        assert result.success and result.rows == [(42,)]
+        assert not result.timed_out
+
+    def test_errors_are_not_reported_as_timeouts(self):
+        db = FraudDatabase(duckdb.connect(), rollup_routing=False)
+        result = db.execute_query("SELECT * FROM missing_table", timeout=5)
+        assert not result.success
+        assert not result.timed_out
+
+    def test_timeout_feeds_the_correction_prompt(self):
+        timed_out = QueryResult(success=False, error="Query interrupted", timed_out=True)
+        assert SQL_TIMEOUT_HINT in SQLTool._correction_prompt("SELECT 1", timed_out)
+        failed = QueryResult(success=False, error="Binder Error")
+        assert SQL_TIMEOUT_HINT not in SQLTool._correction_prompt("SELECT 1", failed)
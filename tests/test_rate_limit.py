@@ -0,0 +1,57 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.rate_limit import Priority, RateLimiter
+
+
+class TestRateLimiter:
+
+    def test_admits_within_capacity_without_waiting(self):
+        limiter = RateLimiter(rpm=600, tpm=100_000, background_reserve=0.0)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire(100)
+        assert time.monotonic() - start < 0.1
+        assert limiter.stats()["admitted"] == 5
+
+    def test_waits_for_refill_when_exhausted(self):
+        # 600 rpm refills one request every 0.1s.
+        limiter = RateLimiter(rpm=600, tpm=1_000_000, background_reserve=0.0)
+        for _ in range(600):
+            limiter.acquire(1)
+        start = time.monotonic()
+        limiter.acquire(1)
+        assert time.monotonic() - start >= 0.05
+
+    def test_background_respects_reserve(self):
+        limiter = RateLimiter(rpm=600, tpm=1_000_000, background_reserve=0.5)
+        for _ in range(300):
+            limiter.acquire(1)
+        start = time.monotonic()
+        limiter.acquire(1)
+        assert time.monotonic() - start < 0.05
+        start = time.monotonic()
+        limiter.acquire(1, Priority.BACKGROUND)
+        assert time.monotonic() - start >= 0.05
+
+    def test_interactive_admitted_before_waiting_background(self):
+        limiter = RateLimiter(rpm=600, tpm=1_000_000, background_reserve=0.0)
+        for _ in range(600):
+            limiter.acquire(1)
+        order: list[str] = []
+        background = threading.Thread(
+            target=lambda: (limiter.acquire(1, Priority.BACKGROUND), order.append("background")),
+        )
+        background.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(
+            target=lambda: (limiter.acquire(1, Priority.INTERACTIVE), order.append("interactive")),
+        )
+        interactive.start()
+        background.join(timeout=5)
+        interactive.join(timeout=5)
+        assert order == ["interactive", "background"]
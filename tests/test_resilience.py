@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from openai import APIConnectionError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import llm_client
+from src.core.llm_client import AsyncLLMClient, LLMClient
+from src.core.resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyHistogram, hedged_call,
+)
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+        breaker.before_call()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_probe_closes_on_success(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_probe_ending_in_a_bad_request_is_released(self, monkeypatch):
+        monkeypatch.setattr(llm_client, "MAX_API_RETRIES", 0)
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        client = LLMClient(client=None, circuit_breaker=breaker)
+
+        def bad_request():
+            raise ValueError("400 Bad Request")
+
+        with pytest.raises(ValueError):
+            client._retry("chat", bad_request)
+        assert client._retry("chat", lambda: "ok") == "ok"
+        assert breaker.state == "closed"
+
+    def test_cancelled_probe_is_released(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        client = AsyncLLMClient(client=None, circuit_breaker=breaker)
+
+        async def hang():
+            await asyncio.sleep(60)
+
+        async def ok():
+            return "ok"
+
+        async def scenario():
+            probe = asyncio.create_task(client._retry("chat", hang))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            return await client._retry("chat", ok)
+
+        assert asyncio.run(scenario()) == "ok"
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens_the_circuit(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        breaker.record_failure()
+        breaker._opened_at -= 60
+        with pytest.raises(APIConnectionError):
+            with breaker.guard():
+                raise APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+        assert breaker.state == "open"
+
+
+class TestLatencyHistogram:
+
+    def test_quantiles_use_bucket_upper_bounds(self):
+        hist = LatencyHistogram()
+        for _ in range(95):
+            hist.record(0.08)
+        for _ in range(5):
+            hist.record(2.5)
+        assert hist.quantile(0.5) == 0.1
+        assert hist.quantile(0.99) == 3.0
+
+
+class TestHedgedCall:
+
+    def test_slow_primary_is_hedged(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return "slow"
+            return "fast"
+
+        assert hedged_call(fn, delay=0.05) == "fast"
+        assert len(calls) == 2
+
+    def test_fast_primary_is_not_hedged(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return "ok"
+
+        assert hedged_call(fn, delay=1.0) == "ok"
+        assert len(calls) == 1
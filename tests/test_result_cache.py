@@ -0,0 +1,72 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.result_cache import SQLResultCache
+from src.data.sql_text import normalize_sql
+from src.models.tools import QueryResult
+
+
+def _result(*rows) -> QueryResult:
+    return QueryResult(success=True, columns=["category", "n"], rows=list(rows), row_count=len(rows))
+
+
+class TestNormalizeSQL:
+
+    def test_whitespace_case_and_comments_are_ignored(self):
+        a = "SELECT category, COUNT(*) AS n\nFROM transactions  -- per category\nGROUP BY category;"
+        b = "select category,count( * ) as n from TRANSACTIONS group by CATEGORY"
+        assert normalize_sql(a) == normalize_sql(b)
+
+    def test_numeric_literals_are_canonical(self):
+        assert normalize_sql("SELECT * FROM t WHERE amt > 100.50") == normalize_sql(
+            "SELECT * FROM t WHERE amt > 100.5",
+        )
+        assert normalize_sql("SELECT 1.0") != normalize_sql("SELECT 1")
+
+    def test_string_literals_keep_their_case(self):
+        assert normalize_sql("SELECT * FROM t WHERE state = 'CA'") != normalize_sql(
+            "SELECT * FROM t WHERE state = 'ca'",
+        )
+        assert "'Fraud -- rate'" in normalize_sql("SELECT 'Fraud -- rate'")
+
+
+class TestSQLResultCache:
+
+    def test_hit_for_equivalent_sql(self, tmp_path):
+        cache = SQLResultCache(tmp_path / "results.sqlite", generation_fn=lambda: "g1")
+        assert cache.get("SELECT 1") is None
+        cache.put("SELECT category, COUNT(*) FROM t GROUP BY 1", _result(("gas", 3)))
+        hit = cache.get("select category, count(*)  from t group by 1")
+        assert hit.rows == [("gas", 3)]
+        assert cache.stats()["memory_hits"] == 1
+
+    def test_failures_are_not_cached(self, tmp_path):
+        cache = SQLResultCache(None, generation_fn=lambda: "g1")
+        cache.put("SELECT x", QueryResult(success=False, error="boom"))
+        assert cache.get("SELECT x") is None
+
+    def test_disk_tier_survives_reopen_with_types(self, tmp_path):
+        path = tmp_path / "results.sqlite"
+        SQLResultCache(path, generation_fn=lambda: "g1").put("SELECT d", _result((date(2019, 1, 1), 2)))
+        reopened = SQLResultCache(path, memory_size=1, generation_fn=lambda: "g1")
+        assert reopened.get("SELECT d").rows == [(date(2019, 1, 1), 2)]
+        assert reopened.stats()["disk_hits"] == 1
+
+    def test_new_generation_drops_both_tiers(self, tmp_path):
+        generation = ["g1"]
+        path = tmp_path / "results.sqlite"
+        cache = SQLResultCache(path, generation_fn=lambda: generation[0])
+        cache.put("SELECT 1", _result(("gas", 1)))
+        generation[0] = "g2"
+        assert cache.get("SELECT 1") is None
+        assert SQLResultCache(path, generation_fn=lambda: "g2").stats()["disk_entries"] == 0
+
+    def test_memory_tier_is_bounded(self):
+        cache = SQLResultCache(None, memory_size=2, generation_fn=lambda: "g1")
+        for i in range(3):
+            cache.put(f"SELECT {i}", _result(("gas", i)))
+        assert cache.get("SELECT 0") is None
+        assert cache.get("SELECT 2").rows == [("gas", 2)]
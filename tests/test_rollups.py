@@ -0,0 +1,118 @@
+import math
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.database import FraudDatabase
+from src.data.rollups import RollupRouter, build_rollups
+
+
+@pytest.fixture(scope="module")
+def con():
+    con = duckdb.connect()
+    con.execute(
+        "CREATE TABLE transactions AS SELECT "
+        "TIMESTAMP '2019-01-01' + INTERVAL (i * 37) MINUTE AS trans_date_trans_time, "
+        "['gas_transport', 'grocery_pos', 'shopping_net', 'misc_net'][1 + i % 4] AS category, "
+        "'fraud_merchant_' || (i % 23) AS merchant, "
+        "ROUND(1 + (i * 7919) % 50000 / 100.0, 2) AS amt, "
+        "['M', 'F'][1 + i % 2] AS gender, "
+        "['CA', 'NY', 'TX'][1 + i % 3] AS state, "
+        "'t' || i AS trans_num, "
+        "(i % 97 = 0 OR i % 89 = 0)::INTEGER AS is_fraud, "
+        "strftime(TIMESTAMP '2019-01-01' + INTERVAL (i * 37) MINUTE, '%Y-%m') AS transaction_month, "
+        "EXTRACT(HOUR FROM TIMESTAMP '2019-01-01' + INTERVAL (i * 37) MINUTE) AS transaction_hour "
+        "FROM range(30000) t(i)"
+    )
+    build_rollups(con)
+    return con
+
+
+@pytest.fixture(scope="module")
+def router(con):
+    return RollupRouter(con)
+
+
+def _same(a: list[tuple], b: list[tuple]) -> bool:
+    if len(a) != len(b):
+        return False
+    for row_a, row_b in zip(a, b):
+        for x, y in zip(row_a, row_b):
+            if isinstance(x, float) or isinstance(y, float):
+                if not (x is None and y is None) and not math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6):
+                    return False
+            elif x != y:
+                return False
+    return True
+
+
+ROUTED = [
+    "SELECT transaction_month AS month, COUNT(*) FILTER (WHERE is_fraud = 1) AS fraud_count, "
+    "COUNT(*) AS total, ROUND(100.0 * COUNT(*) FILTER (WHERE is_fraud = 1) / COUNT(*), 4) AS rate "
+    "FROM transactions GROUP BY transaction_month ORDER BY transaction_month",
+    "SELECT category, ROUND(SUM(amt) FILTER (WHERE is_fraud = 1), 2) AS fraud_total, AVG(amt) AS avg_amt "
+    "FROM transactions GROUP BY category ORDER BY fraud_total DESC",
+    "SELECT ROUND(AVG(amt), 2), MIN(amt), MAX(amt), COUNT(*) FROM transactions WHERE is_fraud = 1",
+    "SELECT merchant, COUNT(*) FILTER (WHERE is_fraud = 1) AS n FROM transactions "
+    "GROUP BY merchant ORDER BY n DESC, merchant LIMIT 10",
+    "SELECT transaction_hour, AVG(is_fraud) AS rate, SUM(is_fraud) AS frauds FROM transactions "
+    "WHERE state IN ('CA', 'TX') GROUP BY transaction_hour HAVING COUNT(*) > 10 ORDER BY 1",
+    "SELECT gender, COUNT(DISTINCT category) FROM transactions GROUP BY gender ORDER BY gender",
+    "SELECT COUNT(*) FROM transactions WHERE state = 'ZZ'",
+    "SELECT DISTINCT state FROM transactions ORDER BY state",
+    "SELECT upper(category) AS cat, COUNT(*) FROM transactions "
+    "WHERE category LIKE 'g%' AND coalesce(state, '') <> 'NY' GROUP BY cat ORDER BY cat",
+]
+
+NOT_ROUTED = [
+    "SELECT category, amt FROM transactions WHERE is_fraud = 1 LIMIT 5",
+    "SELECT category, COUNT(*) FROM transactions WHERE amt > 100 GROUP BY category",
+    "SELECT CAST(trans_date_trans_time AS DATE) AS day, COUNT(*) FROM transactions GROUP BY day",
+    "SELECT category, MEDIAN(amt) FROM transactions GROUP BY category",
+    "SELECT category, COUNT(*), RANK() OVER (ORDER BY COUNT(*) DESC) FROM transactions GROUP BY category",
+    "SELECT COUNT(*) FROM (SELECT * FROM transactions WHERE is_fraud = 1)",
+    "SELECT state, SUM(transaction_hour) FROM transactions GROUP BY state",
+    "SELECT t.category, COUNT(*) FROM transactions t GROUP BY t.category",
+    "SELECT category, COUNT(trans_num) FROM transactions GROUP BY category",
+    "SELECT category, COUNT(*) FROM transactions WHERE random() < 0.5 GROUP BY category",
+    "SELECT state, COUNT(*) FROM transactions GROUP BY state HAVING COUNT(*) > 1000 * random()",
+    "SELECT gen_random_uuid() AS id, COUNT(*) FROM transactions",
+    "SELECT transaction_month, COUNT(*) FROM transactions WHERE transaction_month < strftime(now(), '%Y-%m') "
+    "GROUP BY transaction_month",
+    "SELECT category, COUNT(*) FROM transactions WHERE transaction_month >= strftime(current_date, '%Y-%m') "
+    "GROUP BY category",
+]
+
+
+class TestRollupRouter:
+
+    @pytest.mark.parametrize("sql", ROUTED)
+    def test_rewritten_queries_match_the_base_table(self, con, router, sql):
+        rewritten = router.rewrite(sql)
+        assert rewritten is not None
+        assert "rollup_" in rewritten
+        assert _same(con.execute(rewritten).fetchall(), con.execute(sql).fetchall())
+
+    @pytest.mark.parametrize("sql", NOT_ROUTED)
+    def test_incompatible_queries_are_left_alone(self, router, sql):
+        assert router.rewrite(sql) is None
+
+    def test_smallest_covering_rollup_is_chosen(self, router):
+        assert router.rewrite("SELECT COUNT(*) FROM transactions").endswith("FROM rollup_gender")
+        rewritten = router.rewrite("SELECT state, category, COUNT(*) FROM transactions GROUP BY ALL")
+        assert "rollup_category_state" in rewritten
+
+    def test_database_without_rollups_is_not_routed(self):
+        bare = duckdb.connect()
+        bare.execute("CREATE TABLE transactions AS SELECT 'gas' AS category, 1.0 AS amt, 0 AS is_fraud")
+        assert RollupRouter(bare).rewrite("SELECT COUNT(*) FROM transactions") is None
+
+    def test_execute_query_uses_rollups_unless_disabled(self, con):
+        sql = "SELECT category, COUNT(*) AS n FROM transactions GROUP BY category ORDER BY category"
+        routed = FraudDatabase(con).execute_query(sql)
+        direct = FraudDatabase(con, rollup_routing=False).execute_query(sql)
+        assert routed.success and routed.rows == direct.rows
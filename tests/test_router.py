@@ -0,0 +1,158 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.intent import IntentClassifier
+from openai import AsyncOpenAI
+
+from src.agent.router import FraudRouter, OpenAIChatModel
+from src.core import tracing
+from src.core.llm_client import AsyncLLMClient
+from src.core.deadline import DeadlineExceeded
+from src.core.singleflight import SingleFlight
+from src.models.agent import AgentResponse
+from src.models.events import SQLGenerated, SQLRowsReady, ToolStarted
+from src.models.source_type import SourceType
+from src.models.tools import SQLToolResult
+
+
+class TestPredictRoute:
+
+    def _router(self, tmp_path) -> FraudRouter:
+        router = object.__new__(FraudRouter)
+        router._intent = IntentClassifier(log_path=tmp_path / "routing.jsonl")
+        return router
+
+    def test_first_turn_is_routed_locally(self, tmp_path):
+        assert self._router(tmp_path)._predict_route("What is the fraud rate by state?", None) == "sql"
+
+    def test_follow_ups_go_to_the_agent(self, tmp_path):
+        history = [
+            {"role": "user", "content": "What is the fraud rate by category?"},
+            {"role": "assistant", "content": "shopping_net has the highest rate."},
+            {"role": "user", "content": "Now show the fraud rate by state for those merchants"},
+        ]
+        question = "Now show the fraud rate by state for those merchants"
+        assert self._router(tmp_path)._predict_route(question, history) is None
+
+
+class TestCoalescedRuns:
+
+    def test_leader_timeout_is_not_shared_with_followers(self):
+        router = object.__new__(FraudRouter)
+        router._answers = None
+        router._flight = SingleFlight()
+        calls = []
+
+        async def run(question, deps, message_history, enable_synthesis):
+            calls.append(deps)
+            await asyncio.sleep(0.05)
+            if len(calls) == 1:
+                raise DeadlineExceeded("question")
+            return AgentResponse(answer="42 fraudulent transactions", source_type=SourceType.SQL)
+
+        router._run = run
+
+        async def main():
+            leader = SimpleNamespace(tool_outputs={}, deadline=None)
+            follower = SimpleNamespace(tool_outputs={}, deadline=None)
+            return await asyncio.gather(
+                router._respond("How many frauds?", leader, None, True),
+                router._respond("How many frauds?", follower, None, True),
+            )
+
+        leader, follower = asyncio.run(main())
+        assert leader.source_type == SourceType.ERROR
+        assert follower.answer == "42 fraudulent transactions" and not follower.partial
+        assert len(calls) == 2
+
+
+class TestAgentModel:
+
+    def test_router_model_uses_the_shared_client(self):
+        router = object.__new__(FraudRouter)
+        router._allm = AsyncLLMClient(client=AsyncOpenAI(api_key="test"))
+        assert isinstance(router._agent_model(), OpenAIChatModel)
+        router._allm = None
+        assert router._agent_model() is None
+
+    def test_usage_is_read_as_method_or_property(self, monkeypatch, tmp_path):
+        tracer = tracing.Tracer(tmp_path / "traces.jsonl")
+        monkeypatch.setattr(tracing, "get_tracer", lambda: tracer)
+        usage = SimpleNamespace(input_tokens=12, output_tokens=3)
+        with tracing.request("usage-test"), tracing.span("router_turn") as span:
+            FraudRouter._trace_usage(usage)
+            FraudRouter._trace_usage(lambda: usage)
+        tracer.close()
+        assert span.attrs["prompt_tokens"] == 24 and span.attrs["completion_tokens"] == 6
+
+
+class _FakeSQLTool:
+
+    def __init__(self, result: SQLToolResult) -> None:
+        self.result = result
+        self.calls = 0
+
+    async def arun(self, question, on_sql=None, deadline=None):
+        self.calls += 1
+        if on_sql is not None and self.result.sql_query:
+            on_sql(self.result.sql_query)
+        return self.result
+
+
+class _FailingSynthesizer:
+
+    async def aanswer_sql(self, question, sql, on_delta=None, deadline=None):
+        return ""
+
+
+class TestLocalSQLFallback:
+
+    def _router(self, result: SQLToolResult) -> FraudRouter:
+        router = object.__new__(FraudRouter)
+        router._sql_tool = _FakeSQLTool(result)
+        router._synthesizer = _FailingSynthesizer()
+        return router
+
+    @staticmethod
+    def _deps() -> SimpleNamespace:
+        return SimpleNamespace(events=asyncio.Queue(), tool_outputs={}, fast_path_sql=None, deadline=None)
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue) -> list:
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+    def test_failed_sql_leaves_no_events_for_the_agent_to_duplicate(self):
+        router = self._router(SQLToolResult(success=False, sql_query="SELECT nope", error="Binder Error"))
+        deps = self._deps()
+
+        async def main():
+            return await router._try_local_sql("What is the fraud rate?", deps, True)
+
+        assert asyncio.run(main()) is None
+        assert self._drain(deps.events) == []
+        assert deps.fast_path_sql is None
+
+    def test_agent_reuses_sql_when_only_the_write_up_fails(self):
+        result = SQLToolResult(
+            success=True, sql_query="SELECT 0.58 AS rate", columns=["rate"], rows=[{"rate": 0.58}], row_count=1,
+        )
+        router = self._router(result)
+        deps = self._deps()
+
+        async def main():
+            fast = await router._try_local_sql("What is the fraud rate?", deps, True)
+            reused = await router._arun_sql("fraud rate overall", deps)
+            return fast, reused
+
+        fast, reused = asyncio.run(main())
+        assert fast is None
+        assert reused is result
+        assert router._sql_tool.calls == 1
+        assert [type(e) for e in self._drain(deps.events)] == [ToolStarted, SQLGenerated, SQLRowsReady]
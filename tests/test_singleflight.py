@@ -0,0 +1,85 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.deadline import DeadlineExceeded
+from src.core.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return "SELECT 1"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["SELECT 1"] * 5
+        assert len(calls) == 1
+        assert flight.stats()["collapsed"] == 4
+
+    def test_async_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return [0.1, 0.2]
+
+        async def main():
+            return await asyncio.gather(*(flight.ado("k", slow) for _ in range(3)))
+
+        assert asyncio.run(main()) == [[0.1, 0.2]] * 3
+        assert len(calls) == 1
+
+    def test_errors_fan_out_and_key_is_released(self):
+        flight = SingleFlight()
+
+        def boom():
+            raise ValueError("upstream failed")
+
+        with pytest.raises(ValueError):
+            flight.do("k", boom)
+        assert flight.do("k", lambda: "ok") == "ok"
+        assert flight.stats()["inflight"] == 0
+
+    def test_leader_deadline_is_not_shared_with_followers(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def answer():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            if len(calls) == 1:
+                raise DeadlineExceeded("leader ran out of time")
+            return "answer"
+
+        async def main():
+            return await asyncio.gather(
+                flight.ado("k", answer), flight.ado("k", answer), return_exceptions=True,
+            )
+
+        leader, follower = asyncio.run(main())
+        assert isinstance(leader, DeadlineExceeded)
+        assert follower == "answer"
+        assert len(calls) == 2
@@ -67,6 +67,14 @@ class TestDatabase:
         assert not result.success
         assert result.error
 
+    def test_column_stats_catalog(self, db):
+        stats = db.column_stats()
+        total = db.connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        assert stats["amt"]["row_count"] == total
+        assert stats["is_fraud"]["distinct_values"] == ["0", "1"]
+        assert "grocery_pos" in stats["category"]["distinct_values"]
+        assert stats["trans_num"]["distinct_values"] is None
+
 
 class TestSQLTool:
 
@@ -86,6 +94,16 @@ class TestSQLTool:
         assert result.success
         assert result.row_count > 1
 
+    def test_system_prompt_reused_within_a_generation(self, llm_client, db):
+        generation = ["g1"]
+        tool = SQLTool(llm_client, db, generation_fn=lambda: generation[0])
+        first = tool._system_prompt()
+        assert "Column statistics" in first
+        assert tool._cached_prompt() is first
+        generation[0] = "g2"
+        assert tool._cached_prompt() is None
+        assert tool._system_prompt() == first
+
     def test_pii_masking(self):
         columns = ["name", "cc_num", "amount"]
         rows = [("John", 1234567890, 100.50)]
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pytest
+import tiktoken
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import tokens
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(tiktoken, "encoding_for_model", unavailable)
+    monkeypatch.setattr(tiktoken, "get_encoding", unavailable)
+    tokens._encoding.cache_clear()
+    yield
+    tokens._encoding.cache_clear()
+
+
+class TestTokenCountingOffline:
+
+    def test_counts_fall_back_to_a_length_estimate(self, offline):
+        assert tokens.count_tokens("a" * 10, "gpt-4o") == 3
+        assert tokens.count_tokens("", "gpt-4o") == 0
+        messages = [{"role": "user", "content": "a" * 8}]
+        assert tokens.count_message_tokens(messages, "gpt-4o") == 3 + 4 + 2
+
+    def test_truncation_falls_back_to_characters(self, offline):
+        assert tokens.truncate_to_tokens("abcdefghij", 2, "gpt-4o") == "abcdefgh"
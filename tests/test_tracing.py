@@ -0,0 +1,98 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import tracing
+
+
+@pytest.fixture
+def tracer(monkeypatch, tmp_path):
+    tracer = tracing.Tracer(tmp_path / "traces.jsonl")
+    monkeypatch.setattr(tracing, "get_tracer", lambda: tracer)
+    yield tracer
+    tracer.close()
+
+
+def _records(tmp_path: Path) -> list[dict]:
+    return list(tracing.load_records(tmp_path / "traces.jsonl"))
+
+
+class TestTracing:
+
+    def test_spans_nest_within_a_request(self, tracer, tmp_path):
+        with tracing.request("req1"):
+            with tracing.span("question") as root:
+                with tracing.span("sql.generate"):
+                    pass
+                with tracing.span("sql.execute", rows=3):
+                    pass
+        records = {r["name"]: r for r in _records(tmp_path)}
+        assert set(records) == {"question", "sql.generate", "sql.execute"}
+        assert all(r["request_id"] == "req1" for r in records.values())
+        assert records["question"]["parent_id"] is None
+        assert records["sql.generate"]["parent_id"] == root.span_id
+        assert records["sql.execute"]["attrs"] == {"rows": 3}
+
+    def test_no_export_outside_a_request(self, tracer, tmp_path):
+        with tracing.span("orphan"):
+            assert not tracing.active()
+        assert _records(tmp_path) == []
+
+    def test_children_in_gathered_tasks_find_their_parent(self, tracer, tmp_path):
+        async def stage(name: str) -> None:
+            with tracing.span(name):
+                await asyncio.sleep(0)
+
+        async def scenario() -> str:
+            with tracing.request("req2"), tracing.span("scoring") as root:
+                await asyncio.gather(stage("scoring.faithfulness"), stage("scoring.relevance"))
+                await asyncio.to_thread(lambda: tracing.add_tokens(5, 1))
+            return root.span_id
+
+        root_id = asyncio.run(scenario())
+        records = {r["name"]: r for r in _records(tmp_path)}
+        assert records["scoring.faithfulness"]["parent_id"] == root_id
+        assert records["scoring.relevance"]["parent_id"] == root_id
+        assert records["scoring"]["attrs"] == {"prompt_tokens": 5, "completion_tokens": 1}
+
+    def test_errors_are_recorded_and_reraised(self, tracer, tmp_path):
+        with pytest.raises(ValueError):
+            with tracing.request(), tracing.span("synthesis"):
+                raise ValueError("boom")
+        [record] = _records(tmp_path)
+        assert record["attrs"]["error"] == "ValueError"
+
+    def test_summarize_reports_percentiles_per_stage(self):
+        records = [{"name": "rag.search", "duration_ms": float(ms)} for ms in range(1, 101)]
+        records.append({"name": "router_turn", "duration_ms": 900.0})
+        summary = tracing.summarize(json.loads(json.dumps(records)))
+        assert summary["rag.search"] == {"count": 100, "p50_ms": 51.0, "p95_ms": 96.0}
+        assert summary["router_turn"]["p95_ms"] == 900.0
+
+    def test_tracer_keeps_an_in_memory_summary(self, tracer):
+        with tracing.request():
+            for _ in range(3):
+                with tracing.span("rag.embed"):
+                    pass
+        assert tracer.summary()["rag.embed"]["count"] == 3
+
+    def test_trace_file_is_rotated_past_max_bytes(self, tmp_path, monkeypatch):
+        path = tmp_path / "traces.jsonl"
+        tracer = tracing.Tracer(path, max_bytes=2000)
+        monkeypatch.setattr(tracing, "get_tracer", lambda: tracer)
+        for _ in range(60):
+            with tracing.request(), tracing.span("stage"):
+                pass
+        tracer.close()
+        rotated = tracing.rotated_path(path)
+        assert rotated.exists()
+        assert path.stat().st_size < 2000 and rotated.stat().st_size < 2000 + 500
+        assert not (tmp_path / "traces.jsonl.2").exists()
+        records = list(tracing.load_records(path))
+        assert 0 < len(records) < 60
+        assert records[-1] == json.loads(path.read_text().splitlines()[-1])